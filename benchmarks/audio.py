@@ -0,0 +1,73 @@
+"""Latency, accuracy and CPU cost of the audio bite detector.
+
+A ten-minute synthetic stream of background noise, a recurring tone and
+other splash-like bursts carries the reference splash at known times,
+partly masked by the noise. The stream is fed in sound card sized blocks;
+latency counts from the start of a splash to the end of the block in
+which it was reported.
+"""
+
+import time
+
+import numpy as np
+
+from fishing_assistant.audio import BLOCK_SAMPLES, AudioBiteDetector
+
+from .common import measure, report
+
+
+RATE = 44100
+SECONDS = 600
+
+
+def splash(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    at = np.arange(int(0.6 * RATE)) / RATE
+    return (0.4 * rng.normal(0, 1, len(at)) * np.exp(-at * 8)).astype(np.float32)
+
+
+def synthetic_stream(seed: int = 0) -> tuple[np.ndarray, np.ndarray, list[float]]:
+    """``(stream, reference, splash times)``."""
+    rng = np.random.default_rng(seed)
+    samples = rng.normal(0, 0.08, SECONDS * RATE).astype(np.float32)
+    at = np.arange(len(samples)) / RATE
+    samples += (0.1 * np.sin(2 * np.pi * 220 * at) * (np.sin(at / 3) > 0.5)).astype(np.float32)
+    reference = splash(1)
+    splashes = sorted(rng.uniform(1, SECONDS - 2, 40))
+    for start in rng.uniform(1, SECONDS - 2, 80):
+        # Other splashes in the world sound alike but are not the same sample.
+        other = splash(int(start))
+        index = int(start * RATE)
+        samples[index:index + len(other)] += other
+    for start in splashes:
+        index = int(start * RATE)
+        samples[index:index + len(reference)] += rng.uniform(0.3, 1.0) * reference
+    return samples, reference, splashes
+
+
+def main() -> None:
+    samples, reference, splashes = synthetic_stream()
+    blocks = [samples[start:start + BLOCK_SAMPLES] for start in range(0, len(samples), BLOCK_SAMPLES)]
+    for seconds in (0.1, 0.15, 0.25, 0.5):
+        detector = AudioBiteDetector(reference, RATE, reference_seconds=seconds)
+        reported = []
+        started = time.perf_counter()
+        for block in blocks:
+            for detection in detector.feed(block):
+                reported.append((detection.at, detector.stream_seconds))
+        elapsed = time.perf_counter() - started
+        hits = [end - at for at, end in reported if any(abs(at - start) < 0.05 for start in splashes)]
+        latency = f"{np.mean(hits) * 1000:.0f} ms" if hits else "-"
+        print(
+            f"reference {seconds:.2f} s: detected {len(hits)}/{len(splashes)}  "
+            f"false {len(reported) - len(hits)}  latency {latency}  real-time factor {SECONDS / elapsed:.0f}x"
+        )
+        position = iter(range(10 ** 9))
+        report(
+            f"reference {seconds:.2f} s feed({BLOCK_SAMPLES})",
+            measure(lambda: detector.feed(blocks[next(position) % len(blocks)]), repeat=2000),
+        )
+
+
+if __name__ == "__main__":
+    main()
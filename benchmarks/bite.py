@@ -0,0 +1,23 @@
+"""Per-frame cost of calculate_change versus the stateful BiteDetector."""
+
+import cv2
+
+from fishing_assistant.bite import BiteDetector
+from fishing_assistant.vision import calculate_change, prepare_gray
+
+from .common import measure, report, synthetic_water
+
+
+def main() -> None:
+    for size in (32, 64, 128, 256):
+        water = cv2.cvtColor(synthetic_water(size * 2, size * 2), cv2.COLOR_BGR2GRAY)
+        baseline_patch, frame = water[:size, :size], water[size:, size:]
+        baseline = prepare_gray(baseline_patch)
+        detector = BiteDetector(20, 12.0, 0.08, 2)
+        detector.reset(baseline_patch)
+        report(f"{size}x{size} calculate_change", measure(lambda: calculate_change(baseline, frame, 20), repeat=2000))
+        report(f"{size}x{size} BiteDetector.update", measure(lambda: detector.update(frame), repeat=2000))
+
+
+if __name__ == "__main__":
+    main()
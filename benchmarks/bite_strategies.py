@@ -0,0 +1,79 @@
+"""Per-frame cost and accuracy of the bite detection strategies.
+
+Every strategy sees the same synthetic casts: a bobber patch that wobbles
+by a pixel on water with flicker, where half of the casts end in an
+8-pixel dip. The scenes differ in how far the water texture sways. A cast counts as detected when the strategy fires
+after the dip, and as a false reel when it fires before it or without one.
+"""
+
+import cv2
+import numpy as np
+
+from fishing_assistant.bite import DETECTORS
+from fishing_assistant.config import AppConfig
+
+from .common import measure, report, synthetic_bobber, synthetic_water
+
+
+PATCH = 64
+FRAMES = 60
+BITE_FRAME = 40
+SCENES = {"calm": 0, "ripples": 2, "swell": 6}
+
+
+def synthetic_cast(seed: int, bite: bool, sway: int) -> list[np.ndarray]:
+    """Gray bobber patches of one cast, the bobber dipping at ``BITE_FRAME`` if ``bite``."""
+    rng = np.random.default_rng(seed)
+    water = cv2.cvtColor(synthetic_water(PATCH * 3, PATCH * 3, seed), cv2.COLOR_BGR2GRAY)
+    bobber = cv2.cvtColor(synthetic_bobber(32, seed + 1), cv2.COLOR_BGR2GRAY)
+    frames = []
+    for index in range(FRAMES):
+        shift = int(round(sway * np.sin(index / 4)))
+        frame = water[PATCH + shift:2 * PATCH + shift, PATCH:2 * PATCH].copy()
+        wobble = int(round(np.sin(index * 1.3)))
+        dip = 8 if bite and index >= BITE_FRAME else 0
+        y = 16 + wobble + dip
+        frame[y:y + 32, 16:48] = bobber
+        flicker = rng.integers(-6, 7, frame.shape)
+        frames.append(np.clip(frame.astype(np.int16) + flicker, 0, 255).astype(np.uint8))
+    return frames
+
+
+def run_cast(detector, frames: list[np.ndarray]) -> int:
+    """Index of the frame the detector fired on, or -1."""
+    detector.reset(frames[0])
+    for index, frame in enumerate(frames[1:], 1):
+        if detector.update(frame):
+            return index
+    return -1
+
+
+def main() -> None:
+    config = AppConfig()
+    for scene, sway in SCENES.items():
+        casts = [(synthetic_cast(seed, seed % 2 == 0, sway), seed % 2 == 0) for seed in range(40)]
+        bites = sum(bite for _, bite in casts)
+        print(f"{scene}: {len(casts)} casts of {FRAMES} {PATCH}x{PATCH} frames, {bites} dip at frame {BITE_FRAME}")
+        for name, strategy in DETECTORS.items():
+            detected = false_reels = 0
+            latencies = []
+            for frames, bite in casts:
+                fired = run_cast(strategy.from_config(config), frames)
+                if bite and fired >= BITE_FRAME:
+                    detected += 1
+                    latencies.append(fired - BITE_FRAME)
+                elif fired >= 0:
+                    false_reels += 1
+            latency = f"{np.mean(latencies):.1f} frames" if latencies else "-"
+            print(f"  {name:<10} detected {detected}/{bites}  false reels {false_reels}  latency {latency}")
+
+    frames = synthetic_cast(0, False, SCENES["ripples"])
+    for name, strategy in DETECTORS.items():
+        detector = strategy.from_config(config)
+        detector.reset(frames[0])
+        position = iter(range(10 ** 9))
+        report(f"{name} update", measure(lambda: detector.update(frames[1 + next(position) % (FRAMES - 1)]), repeat=2000))
+
+
+if __name__ == "__main__":
+    main()
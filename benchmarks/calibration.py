@@ -0,0 +1,69 @@
+"""Threshold calibration: measuring clips once versus replaying every setting.
+
+Uses the "ripples" casts of ``benchmarks.bite_strategies``, half of them
+with a dip, and the default grid without the confidence axis. The naive
+cost replays ``BiteDetector`` over every cast for a sample of settings and
+extrapolates to the whole grid.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from fishing_assistant.bite import BiteDetector
+from fishing_assistant.calibration import DEFAULT_GRID, choose, evaluate, measure_clip
+
+from .bite_strategies import BITE_FRAME, FRAMES, SCENES, run_cast, synthetic_cast
+
+
+CASTS = 40
+SAMPLED_SETTINGS = 20
+
+
+def main() -> None:
+    bites = [seed % 2 == 0 for seed in range(CASTS)]
+    casts = [(synthetic_cast(seed, bite, SCENES["ripples"]), bite) for seed, bite in enumerate(bites)]
+    seconds = np.arange(FRAMES) / 10.0
+    grid = {name: values for name, values in DEFAULT_GRID.items() if name != "confidence_threshold"}
+    settings = int(np.prod([len(values) for values in grid.values()]))
+    print(f"{CASTS} casts of {FRAMES} frames, {settings} settings")
+
+    started = time.perf_counter()
+    clips = [
+        measure_clip(f"cast{index}", frames, seconds, BITE_FRAME if bite else None)
+        for index, (frames, bite) in enumerate(casts)
+    ]
+    print(f"{'measure clips once':<36} {(time.perf_counter() - started) * 1000:9.1f} ms")
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        started = time.perf_counter()
+        evaluation = evaluate(clips, grid, workers=workers)
+        label = f"evaluate grid, {workers} process(es)"
+        print(f"{label:<36} {(time.perf_counter() - started) * 1000:9.1f} ms")
+
+    rng = np.random.default_rng(0)
+    started = time.perf_counter()
+    for _ in range(SAMPLED_SETTINGS):
+        detector = BiteDetector(
+            int(rng.choice(grid["changed_pixel_threshold"])),
+            float(rng.choice(grid["difference_threshold"])),
+            float(rng.choice(grid["changed_pixel_ratio"])),
+            int(rng.choice(grid["confirmation_frames"])),
+        )
+        for frames, _ in casts:
+            run_cast(detector, frames)
+    per_setting = (time.perf_counter() - started) / SAMPLED_SETTINGS
+    print(f"{'replay every setting (estimated)':<36} {per_setting * settings * 1000:9.1f} ms")
+
+    front = evaluation.pareto_front()
+    print("Pareto front (false reels, missed, mean latency):")
+    for candidate in front:
+        marker = "*" if candidate is choose(front) else " "
+        values = ", ".join(f"{name}={value:g}" for name, value in candidate.settings.items())
+        scores = f"{candidate.false_reels:3d} {candidate.misses:3d} {candidate.latency:6.2f} s"
+        print(f" {marker} {scores}  {values}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare the old BGR screenshot path with reusable gray frame buffers.
+
+When a screen can be captured, ``ScreenFrameSource`` is also timed on a bite
+patch and on the whole primary screen: on Windows the patch only copies its
+own pixels, elsewhere both capture the full screen.
+"""
+
+import cv2
+import numpy as np
+
+from fishing_assistant.capture import ArrayFrameSource, ScreenFrameSource
+
+from .common import RESOLUTIONS, measure, report, synthetic_water
+
+
+PATCH = (0, 0, 200, 200)
+
+
+def screen() -> None:
+    source = ScreenFrameSource()
+    try:
+        from PIL import ImageGrab
+
+        width, height = ImageGrab.grab().size
+        source.grab_gray(PATCH)
+    except (ImportError, OSError) as exc:
+        print(f"screen capture unavailable: {exc}")
+        return
+    try:
+        report(f"screen {PATCH[2]}x{PATCH[3]} patch", measure(lambda: source.grab_gray(PATCH)))
+        region = (0, 0, width, height)
+        report(f"screen {width}x{height}", measure(lambda: source.grab_gray(region)))
+    finally:
+        source.close()
+
+
+def main() -> None:
+    for name, (width, height) in RESOLUTIONS.items():
+        desktop = synthetic_water(width, height)
+        rgb = cv2.cvtColor(desktop, cv2.COLOR_BGR2RGB)
+        region = (0, 0, width, height)
+        source = ArrayFrameSource([desktop])
+
+        def legacy() -> np.ndarray:
+            # pyautogui.screenshot -> np.asarray -> RGB2BGR -> BGR2GRAY in find_best_match.
+            bgr = cv2.cvtColor(np.array(rgb), cv2.COLOR_RGB2BGR)
+            return cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+
+        report(f"{name} legacy screenshot + gray", measure(legacy))
+        report(f"{name} FrameSource.grab_gray", measure(lambda: source.grab_gray(region)))
+    screen()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Synthetic scenes and timing helpers shared by the benchmarks."""
+
+import statistics
+import time
+from typing import Callable
+
+import cv2
+import numpy as np
+
+
+RESOLUTIONS = {"1080p": (1920, 1080), "1440p": (2560, 1440), "4k": (3840, 2160)}
+
+
+def synthetic_water(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """A BGR desktop frame with smooth, water-like noise."""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (height // 8 + 1, width // 8 + 1, 3), dtype=np.uint8)
+    water = cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+    return cv2.addWeighted(water, 0.5, np.full_like(water, (90, 60, 20)), 0.5, 0)
+
+
+def synthetic_bobber(size: int = 48, seed: int = 1) -> np.ndarray:
+    """A BGR bobber-like sprite with enough texture for template matching."""
+    rng = np.random.default_rng(seed)
+    sprite = np.full((size, size, 3), (40, 70, 30), dtype=np.uint8)
+    cv2.circle(sprite, (size // 2, size // 2), size // 3, (30, 40, 200), -1)
+    cv2.line(sprite, (size // 2, 2), (size // 2, size - 3), (220, 220, 220), 2)
+    cv2.ellipse(sprite, (size // 3, size // 3), (size // 6, size // 10), 30, 0, 360, (20, 160, 60), -1)
+    sprite += rng.integers(0, 12, sprite.shape, dtype=np.uint8)
+    return sprite
+
+
+def paste(frame: np.ndarray, sprite: np.ndarray, x: int, y: int) -> np.ndarray:
+    frame = frame.copy()
+    frame[y:y + sprite.shape[0], x:x + sprite.shape[1]] = sprite
+    return frame
+
+
+def measure(function: Callable[[], object], repeat: int = 50, warmup: int = 3) -> dict[str, float]:
+    """Run ``function`` and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean": statistics.fmean(samples),
+        "p50": samples[len(samples) // 2],
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def report(name: str, stats: dict[str, float]) -> None:
+    print(f"{name:<44} mean {stats['mean']:8.3f} ms  p50 {stats['p50']:8.3f} ms  p95 {stats['p95']:8.3f} ms")
+
+
+def synthetic_session(
+    directory,
+    width: int,
+    height: int,
+    fps: float = 10.0,
+    duration: float = 6.0,
+    appear_at: float = 1.0,
+    bite_at: float = 4.0,
+    seed: int = 0,
+):
+    """Record a synthetic cast: water, then a bobber that dips at ``bite_at``.
+
+    Returns ``(recording, bobber_gray)`` where the bobber sprite can be used
+    as a template.
+    """
+    from fishing_assistant.recording import FrameRecorder, load_recording
+
+    water = cv2.cvtColor(synthetic_water(width + 64, height + 64, seed), cv2.COLOR_BGR2GRAY)
+    bobber = cv2.cvtColor(synthetic_bobber(), cv2.COLOR_BGR2GRAY)
+    x, y = width // 2, height // 2
+    recorder = FrameRecorder(directory, (0, 0, width, height), chunk_frames=32)
+    recorder.labels = {"bite_at": bite_at, "bobber": [x, y]}
+    for index in range(int(duration * fps)):
+        at = index / fps
+        shift = int(4 * np.sin(at * 3))
+        frame = water[32 + shift:32 + shift + height, 32:32 + width].copy()
+        if at >= appear_at:
+            dip = 10 if at >= bite_at else 0
+            frame[y + dip:y + dip + bobber.shape[0], x:x + bobber.shape[1]] = bobber
+        recorder.add(frame, at)
+    recorder.close()
+    return load_recording(directory), bobber
@@ -0,0 +1,80 @@
+"""Accuracy and latency of ORB feature search versus template matching.
+
+Scenes are 1280x720 water frames with the bobber pasted at a random
+position, scale (0.75-1.5) and rotation (±45°), plus empty frames. A
+search counts as correct when the centre of the match lies within 8
+pixels of the bobber's; a match on an empty frame is a false positive.
+"""
+
+from pathlib import Path
+import tempfile
+
+import cv2
+import numpy as np
+
+from fishing_assistant.features import FeatureMatcher
+from fishing_assistant.matching import ParallelMatcher
+from fishing_assistant.vision import load_templates
+
+from .common import measure, report, synthetic_bobber, synthetic_water
+
+
+WIDTH, HEIGHT = 1280, 720
+SCENES = 30
+TOLERANCE = 8
+
+
+def scene(rng: np.random.Generator, sprite: np.ndarray, seed: int):
+    """A gray frame and the bobber's centre, or None for an empty frame."""
+    frame = cv2.cvtColor(synthetic_water(WIDTH, HEIGHT, seed), cv2.COLOR_BGR2GRAY)
+    if seed % 4 == 3:
+        return frame, None
+    scale, angle = rng.uniform(0.75, 1.5), rng.uniform(-45, 45)
+    size = int(np.ceil(sprite.shape[0] * scale * 1.5))
+    canvas = cv2.resize(sprite, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    canvas = cv2.copyMakeBorder(
+        canvas, *(((size - canvas.shape[0]) // 2,) * 2), *(((size - canvas.shape[1]) // 2,) * 2),
+        cv2.BORDER_REPLICATE,
+    )
+    rotation = cv2.getRotationMatrix2D((canvas.shape[1] / 2, canvas.shape[0] / 2), angle, 1.0)
+    canvas = cv2.warpAffine(canvas, rotation, canvas.shape[::-1], borderMode=cv2.BORDER_REPLICATE)
+    x, y = int(rng.integers(0, WIDTH - size)), int(rng.integers(0, HEIGHT - size))
+    frame[y:y + canvas.shape[0], x:x + canvas.shape[1]] = canvas
+    return frame, (x + canvas.shape[1] / 2, y + canvas.shape[0] / 2)
+
+
+def main() -> None:
+    sprite = cv2.cvtColor(synthetic_bobber(64, 1), cv2.COLOR_BGR2GRAY)
+    rng = np.random.default_rng(0)
+    scenes = [scene(rng, sprite, seed) for seed in range(SCENES)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "bobber.png")
+        cv2.imwrite(path, sprite)
+        searches = {
+            "template, 1 variant": (ParallelMatcher(), load_templates([path])),
+            "template, 15 variants": (
+                ParallelMatcher(), load_templates([path], scales=[0.8, 1.0, 1.25], angles=[-30, -15, 15, 30]),
+            ),
+            "ORB features": (FeatureMatcher(), load_templates([path], features=True)),
+        }
+    for name, (matcher, bank) in searches.items():
+        correct = false_positives = 0
+        for frame, centre in scenes:
+            match = matcher.find_best_match(frame, bank, 0.7)
+            if centre is None:
+                false_positives += match is not None
+            elif match is not None and np.hypot(
+                match.x + match.width / 2 - centre[0], match.y + match.height / 2 - centre[1]
+            ) <= TOLERANCE:
+                correct += 1
+        bobbers = sum(centre is not None for _, centre in scenes)
+        print(f"{name:<24} found {correct}/{bobbers}  false positives {false_positives}/{SCENES - bobbers}")
+        frame = scenes[0][0]
+        report(f"{name} {WIDTH}x{HEIGHT}", measure(lambda: matcher.find_best_match(frame, bank, 0.7), repeat=10))
+        roi = frame[:300, :300]
+        report(f"{name} 300x300 region", measure(lambda: matcher.find_best_match(roi, bank, 0.7), repeat=50))
+        matcher.close()
+
+
+if __name__ == "__main__":
+    main()
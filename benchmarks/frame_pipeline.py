@@ -0,0 +1,66 @@
+"""Throughput of inline capture versus the pipelined producer/consumer feed."""
+
+import time
+
+import cv2
+
+from fishing_assistant.capture import ArrayFrameSource
+from fishing_assistant.matching import ParallelMatcher
+from fishing_assistant.pipeline import DirectFeed, PipelinedFeed
+from fishing_assistant.scheduler import FrameScheduler
+from fishing_assistant.vision import Template
+
+from .common import synthetic_bobber, synthetic_water
+
+
+class SlowFrameSource(ArrayFrameSource):
+    """Adds a fixed, GIL-releasing delay to every grab, like a desktop capture."""
+
+    def __init__(self, frames, latency: float):
+        super().__init__(frames)
+        self.latency = latency
+
+    def grab_gray(self, region, out=None):
+        time.sleep(self.latency)
+        return super().grab_gray(region, out)
+
+
+def throughput(feed, region, process, seconds: float = 3.0) -> float:
+    processed = 0
+    deadline = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < deadline:
+            grab = feed.next()
+            if grab is None:
+                break
+            process(grab(region))
+            processed += 1
+            time.sleep(feed.delay())
+    finally:
+        feed.close()
+    return processed / seconds
+
+
+def main() -> None:
+    width, height = 1280, 720
+    region = (0, 0, width, height)
+    frames = [synthetic_water(width, height, seed) for seed in range(4)]
+    templates = [Template("bobber", cv2.cvtColor(synthetic_bobber(), cv2.COLOR_BGR2GRAY))]
+    matcher = ParallelMatcher(1)
+
+    def process(frame):
+        matcher.find_best_match(frame, templates, 0.99, pyramid_levels=2)
+
+    for latency in (0.005, 0.015, 0.030):
+        # An unreachable target rate measures the maximum sustainable throughput.
+        direct = DirectFeed(SlowFrameSource(frames, latency), FrameScheduler(1000))
+        pipelined = PipelinedFeed(SlowFrameSource(frames, latency), region, FrameScheduler(1000), lambda: True)
+        print(
+            f"capture {latency * 1000:4.0f} ms: inline {throughput(direct, region, process):6.1f} fps, "
+            f"pipelined {throughput(pipelined, region, process):6.1f} fps "
+            f"({pipelined.ring.dropped} stale frames dropped)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Scaling of ParallelMatcher with thread count."""
+
+import os
+
+import cv2
+
+from fishing_assistant.matching import ParallelMatcher
+from fishing_assistant.vision import Template
+
+from .common import RESOLUTIONS, measure, report, synthetic_bobber, synthetic_water
+
+
+def main() -> None:
+    thread_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    width, height = RESOLUTIONS["1440p"]
+    frame = cv2.cvtColor(synthetic_water(width, height), cv2.COLOR_BGR2GRAY)
+    templates = [
+        Template(f"t{seed}", cv2.cvtColor(synthetic_bobber(40 + seed * 2, seed), cv2.COLOR_BGR2GRAY))
+        for seed in range(1, 9)
+    ]
+    for count in (1, 8):
+        for threads in thread_counts:
+            matcher = ParallelMatcher(threads)
+            # No match is ever certain, so every template is searched.
+            search = lambda: matcher.find_best_match(frame, templates[:count], 0.99, certain_confidence=2.0)
+            report(f"1440p x{count} templates, {threads} threads", measure(search, repeat=5, warmup=1))
+            matcher.close()
+
+
+if __name__ == "__main__":
+    main()
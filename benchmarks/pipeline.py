@@ -0,0 +1,68 @@
+"""Per-stage and end-to-end latency of the detection pipeline on replays."""
+
+import tempfile
+
+import cv2
+
+from fishing_assistant.config import AppConfig
+from fishing_assistant.bite import BiteDetector
+from fishing_assistant.vision import Template, find_best_match
+
+from .common import measure, report, synthetic_bobber, synthetic_session
+
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "1440p": (2560, 1440)}
+TEMPLATE_COUNTS = (1, 4, 8)
+
+
+def templates_for(bobber, count: int) -> list[Template]:
+    """``count - 1`` distractors, then the real bobber.
+
+    The bobber comes last because its exact match would end the search at
+    ``certain_confidence`` and skip the distractors being measured.
+    """
+    templates = []
+    for seed in range(2, count + 1):
+        distractor = cv2.cvtColor(synthetic_bobber(40 + seed * 2, seed), cv2.COLOR_BGR2GRAY)
+        templates.append(Template(f"distractor-{seed}", distractor))
+    return templates + [Template("bobber", bobber)]
+
+
+def end_to_end(recording, templates) -> str:
+    try:
+        from fishing_assistant.replay import replay
+    except ImportError as exc:
+        return f"skipped ({exc})"
+    config = AppConfig(fishing_hotkey="f", afk_time_min=60, afk_time_max=60)
+    result = replay(recording, config, templates)
+    clicked = result.first("click")
+    if clicked is None:
+        return "no bite detected"
+    return f"{(clicked - recording.labels['bite_at']) * 1000:.1f} ms after bite"
+
+
+def main() -> None:
+    for name, (width, height) in RESOLUTIONS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            recording, bobber = synthetic_session(directory, width, height)
+            full = recording.frame(len(recording) - 1)
+            x, y = recording.labels["bobber"]
+            patch = full[y:y + bobber.shape[0], x:x + bobber.shape[1]]
+            detector = BiteDetector(20, 12.0, 0.08, 2)
+            for count in TEMPLATE_COUNTS:
+                templates = templates_for(bobber, count)
+                report(
+                    f"{name} search x{count} templates",
+                    measure(lambda: find_best_match(full, templates, 0.7), repeat=10),
+                )
+                report(
+                    f"{name} pyramid(2) search x{count} templates",
+                    measure(lambda: find_best_match(full, templates, 0.7, pyramid_levels=2), repeat=10),
+                )
+                print(f"{name} end-to-end x{count} templates: {end_to_end(recording, templates)}")
+            report(f"{name} baseline BiteDetector.reset", measure(lambda: detector.reset(patch), repeat=500))
+            report(f"{name} per-frame BiteDetector.update", measure(lambda: detector.update(patch), repeat=500))
+
+
+if __name__ == "__main__":
+    main()
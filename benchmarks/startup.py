@@ -0,0 +1,82 @@
+"""Application startup: import cost and time until the main window is shown.
+
+Each measurement runs in a fresh interpreter inside an empty directory, so
+no module or settings file is shared between runs. The window is created on
+Qt's offscreen platform. "eager" imports the worker stack before the window,
+as the application did before backends were loaded lazily.
+"""
+
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 5
+
+FIRST_WINDOW = """
+import time
+started = time.perf_counter()
+import sys
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+if {eager}:
+    import fishing_assistant.worker
+from fishing_assistant.ui import FishingAssistantWindow
+app = QApplication(sys.argv)
+window = FishingAssistantWindow()
+window.show()
+def shown():
+    print((time.perf_counter() - started) * 1000)
+    app.quit()
+QTimer.singleShot(0, shown)
+app.exec_()
+"""
+
+
+def _run(arguments: list[str], directory: str) -> subprocess.CompletedProcess:
+    environment = dict(os.environ, PYTHONPATH=str(ROOT), QT_QPA_PLATFORM="offscreen")
+    return subprocess.run(
+        [sys.executable, *arguments], cwd=directory, env=environment,
+        capture_output=True, text=True, check=True,
+    )
+
+
+def import_times(module: str, directory: str) -> list[tuple[int, int, str]]:
+    """``(cumulative microseconds, depth, name)`` per import, as reported by ``-X importtime``."""
+    lines = _run(["-X", "importtime", "-c", f"import {module}"], directory).stderr.splitlines()
+    times = []
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((int(cumulative), depth, name.strip()))
+    return sorted(times, reverse=True)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for module in ("fishing_assistant.ui", "fishing_assistant.worker"):
+            times = import_times(module, directory)
+            total = next(t for t, depth, name in times if name == module)
+            print(f"import {module}: {total / 1000:.1f} ms, heaviest dependencies:")
+            for cumulative, _, name in [t for t in times if t[1] in (1, 2)][:6]:
+                print(f"    {name:<36} {cumulative / 1000:8.1f} ms")
+        try:
+            for label, eager in (("lazy", False), ("eager", True)):
+                samples = [
+                    float(_run(["-c", FIRST_WINDOW.format(eager=eager)], directory).stdout)
+                    for _ in range(RUNS)
+                ]
+                print(f"time to first window ({label}): median {statistics.median(samples):.1f} ms over {RUNS} runs")
+        except subprocess.CalledProcessError as exc:
+            print(f"time to first window skipped: {exc.stderr.strip().splitlines()[-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Template loading at startup: decoding every image versus the on-disk cache."""
+
+from pathlib import Path
+import shutil
+import tempfile
+
+import cv2
+
+from fishing_assistant.template_cache import TemplateCache
+from fishing_assistant.vision import load_templates
+
+from .common import measure, report, synthetic_bobber
+
+
+TEMPLATE_COUNT = 60
+SCALES = (0.8, 1.0, 1.25)
+ANGLES = (-10.0, 10.0)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        paths = []
+        for index in range(TEMPLATE_COUNT):
+            sprite = cv2.cvtColor(synthetic_bobber(40 + index % 24, seed=index), cv2.COLOR_BGR2GRAY)
+            path = root / f"bobber-{index:02d}.png"
+            cv2.imencode(".png", sprite)[1].tofile(str(path))
+            paths.append(str(path))
+        cache_directory = root / "cache"
+
+        def uncached():
+            return load_templates(paths, scales=SCALES, angles=ANGLES)
+
+        def cold():
+            shutil.rmtree(cache_directory, ignore_errors=True)
+            return TemplateCache(cache_directory).load_templates(paths, scales=SCALES, angles=ANGLES)
+
+        def warm():
+            return TemplateCache(cache_directory).load_templates(paths, scales=SCALES, angles=ANGLES)
+
+        bank = uncached()
+        print(f"{TEMPLATE_COUNT} images, {len(SCALES)} scales, {len(ANGLES)} angles -> {len(bank)} variants")
+        report("decode without cache", measure(uncached, repeat=10, warmup=1))
+        report("cold cache (decode and store)", measure(cold, repeat=10, warmup=1))
+        report("warm cache (stat and map)", measure(warm, repeat=20, warmup=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Search cost of a list of screenshots versus a deduplicated template bank."""
+
+import cv2
+import numpy as np
+
+from fishing_assistant.vision import Template, TemplateBank, deduplicate, find_best_match, template_variants
+
+from .common import measure, report, synthetic_bobber, synthetic_water
+
+
+def main() -> None:
+    frame = cv2.cvtColor(synthetic_water(1920, 1080), cv2.COLOR_BGR2GRAY)
+    bobber = cv2.cvtColor(synthetic_bobber(48), cv2.COLOR_BGR2GRAY)
+    frame[500:548, 900:948] = bobber
+    rng = np.random.default_rng(3)
+    # Users tend to add many near-identical screenshots of the same bobber.
+    screenshots = [
+        Template(f"shot-{index}.png", cv2.add(bobber, rng.integers(0, 2, bobber.shape, dtype=np.uint8)))
+        for index in range(8)
+    ]
+    scales = (0.8, 1.0, 1.25)
+    variants = [v for shot in screenshots for v in template_variants(shot, scales)]
+    bank = TemplateBank.from_templates(deduplicate(variants))
+    print(f"{len(variants)} variants from {len(screenshots)} screenshots -> {len(bank)} after deduplication")
+    for levels in (0, 2):
+        report(
+            f"list of {len(variants)} variants, pyramid {levels}",
+            measure(lambda: find_best_match(frame, variants, 0.7, pyramid_levels=levels), repeat=5),
+        )
+        report(
+            f"bank of {len(bank)} variants, pyramid {levels}",
+            measure(lambda: find_best_match(frame, bank, 0.7, pyramid_levels=levels), repeat=5),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Headless command line.
+
+``python -m fishing_assistant run --config PATH`` fishes without the
+window; ``report`` prints the throughput of recorded sessions and
+``calibrate`` tunes the detection thresholds on labelled recordings.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import time
+from typing import Optional
+
+from .config import CONFIG_FILE, load_config
+from .texts import text
+
+
+# Log events are printed in batches at this period, in seconds.
+LOG_PRINT_INTERVAL = 0.2
+
+
+async def _print_events(engine) -> None:
+    while True:
+        for event in engine.events.drain():
+            stamp = time.strftime("%H:%M:%S", time.localtime(event.timestamp))
+            print(f"[{stamp}] {event.message(engine.config.language)}", flush=True)
+        await asyncio.sleep(LOG_PRINT_INTERVAL)
+
+
+async def run_session(config, config_path: Path):
+    """Run one session to its end and return the engine."""
+    from .engine import FishingEngine, run_async
+
+    engine = FishingEngine(config, config_path=config_path)
+    printer = asyncio.create_task(_print_events(engine))
+    try:
+        await run_async(engine)
+    finally:
+        printer.cancel()
+        for event in engine.events.drain():
+            print(event.message(config.language))
+    return engine
+
+
+def print_report(config, database: Optional[Path], by_config: bool) -> int:
+    from .store import REPORT_COLUMNS, database_path, reports
+
+    database = database or database_path(config)
+    if database is None or not database.exists():
+        print(text("no_statistics", config.language), file=sys.stderr)
+        return 1
+    rows = [[text(key, config.language) for key in REPORT_COLUMNS]]
+    rows += [report.cells() for report in reports(database, by_config)]
+    widths = [max(len(row[column]) for row in rows) for column in range(len(REPORT_COLUMNS))]
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    return 0
+
+
+def calibrate(
+    config,
+    config_path: Path,
+    clips_directory: Path,
+    max_false_reels: int,
+    workers: Optional[int],
+    dry_run: bool,
+) -> int:
+    from .calibration import PARAMETER_LABELS, apply_settings, choose, evaluate, load_clips
+    from .config import save_config
+    from .engine import load_template_bank
+
+    def unreadable(name: str) -> None:
+        print(text("template_unreadable", config.language, name=name), file=sys.stderr)
+
+    templates = load_template_bank(config, unreadable)
+    try:
+        clips = load_clips(clips_directory, list(templates)) if clips_directory.is_dir() else []
+    except (OSError, ValueError, KeyError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    if not clips:
+        print(text("no_clips", config.language), file=sys.stderr)
+        return 1
+    evaluation = evaluate(clips, workers=workers)
+    front = evaluation.pareto_front()
+    chosen = choose(front, max_false_reels)
+    keys = [PARAMETER_LABELS[name] for name in evaluation.parameters]
+    keys += ["calibration_false_reels", "calibration_misses", "calibration_latency"]
+    rows = [[""] + [text(key, config.language) for key in keys]]
+    for candidate in front:
+        values = [f"{candidate.settings[name]:g}" for name in evaluation.parameters]
+        values += [str(candidate.false_reels), str(candidate.misses), f"{candidate.latency:.2f}"]
+        rows.append(["*" if candidate is chosen else ""] + values)
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    if not dry_run:
+        save_config(apply_settings(config, chosen), config_path)
+        print(text("calibration_saved", config.language, path=config_path))
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m fishing_assistant")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run a fishing session without the window")
+    run.add_argument("--config", type=Path, default=CONFIG_FILE, help="settings file saved by the window")
+    report = commands.add_parser("report", help="print casts per hour, catch rate and latencies of past sessions")
+    report.add_argument("--config", type=Path, default=CONFIG_FILE, help="settings file saved by the window")
+    report.add_argument("--database", type=Path, help="statistics database; defaults to the one in the settings")
+    report.add_argument("--by-config", action="store_true", help="one row per distinct settings instead of per session")
+    tune = commands.add_parser("calibrate", help="tune the detection thresholds on labelled recordings")
+    tune.add_argument("clips", type=Path, help="a labelled recording, or a directory of them")
+    tune.add_argument(
+        "--config", type=Path, default=CONFIG_FILE, help="settings file to read templates from and update"
+    )
+    tune.add_argument("--max-false-reels", type=int, default=0, help="false reels allowed over all clips")
+    tune.add_argument(
+        "--workers", type=int, help="processes to evaluate the grid with; defaults to the CPU count"
+    )
+    tune.add_argument("--dry-run", action="store_true", help="print the Pareto front without saving")
+    arguments = parser.parse_args(argv)
+
+    if arguments.command == "report":
+        config = load_config(arguments.config)
+        return print_report(config, arguments.database, arguments.by_config)
+    if arguments.command == "calibrate":
+        config = load_config(arguments.config)
+        return calibrate(
+            config, arguments.config, arguments.clips,
+            arguments.max_false_reels, arguments.workers, arguments.dry_run,
+        )
+
+    if not arguments.config.exists():
+        parser.error(f"settings file not found: {arguments.config}")
+    config = load_config(arguments.config)
+    for key, missing in (
+        ("need_image", not config.image_paths),
+        ("need_hotkey", not config.fishing_hotkey),
+        ("need_window", not config.game_window_title),
+    ):
+        if missing:
+            print(text(key, config.language), file=sys.stderr)
+            return 2
+    try:
+        engine = asyncio.run(run_session(config, arguments.config))
+    except KeyboardInterrupt:
+        return 130
+    # The reason is in the printed log.
+    return 1 if engine.setup_error is not None else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
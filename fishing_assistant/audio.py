@@ -0,0 +1,328 @@
+"""Bite detection from the game's splash sound."""
+
+from dataclasses import dataclass
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import Callable, Optional
+import wave
+
+import numpy as np
+
+
+# Samples per block delivered by the sources, about 23 ms at 44.1 kHz.
+BLOCK_SAMPLES = 1024
+
+
+def read_wav(path: Path) -> tuple[np.ndarray, int]:
+    """Mono float32 samples in [-1, 1] and the sample rate of an uncompressed WAV file."""
+    try:
+        with wave.open(str(path), "rb") as reader:
+            channels, width, rate = reader.getnchannels(), reader.getsampwidth(), reader.getframerate()
+            data = reader.readframes(reader.getnframes())
+    except (wave.Error, EOFError) as exc:
+        raise ValueError(f"unreadable WAV file: {Path(path).name}") from exc
+    if width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"unsupported sample width: {width * 8} bits")
+    return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32), rate
+
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Linear resampling, good enough for a reference clip."""
+    if rate == target_rate or not len(samples):
+        return samples.astype(np.float32, copy=False)
+    count = max(1, round(len(samples) * target_rate / rate))
+    positions = np.arange(count) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+class AudioSource:
+    """Delivers mono float32 PCM blocks of the game's sound.
+
+    ``start`` begins the stream and ``read`` returns the blocks that have
+    arrived since the last call, oldest first, without waiting. Blocks may
+    be views owned by the source; consume them before the next ``read``.
+    """
+
+    sample_rate = 44100
+
+    def start(self) -> None:
+        pass
+
+    def read(self) -> list[np.ndarray]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class ArrayAudioSource(AudioSource):
+    """Serves an in-memory stream in real time, for tests and benchmarks.
+
+    Blocks become available as ``clock`` passes their end, counted from
+    ``start``, so under the engine's virtual clock audio stays in step with
+    replayed frames. The stream ends after the last whole block.
+    """
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        block: int = BLOCK_SAMPLES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.samples = np.asarray(samples, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.block = block
+        self.clock = clock
+        self.position = 0
+        self._started: Optional[float] = None
+
+    @classmethod
+    def from_wav(cls, path: Path, **kwargs) -> "ArrayAudioSource":
+        samples, rate = read_wav(path)
+        return cls(samples, rate, **kwargs)
+
+    def start(self) -> None:
+        self._started = self.clock()
+        self.position = 0
+
+    def read(self) -> list[np.ndarray]:
+        if self._started is None:
+            return []
+        due = min(int((self.clock() - self._started) * self.sample_rate), len(self.samples))
+        blocks = []
+        while self.position + self.block <= due:
+            blocks.append(self.samples[self.position:self.position + self.block])
+            self.position += self.block
+        return blocks
+
+
+class LoopbackAudioSource(AudioSource):
+    """Records what the default speaker plays, on a background thread.
+
+    Uses the optional ``soundcard`` package, imported on the capture thread
+    when the stream starts; ``failed`` receives the error if it is missing
+    or the device cannot be opened.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 44100,
+        block: int = BLOCK_SAMPLES,
+        failed: Callable[[Exception], None] = lambda exc: None,
+    ):
+        self.sample_rate = sample_rate
+        self.block = block
+        self.failed = failed
+        self._queue: queue.Queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+            self._thread.start()
+
+    def read(self) -> list[np.ndarray]:
+        blocks = []
+        while True:
+            try:
+                blocks.append(self._queue.get_nowait())
+            except queue.Empty:
+                return blocks
+
+    def close(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        try:
+            import soundcard
+
+            speaker = soundcard.default_speaker()
+            microphone = soundcard.get_microphone(speaker.name, include_loopback=True)
+            with microphone.recorder(samplerate=self.sample_rate, channels=1, blocksize=self.block) as recorder:
+                while not self._stop_event.is_set():
+                    data = recorder.record(numframes=self.block)
+                    self._queue.put(np.asarray(data, dtype=np.float32).reshape(len(data), -1).mean(axis=1))
+        except Exception as exc:
+            self.failed(exc)
+
+
+class AudioRing:
+    """The latest ``capacity`` samples of a stream, in a preallocated buffer."""
+
+    def __init__(self, capacity: int):
+        self.buffer = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.end = 0
+
+    def clear(self) -> None:
+        self.buffer.fill(0.0)
+        self.end = 0
+
+    def extend(self, block: np.ndarray) -> None:
+        if len(block) >= self.capacity:
+            self.buffer[:] = block[-self.capacity:]
+            self.end = 0
+        else:
+            first = min(len(block), self.capacity - self.end)
+            self.buffer[self.end:self.end + first] = block[:first]
+            self.buffer[:len(block) - first] = block[first:]
+            self.end = (self.end + len(block)) % self.capacity
+
+    def latest(self, count: int, out: np.ndarray) -> np.ndarray:
+        """Copy the last ``count`` samples, oldest first, into ``out``; zeros before the stream."""
+        start = (self.end - count) % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self.buffer[start:start + first]
+        out[first:count] = self.buffer[:count - first]
+        return out[:count]
+
+
+@dataclass(frozen=True)
+class AudioDetection:
+    """A splash starting ``at`` seconds into the stream, with its correlation ``score``."""
+
+    at: float
+    score: float
+
+
+class AudioBiteDetector:
+    """Incremental normalized matched filter against a reference splash.
+
+    Each block is appended to a ring holding one reference length of
+    history, and the correlation of the reference with every window that
+    ends inside the block is computed with one FFT. Scores are normalized
+    by the window's own energy, so they lie in [-1, 1] regardless of the
+    game's volume, and a detection is reported when the best score of a
+    block reaches ``threshold``. After a detection the same splash is not
+    reported again until a whole reference length has passed.
+
+    Only ``reference_seconds`` of the reference, starting at its onset, are
+    used: a splash is recognised as soon as that much of it has been heard.
+    """
+
+    def __init__(
+        self,
+        reference: np.ndarray,
+        sample_rate: int,
+        threshold: float = 0.6,
+        reference_seconds: float = 0.15,
+        max_block: int = 4 * BLOCK_SAMPLES,
+    ):
+        reference = self._onset(np.asarray(reference, dtype=np.float64))
+        reference = reference[:max(16, int(reference_seconds * sample_rate))]
+        reference = reference - reference.mean()
+        norm = float(np.linalg.norm(reference))
+        if norm == 0.0:
+            raise ValueError("reference clip is silent")
+        self.reference = reference
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.max_block = max_block
+        self._norm = norm
+        self._ring = AudioRing(len(reference) - 1 + max_block)
+        self._window = np.empty(self._ring.capacity, dtype=np.float64)
+        self._spectra: dict[int, np.ndarray] = {}
+        self._quiet_until = 0
+        self.samples = 0
+        self.best_score = 0.0
+
+    @classmethod
+    def from_wav(cls, path: Path, sample_rate: int, **kwargs) -> "AudioBiteDetector":
+        samples, rate = read_wav(path)
+        return cls(resample(samples, rate, sample_rate), sample_rate, **kwargs)
+
+    @staticmethod
+    def _onset(samples: np.ndarray) -> np.ndarray:
+        loud = np.flatnonzero(np.abs(samples) >= 0.1 * np.abs(samples).max(initial=0.0))
+        return samples[loud[0]:] if len(loud) else samples
+
+    def reset(self, skipped: int = 0) -> None:
+        """Forget earlier audio, for example the cast's own splash.
+
+        ``skipped`` counts samples of the stream that were dropped unheard,
+        so that later detections keep their place in the stream.
+        """
+        self.samples += skipped
+        self._ring.clear()
+        self._quiet_until = self.samples
+        self.best_score = 0.0
+
+    @property
+    def stream_seconds(self) -> float:
+        """Seconds of audio fed so far."""
+        return self.samples / self.sample_rate
+
+    def _spectrum(self, size: int) -> np.ndarray:
+        spectrum = self._spectra.get(size)
+        if spectrum is None:
+            spectrum = self._spectra[size] = np.fft.rfft(self.reference[::-1], size)
+        return spectrum
+
+    def feed(self, block: np.ndarray) -> list[AudioDetection]:
+        detections = []
+        for start in range(0, len(block), self.max_block):
+            detection = self._feed(block[start:start + self.max_block])
+            if detection is not None:
+                detections.append(detection)
+        return detections
+
+    def _feed(self, block: np.ndarray) -> Optional[AudioDetection]:
+        length = len(self.reference)
+        self._ring.extend(block)
+        self.samples += len(block)
+        window = self._ring.latest(length - 1 + len(block), self._window)
+        size = 1 << (len(window) - 1).bit_length()
+        correlation = np.fft.irfft(np.fft.rfft(window, size) * self._spectrum(size), size)
+        correlation = correlation[length - 1:len(window)]
+        # Energy of each window around its own mean, from running sums.
+        sums = np.concatenate(([0.0], np.cumsum(window)))
+        squares = np.concatenate(([0.0], np.cumsum(window * window)))
+        total = sums[length:] - sums[:-length]
+        energy = squares[length:] - squares[:-length] - total * total / length
+        scores = np.where(energy > 1e-9 * length, correlation / (self._norm * np.sqrt(np.maximum(energy, 1e-30))), 0.0)
+        # Sample index where the window of scores[0] starts.
+        first = self.samples - len(block) - length + 1
+        if first < self._quiet_until:
+            scores[:self._quiet_until - first] = 0.0
+        best = int(np.argmax(scores))
+        self.best_score = float(scores[best])
+        if self.best_score < self.threshold:
+            return None
+        self._quiet_until = first + best + length
+        return AudioDetection((first + best) / self.sample_rate, self.best_score)
+
+
+class AudioListener:
+    """An ``AudioSource`` feeding an ``AudioBiteDetector``."""
+
+    def __init__(self, source: AudioSource, detector: AudioBiteDetector):
+        self.source = source
+        self.detector = detector
+
+    def start(self) -> None:
+        self.source.start()
+
+    def reset(self) -> None:
+        """Drop the audio heard so far and start listening for a new splash."""
+        self.detector.reset(sum(len(block) for block in self.source.read()))
+
+    def poll(self) -> list[AudioDetection]:
+        detections = []
+        for block in self.source.read():
+            detections.extend(self.detector.feed(block))
+        return detections
+
+    def close(self) -> None:
+        self.source.close()
@@ -0,0 +1,60 @@
+"""Platform-specific automation backends, imported on first use.
+
+A backend module provides the input functions ``press(key)``,
+``move_to(x, y, duration)`` and ``click()``, and the window functions
+``find_window(title)``, ``find_windows(title)``, ``is_window(handle)``,
+``foreground_window()``, ``client_region(handle)`` and
+``activate_handle(handle)`` used by ``window.CachedWindow``. Importing one pulls in the platform's
+automation libraries, so nothing here is loaded until a session starts or
+``warm_up`` runs in the background.
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+BACKENDS = {"win32": "windows"}
+# Modules imported by ``warm_up`` besides the backend itself.
+WARM_UP_MODULES = ("fishing_assistant.worker",)
+
+
+class BackendUnavailable(RuntimeError):
+    pass
+
+
+_backend: Optional[ModuleType] = None
+_lock = threading.Lock()
+
+
+def load_backend() -> ModuleType:
+    """The backend for this platform; the first call imports it."""
+    global _backend
+    with _lock:
+        if _backend is None:
+            name = BACKENDS.get(sys.platform)
+            if name is None:
+                raise BackendUnavailable(f"No automation backend for platform {sys.platform!r}")
+            _backend = importlib.import_module(f"{__name__}.{name}")
+        return _backend
+
+
+def warm_up() -> threading.Thread:
+    """Import the worker stack and the backend on a daemon thread.
+
+    Errors are swallowed here; they are raised again when the session that
+    needs the module starts, which logs them as ``backend_unavailable``.
+    """
+    def run() -> None:
+        try:
+            for module in WARM_UP_MODULES:
+                importlib.import_module(module)
+            load_backend()
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,68 @@
+"""Windows automation through pywin32 and PyAutoGUI."""
+
+from typing import Optional
+
+import pyautogui
+import win32con
+import win32gui
+
+
+def press(key: str) -> None:
+    pyautogui.press(key)
+
+
+def move_to(x: int, y: int, duration: float = 0.25) -> None:
+    pyautogui.moveTo(x, y, duration=duration)
+
+
+def click(button: str = "right") -> None:
+    pyautogui.click(button=button)
+
+
+def find_windows(title: str) -> list[int]:
+    """Handles of every visible top-level window whose title is exactly ``title``."""
+    handles = []
+
+    def collect(hwnd, _):
+        if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd) == title:
+            handles.append(hwnd)
+        return True
+
+    win32gui.EnumWindows(collect, None)
+    return handles
+
+
+def client_region(hwnd: int) -> Optional[tuple[int, int, int, int]]:
+    """Client area of ``hwnd`` in screen pixels, or None if it is gone or empty."""
+    if not win32gui.IsWindow(hwnd) or win32gui.IsIconic(hwnd):
+        return None
+    left, top, right, bottom = win32gui.GetClientRect(hwnd)
+    screen_left, screen_top = win32gui.ClientToScreen(hwnd, (left, top))
+    screen_right, screen_bottom = win32gui.ClientToScreen(hwnd, (right, bottom))
+    width, height = screen_right - screen_left, screen_bottom - screen_top
+    if width <= 0 or height <= 0:
+        return None
+    return screen_left, screen_top, width, height
+
+
+def activate_handle(hwnd: int) -> Optional[tuple[int, int, int, int]]:
+    """Bring ``hwnd`` to the foreground and return its client area in screen pixels."""
+    if not win32gui.IsWindow(hwnd):
+        return None
+    if win32gui.IsIconic(hwnd):
+        win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+    win32gui.SetForegroundWindow(hwnd)
+    return client_region(hwnd)
+
+
+def find_window(title: str) -> Optional[int]:
+    """Handle of the top-level window titled ``title``, if there is one."""
+    return win32gui.FindWindow(None, title) or None
+
+
+def is_window(hwnd: int) -> bool:
+    return bool(win32gui.IsWindow(hwnd))
+
+
+def foreground_window() -> Optional[int]:
+    return win32gui.GetForegroundWindow() or None
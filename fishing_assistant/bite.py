@@ -0,0 +1,286 @@
+"""Stateful bite detection over the bobber patch."""
+
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+from .config import AppConfig
+from .vision import ChangeMetrics
+
+
+class BiteStrategy:
+    """A bite test, chosen by ``AppConfig.bite_detector`` from ``DETECTORS``.
+
+    ``reset`` starts a cast from the first gray patch of the bobber and
+    ``update`` takes each later patch, returning True once a bite is
+    confirmed. ``consecutive`` counts the latest frames that looked like a
+    bite, and ``log_values`` gives the log message key and values that
+    describe the last frame. ``configure`` takes new thresholds from a
+    config during a cast without forgetting the baseline.
+    """
+
+    confirmation_frames = 1
+    consecutive = 0
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "BiteStrategy":
+        raise NotImplementedError
+
+    def configure(self, config: AppConfig) -> None:
+        raise NotImplementedError
+
+    def reset(self, baseline: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def update(self, frame: np.ndarray) -> bool:
+        raise NotImplementedError
+
+    def log_values(self) -> tuple[str, dict[str, Any]]:
+        raise NotImplementedError
+
+
+class BiteDetector(BiteStrategy):
+    """Baseline-difference bite test that reuses its work buffers.
+
+    Equivalent to ``calculate_change`` plus the threshold and confirmation
+    logic, but the blurred frame, the difference and the changed-pixel mask
+    are written into arrays allocated once per patch size, and the mean and
+    count come straight from OpenCV without boolean temporaries.
+    """
+
+    def __init__(
+        self,
+        pixel_threshold: int,
+        difference_threshold: float,
+        changed_ratio: float,
+        confirmation_frames: int,
+    ):
+        self.pixel_threshold = pixel_threshold
+        self.difference_threshold = difference_threshold
+        self.changed_ratio = changed_ratio
+        self.confirmation_frames = confirmation_frames
+        self.consecutive = 0
+        self.metrics = ChangeMetrics(0.0, 0.0)
+        self._baseline: Optional[np.ndarray] = None
+        self._blurred: Optional[np.ndarray] = None
+        self._difference: Optional[np.ndarray] = None
+        self._mask: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "BiteDetector":
+        return cls(
+            config.changed_pixel_threshold,
+            config.difference_threshold,
+            config.changed_pixel_ratio,
+            config.confirmation_frames,
+        )
+
+    def configure(self, config: AppConfig) -> None:
+        self.pixel_threshold = config.changed_pixel_threshold
+        self.difference_threshold = config.difference_threshold
+        self.changed_ratio = config.changed_pixel_ratio
+        self.confirmation_frames = config.confirmation_frames
+
+    def reset(self, baseline: np.ndarray) -> None:
+        """Start a new cast with ``baseline``, an unblurred gray patch."""
+        if self._baseline is None or self._baseline.shape != baseline.shape:
+            self._baseline = np.empty_like(baseline)
+            self._blurred = np.empty_like(baseline)
+            self._difference = np.empty_like(baseline)
+            self._mask = np.empty_like(baseline)
+        cv2.GaussianBlur(baseline, (5, 5), 0, dst=self._baseline)
+        self.consecutive = 0
+        self.metrics = ChangeMetrics(0.0, 0.0)
+
+    def measure(self, frame: np.ndarray) -> ChangeMetrics:
+        if self._baseline is None or frame.shape != self._baseline.shape:
+            return ChangeMetrics(0.0, 0.0)
+        cv2.GaussianBlur(frame, (5, 5), 0, dst=self._blurred)
+        cv2.absdiff(self._baseline, self._blurred, dst=self._difference)
+        # THRESH_BINARY keeps values strictly above the threshold, i.e. >= pixel_threshold.
+        cv2.threshold(self._difference, self.pixel_threshold - 1, 255, cv2.THRESH_BINARY, dst=self._mask)
+        return ChangeMetrics(
+            mean_difference=cv2.mean(self._difference)[0],
+            changed_ratio=cv2.countNonZero(self._mask) / self._mask.size,
+        )
+
+    def update(self, frame: np.ndarray) -> bool:
+        """Measure ``frame`` and return True once the bite is confirmed."""
+        self.metrics = self.measure(frame)
+        changed = (
+            self.metrics.mean_difference >= self.difference_threshold
+            and self.metrics.changed_ratio >= self.changed_ratio
+        )
+        self.consecutive = self.consecutive + 1 if changed else 0
+        return self.consecutive >= self.confirmation_frames
+
+    def log_values(self) -> tuple[str, dict[str, Any]]:
+        return "metrics", dict(
+            difference=self.metrics.mean_difference, ratio=self.metrics.changed_ratio,
+            current=self.consecutive, required=self.confirmation_frames,
+        )
+
+
+class RunningStats:
+    """Streaming mean and variance (Welford's algorithm)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+
+class AdaptiveBiteDetector(BiteDetector):
+    """Fires on a statistical deviation from this cast's own water noise.
+
+    The first ``learning_frames`` frames after ``reset`` feed running
+    statistics of the mean difference and changed ratio; afterwards a frame
+    counts as changed when both lie at least ``sigma`` standard deviations
+    above their learned mean. The fixed thresholds still apply during
+    learning, and frames that pass them are kept out of the noise model so
+    that an early bite is not learned as background.
+    """
+
+    # Lower bounds for the learned deviations, so a perfectly still patch
+    # does not turn single-level flicker into a bite.
+    MIN_DIFFERENCE_STD = 1.0
+    MIN_RATIO_STD = 0.01
+
+    def __init__(self, *args, learning_frames: int = 15, sigma: float = 4.0):
+        super().__init__(*args)
+        self.learning_frames = learning_frames
+        self.sigma = sigma
+        self.difference_stats = RunningStats()
+        self.ratio_stats = RunningStats()
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "AdaptiveBiteDetector":
+        return cls(
+            config.changed_pixel_threshold,
+            config.difference_threshold,
+            config.changed_pixel_ratio,
+            config.confirmation_frames,
+            learning_frames=config.adaptive_learning_frames,
+            sigma=config.adaptive_sigma,
+        )
+
+    def configure(self, config: AppConfig) -> None:
+        super().configure(config)
+        self.learning_frames = config.adaptive_learning_frames
+        self.sigma = config.adaptive_sigma
+
+    @property
+    def learning(self) -> bool:
+        return self.difference_stats.count < self.learning_frames
+
+    def reset(self, baseline: np.ndarray) -> None:
+        super().reset(baseline)
+        self.difference_stats = RunningStats()
+        self.ratio_stats = RunningStats()
+
+    def update(self, frame: np.ndarray) -> bool:
+        if self.learning:
+            bitten = super().update(frame)
+            if not self.consecutive:
+                self.difference_stats.update(self.metrics.mean_difference)
+                self.ratio_stats.update(self.metrics.changed_ratio)
+            return bitten
+        self.metrics = self.measure(frame)
+        difference_limit = self.difference_stats.mean + self.sigma * max(
+            self.difference_stats.std, self.MIN_DIFFERENCE_STD
+        )
+        ratio_limit = self.ratio_stats.mean + self.sigma * max(self.ratio_stats.std, self.MIN_RATIO_STD)
+        changed = self.metrics.mean_difference >= difference_limit and self.metrics.changed_ratio >= ratio_limit
+        self.consecutive = self.consecutive + 1 if changed else 0
+        return self.consecutive >= self.confirmation_frames
+
+
+class FlowBiteDetector(BiteStrategy):
+    """Fires when the bobber itself sinks, tracked with sparse optical flow.
+
+    ``reset`` picks up to ``max_points`` corners on the bobber patch and
+    every frame follows them with pyramidal Lucas-Kanade flow from the
+    previous frame. The median vertical motion of the tracked points is
+    summed into the bobber's offset from where it rested; a frame counts
+    as a bite while the bobber sits at least ``displacement`` pixels below
+    it. Water texture and lighting that change around a still bobber move
+    no points, so they do not trigger it. Lost points are replaced by fresh
+    corners of the current frame without resetting the offset.
+    """
+
+    MIN_POINTS = 3
+    LK_PARAMETERS = dict(
+        winSize=(15, 15), maxLevel=2,
+        criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+    )
+
+    def __init__(self, displacement: float, confirmation_frames: int, max_points: int = 12):
+        self.displacement = displacement
+        self.confirmation_frames = confirmation_frames
+        self.max_points = max_points
+        self.consecutive = 0
+        self.offset = 0.0
+        self._previous: Optional[np.ndarray] = None
+        self._points: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "FlowBiteDetector":
+        return cls(config.flow_displacement, config.confirmation_frames)
+
+    def configure(self, config: AppConfig) -> None:
+        self.displacement = config.flow_displacement
+        self.confirmation_frames = config.confirmation_frames
+
+    def _features(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        return cv2.goodFeaturesToTrack(frame, self.max_points, 0.01, 3)
+
+    def reset(self, baseline: np.ndarray) -> None:
+        self._previous = baseline.copy()
+        self._points = self._features(self._previous)
+        self.consecutive = 0
+        self.offset = 0.0
+
+    def update(self, frame: np.ndarray) -> bool:
+        if self._previous is None or frame.shape != self._previous.shape:
+            return False
+        if self._points is not None and len(self._points):
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(
+                self._previous, frame, self._points, None, **self.LK_PARAMETERS
+            )
+            tracked = status.ravel() == 1
+            if tracked.any():
+                self.offset += float(np.median(moved[tracked, 0, 1] - self._points[tracked, 0, 1]))
+            self._points = moved[tracked].reshape(-1, 1, 2)
+        np.copyto(self._previous, frame)
+        if self._points is None or len(self._points) < self.MIN_POINTS:
+            self._points = self._features(self._previous)
+        self.consecutive = self.consecutive + 1 if self.offset >= self.displacement else 0
+        return self.consecutive >= self.confirmation_frames
+
+    def log_values(self) -> tuple[str, dict[str, Any]]:
+        return "flow_metrics", dict(
+            offset=self.offset, points=0 if self._points is None else len(self._points),
+            current=self.consecutive, required=self.confirmation_frames,
+        )
+
+
+DETECTORS = {"diff": BiteDetector, "adaptive": AdaptiveBiteDetector, "flow": FlowBiteDetector}
+
+
+def create_bite_detector(config: AppConfig) -> BiteStrategy:
+    return DETECTORS.get(config.bite_detector, BiteDetector).from_config(config)
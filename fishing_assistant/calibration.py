@@ -0,0 +1,355 @@
+"""Detection threshold calibration from labelled recordings.
+
+A clip is a recording directory (see ``recording.py``) of one cast whose
+``meta.json`` labels describe it:
+
+- ``bite_frame``: index of the first frame that shows the bite, or
+  ``bite_at`` in seconds of the recording; neither for a cast without one;
+- ``baseline_frame``: the frame the bobber was found in and the bite
+  patch's baseline was taken from, 0 by default;
+- ``bobber``: ``[x, y, width, height]`` of the bobber patch in recorded
+  pixels; the whole frame when missing.
+
+The frames after the baseline are measured once per clip. Every setting of
+a grid is then scored from those measurements alone, in vectorized NumPy
+and split over a process pool, and the settings on the Pareto front of
+false reels against bite latency are reported.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from .config import AppConfig
+from .recording import META_FILE, load_recording
+from .timing import FALLBACK_PROFILE
+from .vision import Template
+
+
+# Calibrated settings, in the axis order of a grid.
+PARAMETERS = (
+    "confidence_threshold", "difference_threshold", "changed_pixel_threshold",
+    "changed_pixel_ratio", "confirmation_frames",
+)
+# Text keys naming each parameter, shared with the detection tab.
+PARAMETER_LABELS = dict(zip(PARAMETERS, (
+    "confidence", "mean_difference", "pixel_threshold", "pixel_ratio", "confirmation_frames",
+)))
+
+DEFAULT_GRID = {
+    "confidence_threshold": np.round(np.arange(0.5, 0.96, 0.05), 2),
+    "difference_threshold": np.arange(1.0, 41.0, 1.0),
+    "changed_pixel_threshold": np.arange(5, 81, 5),
+    "changed_pixel_ratio": np.round(np.arange(0.01, 0.405, 0.01), 2),
+    "confirmation_frames": np.arange(1, 6),
+}
+
+# A missed or falsely reeled bite costs the whole wait for the next one.
+MISS_SECONDS = FALLBACK_PROFILE.cast_timeout
+
+
+@dataclass(frozen=True)
+class Clip:
+    """What calibration needs of one labelled cast, measured once.
+
+    Index ``t`` is the ``t``-th frame after the baseline. ``means[t]`` is
+    its mean blurred difference from the baseline and ``ratios[t, p]`` the
+    fraction of patch pixels that differ by at least ``p``, as
+    ``BiteDetector.measure`` finds them. ``bite`` indexes the first frame
+    showing the bite, or is None. The confidences are the best template
+    scores on the bobber in the baseline frame, elsewhere in that frame
+    and anywhere in the earlier search frames; None without templates.
+    """
+
+    name: str
+    means: np.ndarray
+    ratios: np.ndarray
+    seconds: np.ndarray
+    bite: Optional[int]
+    bobber_confidence: Optional[float] = None
+    rival_confidence: float = -1.0
+    early_confidence: float = -1.0
+
+    def locked(self, confidences: np.ndarray) -> np.ndarray:
+        """Whether the search settles on this clip's bobber at each confidence threshold.
+
+        A lower threshold accepts water in the frames before the bobber
+        lands; a higher one rejects the bobber itself.
+        """
+        if self.bobber_confidence is None:
+            return np.ones(len(confidences), dtype=bool)
+        return (
+            (confidences <= self.bobber_confidence)
+            & (confidences > self.early_confidence)
+            & (self.rival_confidence < self.bobber_confidence)
+        )
+
+
+def _blur(frame: np.ndarray) -> np.ndarray:
+    return cv2.GaussianBlur(np.ascontiguousarray(frame), (5, 5), 0)
+
+
+def _template_scores(frame: np.ndarray, templates: Iterable[Template], patch) -> tuple[float, float]:
+    """Best score on the bobber at ``patch`` and best score elsewhere in ``frame``."""
+    on_bobber, elsewhere = -1.0, -1.0
+    for template in templates:
+        if template.height > frame.shape[0] or template.width > frame.shape[1]:
+            continue
+        scores = cv2.matchTemplate(frame, template.gray, cv2.TM_CCOEFF_NORMED)
+        if patch is None:
+            elsewhere = max(elsewhere, float(scores.max()))
+            continue
+        x, y, width, height = patch
+        # Locations whose box sits within a quarter of the bobber's size count as the bobber.
+        near = np.zeros(scores.shape, dtype=bool)
+        near[max(0, y - height // 4):y + height // 4 + 1, max(0, x - width // 4):x + width // 4 + 1] = True
+        if near.any():
+            on_bobber = max(on_bobber, float(scores[near].max()))
+        if not near.all():
+            elsewhere = max(elsewhere, float(scores[~near].max()))
+    return on_bobber, elsewhere
+
+
+def measure_clip(
+    name: str,
+    frames: Sequence[np.ndarray],
+    seconds: Sequence[float],
+    bite_frame: Optional[int],
+    baseline_frame: int = 0,
+    bobber: Optional[Sequence[int]] = None,
+    templates: Sequence[Template] = (),
+) -> Clip:
+    """Measure full gray ``frames`` of one cast; indices are into ``frames``."""
+    if not baseline_frame < len(frames) - 1:
+        raise ValueError(f"{name}: no frames after the baseline")
+    if bite_frame is not None and bite_frame <= baseline_frame:
+        raise ValueError(f"{name}: the bite must come after the baseline frame")
+    height, width = frames[0].shape[:2]
+    x, y, patch_width, patch_height = bobber if bobber is not None else (0, 0, width, height)
+    patches = (frame[y:y + patch_height, x:x + patch_width] for frame in frames[baseline_frame:])
+    baseline = _blur(next(patches))
+    differences = np.stack([cv2.absdiff(baseline, _blur(patch)) for patch in patches])
+    count = len(differences)
+    # One histogram per frame in a single bincount, then pixels at or above each level.
+    offsets = differences.reshape(count, -1).astype(np.int64) + 256 * np.arange(count)[:, None]
+    histograms = np.bincount(offsets.ravel(), minlength=256 * count).reshape(count, 256)
+    at_least = np.cumsum(histograms[:, ::-1], axis=1)[:, ::-1]
+    clip = Clip(
+        name=name,
+        means=differences.reshape(count, -1).mean(axis=1),
+        ratios=at_least / differences[0].size,
+        seconds=np.asarray(seconds, dtype=np.float64)[baseline_frame + 1:],
+        bite=None if bite_frame is None else bite_frame - baseline_frame - 1,
+    )
+    templates = list(templates)
+    if not templates or bobber is None:
+        return clip
+    bobber_confidence, rival_confidence = _template_scores(
+        frames[baseline_frame], templates, tuple(bobber)
+    )
+    early_confidence = max(
+        (_template_scores(frame, templates, None)[1] for frame in frames[:baseline_frame]),
+        default=-1.0,
+    )
+    return replace(
+        clip, bobber_confidence=bobber_confidence,
+        rival_confidence=rival_confidence, early_confidence=early_confidence,
+    )
+
+
+def load_clip(directory: Path, templates: Sequence[Template] = ()) -> Clip:
+    recording = load_recording(directory)
+    labels = recording.labels
+    bite_frame = labels.get("bite_frame")
+    if bite_frame is None and labels.get("bite_at") is not None:
+        bite_frame = int(np.searchsorted(recording.timestamps, labels["bite_at"], side="left"))
+    bobber = labels.get("bobber")
+    if bobber is not None and len(bobber) != 4:
+        raise ValueError(f"{Path(directory).name}: bobber label must be [x, y, width, height]")
+    return measure_clip(
+        Path(directory).name,
+        [recording.frame(index) for index in range(len(recording))],
+        recording.timestamps,
+        None if bite_frame is None else int(bite_frame),
+        int(labels.get("baseline_frame", 0)),
+        bobber,
+        templates,
+    )
+
+
+def load_clips(directory: Path, templates: Sequence[Template] = ()) -> list[Clip]:
+    """``directory`` itself if it is a recording, otherwise every recording inside it."""
+    directory = Path(directory)
+    if (directory / META_FILE).exists():
+        return [load_clip(directory, templates)]
+    return [
+        load_clip(child, templates)
+        for child in sorted(directory.iterdir())
+        if (child / META_FILE).exists()
+    ]
+
+
+def first_reels(
+    measurements: list[tuple[np.ndarray, np.ndarray]],
+    differences: np.ndarray,
+    ratios: np.ndarray,
+    confirmations: np.ndarray,
+) -> np.ndarray:
+    """Frame of the first confirmed bite for every clip and setting at one pixel threshold.
+
+    ``measurements`` holds each clip's means and its changed ratios at the
+    pixel threshold. The result has shape ``(clips, confirmations,
+    differences, ratios)``; -1 where the detector never fires.
+    """
+    shape = (len(measurements), len(confirmations), len(differences), len(ratios))
+    result = np.full(shape, -1, dtype=np.int32)
+    for index, (means, changed_ratios) in enumerate(measurements):
+        # (frames, differences, ratios)
+        changed = (
+            (means[:, None, None] >= differences[None, :, None])
+            & (changed_ratios[:, None, None] >= ratios[None, None, :])
+        )
+        run = np.zeros(changed.shape[1:], dtype=np.int32)
+        fired = result[index]
+        for frame, frame_changed in enumerate(changed):
+            run += 1
+            run *= frame_changed
+            for confirmation, first in zip(confirmations, fired):
+                first[(first < 0) & (run >= confirmation)] = frame
+    return result
+
+
+def _first_reels_task(arguments) -> np.ndarray:
+    return first_reels(*arguments)
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """One calibrated setting and how it did over the clips."""
+
+    settings: dict
+    false_reels: int
+    misses: int
+    latency: float
+
+
+@dataclass
+class Evaluation:
+    """Scores of every grid setting, indexed by the axes in ``parameters``.
+
+    ``latency`` is the mean seconds from the bite to the reel over clips
+    with a bite, counting ``MISS_SECONDS`` for each bite that is missed or
+    preceded by a false reel.
+    """
+
+    parameters: tuple[str, ...]
+    grid: dict[str, np.ndarray]
+    false_reels: np.ndarray
+    misses: np.ndarray
+    latency: np.ndarray
+
+    def candidate(self, index: tuple[int, ...]) -> Candidate:
+        settings = {}
+        for name, position in zip(self.parameters, index):
+            value = self.grid[name][position]
+            integral = name in ("changed_pixel_threshold", "confirmation_frames")
+            settings[name] = int(value) if integral else float(value)
+        return Candidate(
+            settings, int(self.false_reels[index]), int(self.misses[index]), float(self.latency[index])
+        )
+
+    def pareto_front(self) -> list[Candidate]:
+        """Settings no other setting beats on both false reels and latency, fewest false reels first.
+
+        Among settings that score the same, the one nearest the middle of
+        them on every axis is kept, leaving margin on both sides of each
+        threshold.
+        """
+        false_reels, latency = self.false_reels.ravel(), np.round(self.latency.ravel(), 9)
+        order = np.lexsort((latency, false_reels))
+        front = []
+        best_latency = np.inf
+        for position in order:
+            if latency[position] >= best_latency:
+                continue
+            best_latency = latency[position]
+            tied = np.flatnonzero((false_reels == false_reels[position]) & (latency == latency[position]))
+            indices = np.stack(np.unravel_index(tied, self.false_reels.shape), axis=1)
+            centre = np.median(indices, axis=0)
+            chosen = indices[np.argmin(np.abs(indices - centre).sum(axis=1))]
+            front.append(self.candidate(tuple(int(value) for value in chosen)))
+        return front
+
+
+def evaluate(
+    clips: Sequence[Clip], grid: Optional[dict] = None, workers: Optional[int] = None
+) -> Evaluation:
+    """Score every setting of ``grid`` on ``clips``.
+
+    The work is split by pixel threshold over ``workers`` processes (all
+    CPUs by default; 1 runs it inline). The confidence threshold is only
+    calibrated when every clip has template confidences.
+    """
+    if not clips:
+        raise ValueError("no clips to calibrate with")
+    grid = {name: np.asarray(values) for name, values in (grid or DEFAULT_GRID).items()}
+    parameters = PARAMETERS
+    if any(clip.bobber_confidence is None for clip in clips):
+        parameters = PARAMETERS[1:]
+    differences = grid["difference_threshold"].astype(np.float64)
+    pixels = np.clip(grid["changed_pixel_threshold"].astype(np.int64), 0, 255)
+    ratios = grid["changed_pixel_ratio"].astype(np.float64)
+    confirmations = grid["confirmation_frames"].astype(np.int32)
+    tasks = [
+        ([(clip.means, clip.ratios[:, pixel]) for clip in clips], differences, ratios, confirmations)
+        for pixel in pixels
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        fired = [_first_reels_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(min(workers, len(tasks))) as executor:
+            fired = list(executor.map(_first_reels_task, tasks))
+    # (pixels, clips, confirmations, differences, ratios)
+    # -> (clips, differences, pixels, ratios, confirmations)
+    fired = np.stack(fired).transpose(1, 3, 0, 4, 2)
+
+    confidences = grid["confidence_threshold"] if parameters is PARAMETERS else np.zeros(1)
+    shape = (len(confidences),) + fired.shape[1:]
+    false_reels = np.zeros(shape, dtype=np.int32)
+    misses = np.zeros(shape, dtype=np.int32)
+    latency = np.zeros(shape, dtype=np.float64)
+    bites = 0
+    for clip, first in zip(clips, fired):
+        locked = clip.locked(confidences).reshape(-1, 1, 1, 1, 1)
+        if clip.bite is None:
+            false_reels += locked & (first >= 0)
+            continue
+        bites += 1
+        caught = first >= clip.bite
+        false_reels += locked & (first >= 0) & ~caught
+        misses += ~(locked & caught)
+        delay = clip.seconds[np.maximum(first, 0)] - clip.seconds[clip.bite]
+        latency += np.where(locked & caught, delay, MISS_SECONDS)
+    if parameters is not PARAMETERS:
+        false_reels, misses, latency = false_reels[0], misses[0], latency[0]
+    return Evaluation(parameters, grid, false_reels, misses, latency / max(1, bites))
+
+
+def choose(front: Sequence[Candidate], max_false_reels: int = 0) -> Candidate:
+    """The fastest setting with at most ``max_false_reels``, else the one with the fewest."""
+    allowed = [candidate for candidate in front if candidate.false_reels <= max_false_reels]
+    if not allowed:
+        return front[0]
+    return min(allowed, key=lambda candidate: candidate.latency)
+
+
+def apply_settings(config: AppConfig, candidate: Candidate) -> AppConfig:
+    calibrated = replace(config, image_paths=list(config.image_paths), **candidate.settings)
+    calibrated.normalize()
+    return calibrated
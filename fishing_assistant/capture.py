@@ -0,0 +1,274 @@
+"""Frame sources that hand out grayscale frames in reusable buffers."""
+
+import functools
+from pathlib import Path
+import sys
+from typing import Iterable, Optional, Sequence
+
+import cv2
+import numpy as np
+
+
+Region = tuple[int, int, int, int]
+
+
+class FrameSource:
+    """Captures grayscale frames of a screen region.
+
+    The returned array is owned by the source and is overwritten by the next
+    grab of the same size, unless the caller passes its own ``out`` buffer.
+    Copy it (or derive a new array from it) before keeping it across grabs.
+    """
+
+    _MAX_BUFFERS = 8
+
+    def __init__(self) -> None:
+        self._buffers: dict[tuple[int, int], np.ndarray] = {}
+
+    def grab_gray(self, region: Region, out: Optional[np.ndarray] = None) -> np.ndarray:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self._buffers.clear()
+
+    def _buffer(self, region: Region, out: Optional[np.ndarray]) -> np.ndarray:
+        shape = (region[3], region[2])
+        if out is not None:
+            if out.shape != shape or out.dtype != np.uint8:
+                raise ValueError(f"output buffer must be uint8 with shape {shape}")
+            return out
+        buffer = self._buffers.get(shape)
+        if buffer is None:
+            if len(self._buffers) >= self._MAX_BUFFERS:
+                self._buffers.clear()
+            buffer = self._buffers[shape] = np.empty(shape, dtype=np.uint8)
+        return buffer
+
+
+class ScreenFrameSource(FrameSource):
+    """Desktop capture.
+
+    On Windows only the requested rectangle is copied, by GDI ``BitBlt``,
+    into a ``DibSection`` kept per region size, and converted from BGRA to
+    gray into the reusable buffer. Elsewhere Pillow's ``ImageGrab`` captures
+    the whole screen, crops it and converts the crop.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._sections: dict[tuple[int, int], "DibSection"] = {}
+
+    def grab_gray(self, region: Region, out: Optional[np.ndarray] = None) -> np.ndarray:
+        buffer = self._buffer(region, out)
+        if sys.platform == "win32":
+            return self._section(buffer.shape).grab(region, buffer)
+        from PIL import ImageGrab
+
+        left, top, width, height = region
+        image = ImageGrab.grab(bbox=(left, top, left + width, top + height), all_screens=True)
+        cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY, dst=buffer)
+        return buffer
+
+    def close(self) -> None:
+        for section in self._sections.values():
+            section.close()
+        self._sections.clear()
+        super().close()
+
+    def _section(self, shape: tuple[int, int]) -> "DibSection":
+        section = self._sections.get(shape)
+        if section is None:
+            if len(self._sections) >= self._MAX_BUFFERS:
+                for stale in self._sections.values():
+                    stale.close()
+                self._sections.clear()
+            section = self._sections[shape] = DibSection(shape[1], shape[0])
+        return section
+
+
+# GDI constants for ``DibSection``.
+_SRCCOPY = 0x00CC0020
+_DIB_RGB_COLORS = 0
+_BI_RGB = 0
+_PER_MONITOR_AWARE = -3
+
+
+@functools.lru_cache(maxsize=None)
+def _gdi():
+    """user32 and gdi32 with the signatures ``DibSection`` calls them with; Windows only."""
+    import ctypes
+    from ctypes import wintypes
+
+    user32, gdi32 = ctypes.WinDLL("user32"), ctypes.WinDLL("gdi32")
+    user32.GetDC.argtypes = [wintypes.HWND]
+    user32.GetDC.restype = wintypes.HDC
+    user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+    gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+    gdi32.CreateCompatibleDC.restype = wintypes.HDC
+    gdi32.CreateDIBSection.argtypes = [
+        wintypes.HDC, ctypes.c_void_p, wintypes.UINT, ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE,
+        wintypes.DWORD,
+    ]
+    gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+    gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+    gdi32.SelectObject.restype = wintypes.HGDIOBJ
+    gdi32.BitBlt.argtypes = [
+        wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD,
+    ]
+    gdi32.BitBlt.restype = wintypes.BOOL
+    gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+    gdi32.DeleteDC.argtypes = [wintypes.HDC]
+    gdi32.GdiFlush.argtypes = []
+    # Windows 10 1607 and later; older systems capture in the process's own DPI mode.
+    set_awareness = getattr(user32, "SetThreadDpiAwarenessContext", None)
+    if set_awareness is not None:
+        set_awareness.argtypes = [wintypes.HANDLE]
+        set_awareness.restype = wintypes.HANDLE
+    return ctypes, user32, gdi32, set_awareness
+
+
+class DibSection:
+    """A top-down 32-bit GDI bitmap that screen rectangles of one size are copied into.
+
+    Its pixels are shared memory wrapped by ``pixels``, so a grab is one
+    ``BitBlt`` of the rectangle and one conversion to gray. Coordinates are
+    physical screen pixels across all monitors, like Pillow's ``ImageGrab``.
+    """
+
+    def __init__(self, width: int, height: int):
+        ctypes, user32, gdi32, _ = _gdi()
+
+        class BitmapInfoHeader(ctypes.Structure):
+            _fields_ = [
+                ("biSize", ctypes.c_uint32), ("biWidth", ctypes.c_int32), ("biHeight", ctypes.c_int32),
+                ("biPlanes", ctypes.c_uint16), ("biBitCount", ctypes.c_uint16),
+                ("biCompression", ctypes.c_uint32), ("biSizeImage", ctypes.c_uint32),
+                ("biXPelsPerMeter", ctypes.c_int32), ("biYPelsPerMeter", ctypes.c_int32),
+                ("biClrUsed", ctypes.c_uint32), ("biClrImportant", ctypes.c_uint32),
+            ]
+
+        self.width, self.height = width, height
+        self._screen = user32.GetDC(None)
+        self._memory = gdi32.CreateCompatibleDC(self._screen)
+        # A negative height makes the rows run top to bottom, like a numpy image.
+        header = BitmapInfoHeader(ctypes.sizeof(BitmapInfoHeader), width, -height, 1, 32, _BI_RGB)
+        bits = ctypes.c_void_p()
+        self._bitmap = gdi32.CreateDIBSection(
+            self._memory, ctypes.byref(header), _DIB_RGB_COLORS, ctypes.byref(bits), None, 0
+        )
+        if not self._bitmap:
+            self._release()
+            raise OSError(f"cannot create a {width}x{height} screen capture bitmap")
+        self._previous = gdi32.SelectObject(self._memory, self._bitmap)
+        memory = (ctypes.c_uint8 * (width * height * 4)).from_address(bits.value)
+        self.pixels = np.ctypeslib.as_array(memory).reshape(height, width, 4)
+
+    def grab(self, region: Region, out: np.ndarray) -> np.ndarray:
+        _, _, gdi32, set_awareness = _gdi()
+        left, top, width, height = region
+        previous = set_awareness(_PER_MONITOR_AWARE) if set_awareness is not None else None
+        try:
+            copied = gdi32.BitBlt(self._memory, 0, 0, width, height, self._screen, left, top, _SRCCOPY)
+        finally:
+            if previous:
+                set_awareness(previous)
+        if not copied:
+            raise OSError("screen capture failed")
+        # GDI may batch the copy; it must have landed before the pixels are read.
+        gdi32.GdiFlush()
+        cv2.cvtColor(self.pixels, cv2.COLOR_BGRA2GRAY, dst=out)
+        return out
+
+    def close(self) -> None:
+        if self._bitmap:
+            _, _, gdi32, _ = _gdi()
+            gdi32.SelectObject(self._memory, self._previous)
+            gdi32.DeleteObject(self._bitmap)
+            self._bitmap = None
+            self.pixels = None
+        self._release()
+
+    def _release(self) -> None:
+        _, user32, gdi32, _ = _gdi()
+        if self._memory:
+            gdi32.DeleteDC(self._memory)
+            self._memory = None
+        if self._screen:
+            user32.ReleaseDC(None, self._screen)
+            self._screen = None
+
+
+class ArrayFrameSource(FrameSource):
+    """Serves frames from in-memory arrays, for tests and benchmarks.
+
+    Each array stands for the whole desktop, with its top-left pixel at
+    ``origin`` in screen coordinates. Every grab advances to the next frame;
+    after the last one the sequence restarts when ``loop`` is set and
+    otherwise keeps returning the final frame.
+    """
+
+    def __init__(
+        self,
+        frames: Sequence[np.ndarray],
+        origin: tuple[int, int] = (0, 0),
+        loop: bool = True,
+    ) -> None:
+        super().__init__()
+        if len(frames) == 0:
+            raise ValueError("at least one frame is required")
+        self.frames = frames
+        self.origin = origin
+        self.loop = loop
+        self.index = 0
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str], **kwargs) -> "ArrayFrameSource":
+        frames = []
+        for path in paths:
+            image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                raise ValueError(f"cannot decode frame: {Path(path).name}")
+            frames.append(image)
+        return cls(frames, **kwargs)
+
+    def _next_frame(self) -> np.ndarray:
+        frame = self.frames[self.index]
+        if self.index + 1 < len(self.frames):
+            self.index += 1
+        elif self.loop:
+            self.index = 0
+        return frame
+
+    def grab_gray(self, region: Region, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return crop_gray(self._next_frame(), region, self.origin, self._buffer(region, out))
+
+
+def crop_gray(
+    frame: np.ndarray,
+    region: Region,
+    origin: tuple[int, int],
+    out: np.ndarray,
+) -> np.ndarray:
+    """Copy ``region`` of a desktop-sized frame into ``out`` as grayscale.
+
+    Parts of the region that fall outside the frame are filled with black,
+    like an off-screen area in a real capture.
+    """
+    left, top, width, height = region
+    x0, y0 = left - origin[0], top - origin[1]
+    src_x0, src_y0 = max(0, x0), max(0, y0)
+    src_x1 = min(frame.shape[1], x0 + width)
+    src_y1 = min(frame.shape[0], y0 + height)
+    if src_x1 <= src_x0 or src_y1 <= src_y0:
+        out.fill(0)
+        return out
+    if src_x0 != x0 or src_y0 != y0 or src_x1 - x0 != width or src_y1 - y0 != height:
+        out.fill(0)
+    target = out[src_y0 - y0:src_y1 - y0, src_x0 - x0:src_x1 - x0]
+    source = frame[src_y0:src_y1, src_x0:src_x1]
+    if source.ndim == 3:
+        cv2.cvtColor(source, cv2.COLOR_BGR2GRAY, dst=target)
+    else:
+        np.copyto(target, source)
+    return out
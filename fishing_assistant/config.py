@@ -2,13 +2,35 @@
 
 from dataclasses import asdict, dataclass, fields
 import json
+import os
 from pathlib import Path
-from typing import Any
+import sys
+from typing import Any, Optional
 
 
 CONFIG_FILE = Path("fishing_assistant_config.json")
 
 
+def data_directory() -> Path:
+    """Per-user directory for the files the assistant writes by itself.
+
+    ``%LOCALAPPDATA%`` on Windows and ``$XDG_DATA_HOME`` (``~/.local/share``)
+    elsewhere, so running from another directory leaves nothing there.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / "fishing_assistant"
+
+
+def data_path(setting: str) -> Optional[Path]:
+    """The file a path setting names; relative paths live in ``data_directory()``, empty is None."""
+    if not setting:
+        return None
+    return data_directory() / setting
+
+
 @dataclass
 class AppConfig:
     image_paths: list[str] = None
@@ -25,10 +47,50 @@ class AppConfig:
     changed_pixel_threshold: int = 20
     changed_pixel_ratio: float = 0.08
     confirmation_frames: int = 2
+    bite_detector: str = "diff"
+    adaptive_learning_frames: int = 15
+    adaptive_sigma: float = 4.0
+    flow_displacement: float = 3.0
+    bite_source: str = "visual"
+    audio_reference: str = ""
+    audio_threshold: float = 0.6
+    search_fps: float = 3.0
+    bite_fps: float = 10.0
+    pipelined_capture: bool = False
+    ring_capacity: int = 3
+    record_directory: str = ""
+    record_max_mb: int = 2048
+    metrics_log_interval: float = 1.0
+    log_max_lines: int = 2000
+    log_file: str = "fishing_assistant.log"
+    log_file_max_kb: int = 1024
+    log_file_backups: int = 3
+    pyramid_levels: int = 0
+    pyramid_candidates: int = 3
+    bobber_locator: str = "template"
+    feature_min_inliers: int = 4
+    template_scales: list[float] = None
+    template_angles: list[float] = None
+    match_threads: int = 1
+    certain_confidence: float = 1.0
+    roi_tracking: bool = True
+    roi_margin: int = 150
+    roi_history: int = 10
+    instrumentation: bool = True
+    metrics_export_path: str = ""
+    metrics_export_interval: float = 30.0
+    template_cache_directory: str = "template_cache"
+    multi_client: bool = False
+    adaptive_timing: bool = False
+    stats_database: str = "fishing_stats.sqlite3"
 
     def __post_init__(self) -> None:
         if self.image_paths is None:
             self.image_paths = []
+        if self.template_scales is None:
+            self.template_scales = [1.0]
+        if self.template_angles is None:
+            self.template_angles = []
 
     def normalize(self) -> None:
         if self.language not in {"zh_CN", "en_US"}:
@@ -37,6 +99,43 @@ class AppConfig:
         self.afk_time_min = max(1, int(self.afk_time_min))
         self.afk_time_max = max(self.afk_time_min, int(self.afk_time_max))
         self.confirmation_frames = max(1, int(self.confirmation_frames))
+        self.search_fps = min(60.0, max(0.5, float(self.search_fps)))
+        self.bite_fps = min(60.0, max(0.5, float(self.bite_fps)))
+        self.ring_capacity = max(2, int(self.ring_capacity))
+        self.record_max_mb = max(0, int(self.record_max_mb))
+        self.metrics_log_interval = max(0.0, float(self.metrics_log_interval))
+        self.log_max_lines = max(100, int(self.log_max_lines))
+        self.log_file_max_kb = max(16, int(self.log_file_max_kb))
+        self.log_file_backups = max(0, int(self.log_file_backups))
+        if self.bite_detector not in {"diff", "adaptive", "flow"}:
+            self.bite_detector = "diff"
+        self.adaptive_learning_frames = max(2, int(self.adaptive_learning_frames))
+        self.adaptive_sigma = max(0.5, float(self.adaptive_sigma))
+        self.flow_displacement = max(0.5, float(self.flow_displacement))
+        if self.bite_source not in {"visual", "audio", "any"}:
+            self.bite_source = "visual"
+        self.audio_threshold = min(1.0, max(0.1, float(self.audio_threshold)))
+        self.pyramid_levels = min(4, max(0, int(self.pyramid_levels)))
+        self.pyramid_candidates = max(1, int(self.pyramid_candidates))
+        if self.bobber_locator not in {"template", "features"}:
+            self.bobber_locator = "template"
+        self.feature_min_inliers = max(3, int(self.feature_min_inliers))
+        scales = sorted({round(float(scale), 3) for scale in self.template_scales if float(scale) > 0})
+        self.template_scales = scales or [1.0]
+        self.match_threads = max(1, int(self.match_threads))
+        self.roi_margin = max(0, int(self.roi_margin))
+        self.roi_history = max(1, int(self.roi_history))
+        self.certain_confidence = min(1.0, max(0.0, float(self.certain_confidence)))
+        self.template_angles = sorted({round(float(angle), 1) for angle in self.template_angles})
+        self.metrics_export_interval = max(1.0, float(self.metrics_export_interval))
+
+
+def config_from_dict(raw: dict[str, Any]) -> AppConfig:
+    """Build a normalized config, ignoring keys this version does not know."""
+    allowed = {field.name for field in fields(AppConfig)}
+    config = AppConfig(**{key: value for key, value in raw.items() if key in allowed})
+    config.normalize()
+    return config
 
 
 def load_config(path: Path = CONFIG_FILE) -> AppConfig:
@@ -44,10 +143,7 @@ def load_config(path: Path = CONFIG_FILE) -> AppConfig:
         return AppConfig()
     try:
         raw: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
-        allowed = {field.name for field in fields(AppConfig)}
-        config = AppConfig(**{key: value for key, value in raw.items() if key in allowed})
-        config.normalize()
-        return config
+        return config_from_dict(raw)
     except (OSError, ValueError, TypeError, json.JSONDecodeError):
         return AppConfig()
 
@@ -0,0 +1,125 @@
+"""Keyboard and pointer input, and a queue that runs it off the engine thread."""
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    from .engine import Clock
+
+
+class Controls:
+    """Keyboard and pointer input; ``backends.windows`` drives the game."""
+
+    def press(self, key: str) -> None:
+        raise NotImplementedError
+
+    def move_to(self, x: int, y: int) -> None:
+        raise NotImplementedError
+
+    def click(self) -> None:
+        raise NotImplementedError
+
+
+class RecordedControls(Controls):
+    """Records inputs as ``(time, action)`` pairs.
+
+    ``move_duration`` makes ``move_to`` block for that many real seconds,
+    like the platform backend's pointer tween.
+    """
+
+    def __init__(self, clock: "Clock", move_duration: float = 0.0):
+        self.clock = clock
+        self.move_duration = move_duration
+        self.actions: list[tuple[float, str]] = []
+
+    def press(self, key: str) -> None:
+        self.actions.append((self.clock.now(), f"press:{key}"))
+
+    def move_to(self, x: int, y: int) -> None:
+        if self.move_duration:
+            time.sleep(self.move_duration)
+        self.actions.append((self.clock.now(), f"move:{x},{y}"))
+
+    def click(self) -> None:
+        self.actions.append((self.clock.now(), "click"))
+
+
+_CLOSE = object()
+
+
+class InputQueue(Controls):
+    """Runs ``controls`` input on a dedicated action thread.
+
+    ``press``, ``move_to`` and ``click`` enqueue the action and return at
+    once, so a pointer move runs while the engine captures its bite
+    baseline. Actions run in the order they were queued; ``flush`` waits
+    for them, for example before the window is activated. Each action is
+    timed as the ``input`` stage, and the time a click spent queued, from
+    the moment the bite was confirmed until it is issued, as
+    ``bite_to_click``. ``failed`` receives any exception an action raises,
+    on the action thread. With ``threaded`` false every action runs inline
+    on the caller's thread instead.
+    """
+
+    def __init__(
+        self,
+        controls: Controls,
+        instrumentation: Optional[Instrumentation] = None,
+        failed: Callable[[Exception], None] = lambda exc: None,
+        threaded: bool = True,
+    ):
+        self.controls = controls
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self.failed = failed
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="input", daemon=True)
+        if threaded:
+            self._thread.start()
+
+    def press(self, key: str) -> None:
+        self._submit("press", key)
+
+    def move_to(self, x: int, y: int) -> None:
+        self._submit("move_to", x, y)
+
+    def click(self) -> None:
+        self._submit("click")
+
+    def flush(self) -> None:
+        """Wait until every queued action has run."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Run the remaining actions and stop the action thread."""
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+
+    def _submit(self, action: str, *arguments) -> None:
+        if self._thread.is_alive():
+            self._queue.put((time.perf_counter(), action, arguments))
+        else:
+            self._perform(time.perf_counter(), action, arguments)
+
+    def _perform(self, queued_at: float, action: str, arguments: tuple) -> None:
+        if action == "click":
+            self.instrumentation.observe("bite_to_click", (time.perf_counter() - queued_at) * 1000)
+        try:
+            with self.instrumentation.stage("input"):
+                getattr(self.controls, action)(*arguments)
+        except Exception as exc:
+            self.failed(exc)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _CLOSE:
+                    return
+                self._perform(*item)
+            finally:
+                self._queue.task_done()
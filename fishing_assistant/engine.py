@@ -0,0 +1,689 @@
+"""Qt-free fishing state machine with blocking and asyncio drivers."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, replace
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Callable, Generator, Optional
+
+from .audio import AudioBiteDetector, AudioListener, AudioSource, LoopbackAudioSource
+from .backends import BackendUnavailable, load_backend
+from .bite import BiteDetector, DETECTORS, create_bite_detector
+from .capture import FrameSource, Region, ScreenFrameSource
+from .config import CONFIG_FILE, AppConfig, data_path
+from .controls import Controls, InputQueue
+from .events import LogChannel
+from .features import FeatureMatcher
+from .instrumentation import Instrumentation
+from .matching import ParallelMatcher
+from .pipeline import DirectFeed, Grab, PipelinedFeed
+from .recording import RecordingFrameSource
+from .scheduler import FrameScheduler
+from .store import CastRecord, SessionWriter, database_path
+from .template_cache import TemplateCache
+from .texts import text
+from .timing import TimingModel
+from .tracking import BobberTracker
+from .vision import Match, TemplateBank, load_templates
+from .window import CachedWindow, WindowProvider
+
+
+# Yields seconds to wait; the driver sends back whether the engine is still active.
+Steps = Generator[float, bool, None]
+
+STATES = ("starting", "casting", "searching", "monitoring", "waiting", "stopped")
+
+
+class Clock:
+    """Monotonic engine time.
+
+    ``pause`` is told about every wait and returns how long the driver must
+    really sleep for it.
+    """
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def pause(self, seconds: float) -> float:
+        return seconds
+
+
+class VirtualClock(Clock):
+    """Real processing time plus skipped waits.
+
+    Waits take no real time but advance ``now``, so a session runs faster
+    than real time while measured latencies still include processing.
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.skipped = 0.0
+
+    def now(self) -> float:
+        return time.perf_counter() - self._started + self.skipped
+
+    def pause(self, seconds: float) -> float:
+        self.skipped += max(0.0, seconds)
+        return 0.0
+
+
+def load_template_bank(config: AppConfig, unreadable: Callable[[str], None]) -> TemplateBank:
+    """Decode ``config.image_paths`` through the template cache, if one is configured.
+
+    ``unreadable`` receives the file name of every image that could not be read.
+    """
+    load = load_templates
+    cache = data_path(config.template_cache_directory)
+    if cache is not None:
+        load = TemplateCache(cache).load_templates
+    return load(
+        config.image_paths, unreadable, "{name}",
+        config.template_scales, config.template_angles, config.pyramid_levels,
+        config.bobber_locator == "features",
+    )
+
+
+def reload_template_bank(
+    bank: TemplateBank, previous: AppConfig, config: AppConfig, unreadable: Callable[[str], None]
+) -> TemplateBank:
+    """``bank``, built for ``previous``, brought up to date with ``config``.
+
+    Only images new to the bank are decoded; a change of the generated
+    scales or angles rebuilds it through ``load_template_bank``.
+    """
+    if (previous.template_scales, previous.template_angles) != (config.template_scales, config.template_angles):
+        return load_template_bank(config, unreadable)
+    if previous.image_paths == config.image_paths:
+        return bank
+    return bank.updated(config.image_paths, lambda paths: load_templates(
+        paths, unreadable, "{name}", config.template_scales, config.template_angles,
+        config.pyramid_levels, config.bobber_locator == "features",
+    ))
+
+
+def snapshot(config: AppConfig) -> AppConfig:
+    """A copy of ``config`` that shares no lists with it."""
+    return replace(
+        config, image_paths=list(config.image_paths),
+        template_scales=list(config.template_scales), template_angles=list(config.template_angles),
+    )
+
+
+class FishingEngine:
+    """The cast, search and bite cycle, independent of any UI toolkit.
+
+    ``steps()`` runs one session as a generator that yields the seconds to
+    wait whenever the cycle pauses and receives whether it should go on.
+    ``run`` drives it on the calling thread and ``run_async`` from an
+    asyncio task. Capture, input, the game window and time come from
+    ``frames``, ``controls``, ``window`` and ``clock``; by default the
+    screen, the platform backend (imported on first use) and the monotonic
+    clock. Input runs on an
+    ``InputQueue`` action thread so the cycle never waits for it. With
+    ``config.bite_source`` set to "audio" or "any", bites are also heard
+    from ``audio``, by default what the speakers play.
+    ``templates`` and ``pool`` let several engines share one template bank
+    and matcher pool. ``update_config`` may be called from any thread; the
+    new settings take effect from the next frame. A session that cannot be
+    set up, for instance without a platform backend, logs why, keeps the
+    error in ``setup_error`` and stops.
+    """
+
+    threaded_input = True
+
+    def __init__(
+        self,
+        config: AppConfig,
+        frames: Optional[FrameSource] = None,
+        controls: Optional[Controls] = None,
+        clock: Optional[Clock] = None,
+        templates: Optional[TemplateBank] = None,
+        config_path: Path = CONFIG_FILE,
+        pool: Optional[ThreadPoolExecutor] = None,
+        window: Optional[WindowProvider] = None,
+        audio: Optional[AudioSource] = None,
+    ):
+        self.config = config
+        self.frames = frames or ScreenFrameSource()
+        self.clock = clock or Clock()
+        self.templates = templates
+        self.pool = pool
+        self.config_path = Path(config_path)
+        self._controls = controls
+        self._window = window
+        self._audio = audio
+        self._stop_event = threading.Event()
+        self._update_lock = threading.Lock()
+        self._pending: Optional[tuple[AppConfig, Optional[TemplateBank]]] = None
+        # Events raised on the input, audio and statistics threads, logged by the engine thread.
+        self._background: deque[tuple[str, dict]] = deque()
+        self.bank: Optional[TemplateBank] = None
+        self.setup_error: Optional[Exception] = None
+        self.events = LogChannel(config.metrics_log_interval)
+        self.instrumentation = Instrumentation(config.instrumentation)
+        self._stage = self.instrumentation.stage
+        self._export_path = data_path(config.metrics_export_path)
+        self._next_export_at = 0.0
+        # Coarse progress for status displays; ``state`` is one of STATES.
+        self.state = "starting"
+        self.casts = 0
+        self.catches = 0
+
+    @property
+    def controls(self) -> Controls:
+        # Imported on first use so replays never touch the platform libraries.
+        if self._controls is None:
+            self._controls = load_backend()
+        return self._controls
+
+    @property
+    def window(self) -> WindowProvider:
+        if self._window is None:
+            self._window = CachedWindow(load_backend(), self.config.game_window_title)
+        return self._window
+
+    def _t(self, key: str, **values) -> str:
+        return text(key, self.config.language, **values)
+
+    def _log(self, key: str, **values) -> None:
+        with self._stage("log"):
+            self.events.emit(key, **values)
+
+    def _log_later(self, key: str, **values) -> None:
+        """``_log`` for other threads: ``events`` has a single writer, the engine thread."""
+        self._background.append((key, values))
+
+    def _log_background(self) -> None:
+        while self._background:
+            key, values = self._background.popleft()
+            self._log(key, **values)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def active(self) -> bool:
+        return not self._stop_event.is_set()
+
+    def update_config(self, config: AppConfig, templates: Optional[TemplateBank] = None) -> None:
+        """Hand new settings to the running session; the latest call wins.
+
+        ``templates`` replaces a shared template bank. Otherwise the
+        engine's own bank is updated from ``config.image_paths``, decoding
+        only the images that were added. The bite source, the audio clip,
+        capture recording and the session length keep their values until
+        the next session.
+        """
+        with self._update_lock:
+            self._pending = (snapshot(config), templates)
+
+    def _apply_updates(self) -> None:
+        self._log_background()
+        with self._update_lock:
+            pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        config, templates = pending
+        if not config.fishing_hotkey:
+            # The window refuses to start without one; keep casting with the old key.
+            config.fishing_hotkey = self.config.fishing_hotkey
+        previous, self.config = self.config, config
+        self.search_scheduler.period = 1.0 / config.search_fps
+        self.bite_scheduler.period = 1.0 / config.bite_fps
+        self.tracker.matches = deque(self.tracker.matches, maxlen=max(1, config.roi_history))
+        self.tracker.margin = config.roi_margin
+        if type(self.detector) is DETECTORS.get(config.bite_detector, BiteDetector):
+            self.detector.configure(config)
+        if self.listener is not None:
+            self.listener.detector.threshold = config.audio_threshold
+        if (previous.bobber_locator, previous.feature_min_inliers, previous.match_threads) != (
+            config.bobber_locator, config.feature_min_inliers, config.match_threads
+        ):
+            self.matcher.close()
+            self.matcher = self._create_matcher()
+        if templates is not None:
+            self.templates = self.bank = templates
+        elif self.bank is not None and self.templates is None:
+            with self._stage("templates"):
+                self.bank = reload_template_bank(
+                    self.bank, self._bank_config, config,
+                    lambda name: self._log("template_unreadable", name=name),
+                )
+        if self.bank is not None:
+            self._bank_config = config
+        self._log("config_updated", templates=len(self.bank or ()))
+        if self.bank is not None and not self.bank:
+            self._log("no_template")
+
+    def run(self) -> None:
+        """Run a session on the calling thread; ``stop`` interrupts any wait."""
+        steps = self.steps()
+        try:
+            seconds = next(steps)
+            while True:
+                delay = self.clock.pause(seconds)
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                seconds = steps.send(self.active())
+        except StopIteration:
+            pass
+
+    def steps(self) -> Steps:
+        self.matcher = self.listener = self.store = self.input = None
+        self.setup_error = None
+        try:
+            try:
+                self._setup()
+            except (BackendUnavailable, ImportError) as exc:
+                self._fail("backend_unavailable", exc)
+                return
+            except Exception as exc:
+                self._fail("runtime_error", exc)
+                return
+            yield from self._session()
+        finally:
+            self.state = "stopped"
+            if self.input is not None:
+                self.input.close()
+            if self.listener is not None:
+                self.listener.close()
+            if self.store is not None:
+                self.store.close()
+            self._log_background()
+            self._export_metrics(force=True)
+            if self.matcher is not None:
+                self.matcher.close()
+            self.frames.close()
+
+    def _fail(self, key: str, exc: Exception) -> None:
+        self.setup_error = exc
+        self._log(key, error=str(exc))
+
+    def _setup(self) -> None:
+        """Acquire the session's resources; ``steps`` releases whatever was acquired."""
+        # Without a platform backend there is nothing to run; fail before acquiring anything.
+        controls, _ = self.controls, self.window
+        recordings = data_path(self.config.record_directory)
+        if recordings is not None:
+            directory = recordings / time.strftime("%Y%m%d-%H%M%S")
+            self.frames = RecordingFrameSource(
+                self.frames, directory, asdict(self.config),
+                max_bytes=self.config.record_max_mb * 1024 * 1024 or None,
+            )
+        self.matcher = self._create_matcher()
+        self.tracker = BobberTracker(self.config.roi_history, self.config.roi_margin)
+        self.detector = create_bite_detector(self.config)
+        self.listener = self._listener() if self.config.bite_source != "visual" else None
+        self.bite_source = self.config.bite_source if self.listener is not None else "visual"
+        self.search_scheduler = FrameScheduler(self.config.search_fps, self.clock.now)
+        self.bite_scheduler = FrameScheduler(self.config.bite_fps, self.clock.now)
+        self.timing = TimingModel(adaptive=self.config.adaptive_timing)
+        database = database_path(self.config)
+        if database is not None:
+            self.store = SessionWriter(
+                database, asdict(self.config), lambda exc: self._log_later("stats_failed", error=str(exc))
+            )
+        self._started_at = self.clock.now()
+        self.instrumentation.gauge("casts_per_hour", lambda: self.casts * 3600 / self._elapsed())
+        self.instrumentation.gauge("idle_ratio", lambda: self.timing.idle_ratio(self._elapsed()))
+        self.input = InputQueue(
+            controls, self.instrumentation, lambda exc: self._log_later("runtime_error", error=str(exc)),
+            self.threaded_input,
+        )
+        self.instrumentation.gauge("search_fps", lambda: self.search_scheduler.fps)
+        self.instrumentation.gauge("bite_fps", lambda: self.bite_scheduler.fps)
+
+    def _create_matcher(self):
+        if self.config.bobber_locator == "features":
+            return FeatureMatcher(self.config.feature_min_inliers)
+        return ParallelMatcher(self.config.match_threads, self.pool)
+
+    def _listener(self) -> Optional[AudioListener]:
+        """Start listening for the splash, or log why bites can only be seen."""
+        if not self.config.audio_reference:
+            self._log("audio_failed", error=self._t("audio_no_reference"))
+            return None
+        failed = lambda exc: self._log("audio_failed", error=str(exc))
+        source = self._audio or LoopbackAudioSource(
+            failed=lambda exc: self._log_later("audio_failed", error=str(exc))
+        )
+        # Relative clips live next to the settings file.
+        path = self.config_path.parent / self.config.audio_reference
+        try:
+            detector = AudioBiteDetector.from_wav(path, source.sample_rate, threshold=self.config.audio_threshold)
+        except (OSError, ValueError) as exc:
+            failed(exc)
+            return None
+        listener = AudioListener(source, detector)
+        listener.start()
+        return listener
+
+    def _elapsed(self) -> float:
+        return max(self.clock.now() - self._started_at, 1e-9)
+
+    def _export_metrics(self, force: bool = False) -> None:
+        if self._export_path is None or not self.instrumentation.enabled:
+            return
+        if not force and self.clock.now() < self._next_export_at:
+            return
+        self._next_export_at = self.clock.now() + self.config.metrics_export_interval
+        try:
+            self.instrumentation.export(self._export_path)
+        except OSError as exc:
+            self._export_path = None
+            self._log("metrics_export_failed", error=str(exc))
+
+    def _load_templates(self) -> TemplateBank:
+        if self.templates is not None:
+            return self.templates
+        return load_template_bank(self.config, lambda name: self._log("template_unreadable", name=name))
+
+    def _schedule_afk(self) -> float:
+        return self.clock.now() + random.uniform(
+            self.config.afk_time_min * 60,
+            self.config.afk_time_max * 60,
+        )
+
+    def _maybe_afk(self, next_afk_at: float) -> float:
+        if self.clock.now() < next_afk_at:
+            return next_afk_at
+        if self.config.afk_key:
+            self.input.press(self.config.afk_key)
+            if self.store is not None:
+                self.store.press("afk")
+            self._log("afk_pressed", key=self.config.afk_key)
+        return self._schedule_afk()
+
+    def _session(self) -> Steps:
+        with self._stage("templates"):
+            self.bank = self._load_templates()
+        self._bank_config = snapshot(self.config)
+        if not self.bank:
+            self._log("no_template")
+            return
+
+        now = self.clock.now
+        started_at = now()
+        end_at = started_at + self.config.duration_hours * 3600
+        next_bait_at = now()
+        next_afk_at = self._schedule_afk()
+
+        while self.active() and now() < end_at:
+            try:
+                self._apply_updates()
+                with self._stage("activate"):
+                    region = yield from self._activate()
+                if not self.active():
+                    break
+                if region is None:
+                    self._log("window_failed")
+                    if not (yield from self._pause(3)):
+                        break
+                    continue
+
+                profile = self.timing.profile
+                if self.config.bait_hotkey and now() >= next_bait_at:
+                    self._log("use_bait")
+                    self.input.press(self.config.bait_hotkey)
+                    if self.store is not None:
+                        self.store.press("bait")
+                    next_bait_at = now() + profile.bait_interval
+                    if not (yield from self._pause(profile.bait_pause)):
+                        break
+
+                self._log("cast")
+                self.state = "casting"
+                self.casts += 1
+                self.input.press(self.config.fishing_hotkey)
+                cast_at = now()
+                record = CastRecord(time.time())
+                try:
+                    if not (yield from self._pause(profile.search_delay)):
+                        break
+                    caught, next_afk_at = yield from self._detect_cast(region, next_afk_at, cast_at, record)
+                    self.state = "waiting"
+                    pause = self.timing.profile.reel_pause
+                    if caught:
+                        self.catches += 1
+                        pause -= yield from self._await_loot(region, record)
+                        if self.active():
+                            record.outcome = "caught" if record.loot_seconds is not None else "false_reel"
+                    elif self.active():
+                        self._log("not_caught")
+                finally:
+                    if self.store is not None:
+                        self.store.cast(record)
+                self._export_metrics()
+                if not (yield from self._pause(max(0.0, pause))):
+                    break
+            except Exception as exc:
+                self._log("runtime_error", error=str(exc))
+                if not (yield from self._pause(3)):
+                    break
+
+        for phase, scheduler in (("search", self.search_scheduler), ("bite", self.bite_scheduler)):
+            if scheduler.intervals.count:
+                self._log(
+                    "frame_stats", phase=self._t(f"phase_{phase}"), fps=scheduler.fps,
+                    jitter=scheduler.jitter * 1000, skipped=scheduler.skipped,
+                )
+        if self.config.roi_tracking and self.tracker.hits + self.tracker.misses:
+            hours = max(now() - started_at, 1.0) / 3600
+            self._log(
+                "roi_stats", hits=self.tracker.hits, misses=self.tracker.misses,
+                saved=self.tracker.saved_seconds() / hours,
+            )
+        if self.casts:
+            profile = self.timing.profile
+            self._log(
+                "cycle_stats", casts_per_hour=self.casts * 3600 / self._elapsed(),
+                idle=self.timing.idle_ratio(self._elapsed()), search_delay=profile.search_delay,
+                reel_pause=profile.reel_pause, cast_timeout=profile.cast_timeout,
+            )
+        window = self._window
+        if isinstance(window, CachedWindow) and window.activate and window.reuses:
+            self._log("window_stats", activations=window.activations, reuses=window.reuses)
+
+    def _activate(self) -> Generator[float, bool, Optional[Region]]:
+        # Input queued for the previous cast must reach the window it was meant for.
+        self.input.flush()
+        region, activated = self.window.acquire()
+        if activated:
+            # Give the window a moment to come to the foreground.
+            yield from self._pause(0.2)
+        return region
+
+    def _pause(self, seconds: float) -> Generator[float, bool, bool]:
+        """A fixed wait of the cast cycle; the time it really took counts as idle."""
+        started = self.clock.now()
+        active = yield seconds
+        self.timing.record_idle(self.clock.now() - started)
+        return active
+
+    def _await_loot(self, region, record: CastRecord) -> Generator[float, bool, float]:
+        """Watch the reeled-in bobber for at most ``reel_pause`` seconds.
+
+        The time it takes to disappear is recorded as a loot observation, or
+        an unfinished one if it is still there when the pause runs out.
+        Returns the seconds spent watching.
+        """
+        started = self.clock.now()
+        area = self.tracker.roi(region) or region
+        feed = self._feed(area, self.bite_scheduler)
+        try:
+            while self.active():
+                with self._stage("frame_wait"):
+                    grab = feed.next()
+                if grab is None:
+                    break
+                self._apply_updates()
+                if self._search(grab, area) is None:
+                    record.loot_seconds = self.clock.now() - started
+                    self.timing.record_loot(record.loot_seconds)
+                    break
+                if self.clock.now() - started >= self.timing.profile.reel_pause:
+                    self.timing.record_no_loot()
+                    break
+                if not (yield feed.delay()):
+                    break
+        finally:
+            feed.close()
+        return self.clock.now() - started
+
+    def _search(self, grab: Grab, region) -> Optional[Match]:
+        with self._stage("capture"):
+            screen = grab(region)
+        with self._stage("match"):
+            return self.matcher.find_best_match(
+                screen, self.bank, self.config.confidence_threshold, region[:2],
+                self.config.pyramid_levels, self.config.pyramid_candidates,
+                self.config.certain_confidence,
+            )
+
+    def _locate(self, grab: Grab, region) -> Optional[Match]:
+        """Search near recent bobber positions first, then the whole client area."""
+        roi = self.tracker.roi(region) if self.config.roi_tracking else None
+        if roi is not None:
+            started = self.clock.now()
+            match = self._search(grab, roi)
+            self.tracker.record_roi_search(match is not None, self.clock.now() - started)
+            if match:
+                self.tracker.record(match)
+                return match
+        started = self.clock.now()
+        match = self._search(grab, region)
+        self.tracker.record_full_search(self.clock.now() - started)
+        if match:
+            self.tracker.record(match)
+        return match
+
+    def _feed(self, region, scheduler: FrameScheduler):
+        if self.config.pipelined_capture:
+            return PipelinedFeed(self.frames, region, scheduler, self.active, self.config.ring_capacity)
+        return DirectFeed(self.frames, scheduler)
+
+    def _detect_cast(
+        self, region, next_afk_at: float, cast_at: float, record: CastRecord
+    ) -> Generator[float, bool, tuple[bool, float]]:
+        cast_deadline = self.clock.now() + self.timing.profile.cast_timeout
+        match = None
+        self.state = "searching"
+        feed = self._feed(region, self.search_scheduler)
+        try:
+            while self.active() and self.clock.now() < cast_deadline:
+                with self._stage("frame_wait"):
+                    grab = feed.next()
+                if grab is None:
+                    return False, next_afk_at
+                self._apply_updates()
+                match = self._locate(grab, region)
+                if match:
+                    record.confidence = match.confidence
+                    record.search_seconds = self.clock.now() - cast_at
+                    self.timing.record_bobber(record.search_seconds)
+                    self._log("float_found", confidence=match.confidence)
+                    break
+                next_afk_at = self._maybe_afk(next_afk_at)
+                if not (yield feed.delay()):
+                    return False, next_afk_at
+        finally:
+            feed.close()
+
+        if not match:
+            if self.active():
+                record.outcome = "no_bobber"
+            return False, next_afk_at
+
+        target_x = match.x + max(1, match.width - 10)
+        target_y = match.y + max(1, match.height - 10)
+        # Queued, so the pointer glides while the baseline is captured.
+        self.input.move_to(target_x, target_y)
+        patch = (match.x, match.y, match.width, match.height)
+        self.state = "monitoring"
+        feed = self._feed(patch, self.bite_scheduler)
+        try:
+            grab = feed.next()
+            if grab is None:
+                return False, next_afk_at
+            visual = self.bite_source != "audio"
+            if visual:
+                if type(self.detector) is not DETECTORS.get(self.config.bite_detector, BiteDetector):
+                    self.detector = create_bite_detector(self.config)
+                self.detector.reset(grab(patch))
+            if self.listener is not None:
+                self.listener.reset()
+            while (yield feed.delay()) and self.clock.now() < cast_deadline:
+                with self._stage("frame_wait"):
+                    grab = feed.next()
+                if grab is None:
+                    break
+                self._apply_updates()
+                bitten = False
+                if visual:
+                    with self._stage("capture"):
+                        frame = grab(patch)
+                    with self._stage("bite"):
+                        bitten = self.detector.update(frame)
+                    key, values = self.detector.log_values()
+                    with self._stage("log"):
+                        self.events.metric(key, **values)
+                if self.listener is not None and not bitten:
+                    with self._stage("audio"):
+                        detections = self.listener.poll()
+                    if detections:
+                        delay = self.listener.detector.stream_seconds - detections[0].at
+                        self.instrumentation.observe("splash_to_bite", delay * 1000)
+                        self._log("audio_bite", score=detections[0].score, delay=delay)
+                        bitten = True
+                if bitten:
+                    self.input.click()
+                    record.bite_seconds = self.clock.now() - cast_at
+                    self.timing.record_bite(record.bite_seconds)
+                    self._log("bite_confirmed")
+                    return True, next_afk_at
+                next_afk_at = self._maybe_afk(next_afk_at)
+        finally:
+            feed.close()
+        if self.active():
+            record.outcome = "timeout"
+            if self.clock.now() >= cast_deadline:
+                self.timing.record_no_bite()
+        return False, next_afk_at
+
+
+def _advance(steps: Steps, active: Optional[bool]) -> Optional[float]:
+    # A StopIteration cannot cross a Future, so the end is reported as None.
+    try:
+        return steps.send(active)
+    except StopIteration:
+        return None
+
+
+async def run_async(engine: FishingEngine, executor=None) -> None:
+    """Drive ``engine`` from an asyncio task.
+
+    Frame work between waits runs in ``executor`` (the loop's default when
+    None) so the event loop stays responsive, and waits are
+    ``asyncio.sleep`` calls. Cancelling the task is a safe stop: the session
+    finishes its current step, skips every remaining wait, logs its summary
+    and releases its resources before the cancellation propagates.
+    """
+    loop = asyncio.get_running_loop()
+    steps = engine.steps()
+    step = loop.run_in_executor(executor, _advance, steps, None)
+    try:
+        while True:
+            seconds = await asyncio.shield(step)
+            if seconds is None:
+                return
+            await asyncio.sleep(engine.clock.pause(seconds))
+            step = loop.run_in_executor(executor, _advance, steps, engine.active())
+    except asyncio.CancelledError:
+        engine.stop()
+        seconds = await step
+        while seconds is not None:
+            seconds = await loop.run_in_executor(executor, _advance, steps, False)
+        raise
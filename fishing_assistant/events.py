@@ -0,0 +1,81 @@
+"""Structured activity-log events passed from the worker to the UI."""
+
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+import time
+from typing import Any, Callable, Optional
+
+from .texts import text
+
+
+@dataclass(frozen=True)
+class LogEvent:
+    key: str
+    values: dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def message(self, language: str) -> str:
+        return text(self.key, language, **self.values)
+
+
+class LogChannel:
+    """Queue of log events written by one worker thread and drained by the UI.
+
+    ``deque.append`` and ``popleft`` are atomic, so neither side takes a
+    lock. High-rate ``metric`` events are coalesced: at most one per
+    ``metrics_interval`` seconds is queued, and the newest skipped sample is
+    flushed ahead of the next regular event so the values that led to a
+    decision are always visible.
+    """
+
+    def __init__(self, metrics_interval: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.metrics_interval = metrics_interval
+        self.clock = clock
+        self.coalesced = 0
+        self._events: deque[LogEvent] = deque()
+        self._pending_metric: Optional[LogEvent] = None
+        self._last_metric_at = float("-inf")
+
+    def emit(self, key: str, **values) -> None:
+        if self._pending_metric is not None:
+            self._events.append(self._pending_metric)
+            self._pending_metric = None
+        self._events.append(LogEvent(key, values))
+
+    def metric(self, key: str, **values) -> None:
+        now = self.clock()
+        event = LogEvent(key, values)
+        if self._pending_metric is not None:
+            self.coalesced += 1
+            self._pending_metric = None
+        if now - self._last_metric_at >= self.metrics_interval:
+            self._last_metric_at = now
+            self._events.append(event)
+        else:
+            self._pending_metric = event
+
+    def drain(self, limit: Optional[int] = None) -> list[LogEvent]:
+        events = []
+        while limit is None or len(events) < limit:
+            try:
+                events.append(self._events.popleft())
+            except IndexError:
+                break
+        return events
+
+
+def open_log_file(path: Path, max_bytes: int, backups: int) -> logging.Logger:
+    """Logger that writes the full activity history to rotated files."""
+    logger = logging.getLogger("fishing_assistant.activity")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    return logger
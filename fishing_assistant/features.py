@@ -0,0 +1,171 @@
+"""Bobber search by ORB features, independent of scale and rotation."""
+
+from dataclasses import dataclass
+import math
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+from .vision import Match, Template, TemplateBank, to_gray
+
+
+# Side of the patch an ORB descriptor is computed from. The default of 31
+# leaves few keypoints on a bobber-sized template.
+FEATURE_PATCH = 15
+# A match is kept when its distance is below this fraction of the second best.
+RATIO = 0.8
+# Scale range of a found bobber relative to its template.
+MIN_SCALE, MAX_SCALE = 0.4, 2.5
+# FAST corner thresholds. Templates are small, so they keep weak corners
+# too; in the search region that would mostly add water texture.
+TEMPLATE_FAST_THRESHOLD = 10
+REGION_FAST_THRESHOLD = 20
+
+
+def orb_detector(max_features: int, fast_threshold: int) -> cv2.ORB:
+    return cv2.ORB_create(
+        max_features, 1.2, 4, FEATURE_PATCH, 0, 2, cv2.ORB_HARRIS_SCORE, FEATURE_PATCH, fast_threshold
+    )
+
+
+@dataclass(frozen=True)
+class TemplateFeatures:
+    """ORB keypoint positions in template pixels and their binary descriptors."""
+
+    points: np.ndarray
+    descriptors: np.ndarray
+
+
+def template_features(gray: np.ndarray, max_features: int = 200) -> TemplateFeatures:
+    """Features of a template; its border is replicated so keypoints near the edges survive."""
+    padded = cv2.copyMakeBorder(gray, *(FEATURE_PATCH,) * 4, cv2.BORDER_REPLICATE)
+    keypoints, descriptors = orb_detector(max_features, TEMPLATE_FAST_THRESHOLD).detectAndCompute(padded, None)
+    if descriptors is None:
+        return TemplateFeatures(np.empty((0, 2), np.float32), np.empty((0, 32), np.uint8))
+    points = np.float32([keypoint.pt for keypoint in keypoints]) - FEATURE_PATCH
+    inside = (
+        (points[:, 0] >= 0) & (points[:, 0] < gray.shape[1])
+        & (points[:, 1] >= 0) & (points[:, 1] < gray.shape[0])
+    )
+    return TemplateFeatures(points[inside], descriptors[inside])
+
+
+def originals(templates: Iterable[Template]) -> list[Template]:
+    """The first variant of each template image, which the bank stores unrotated."""
+    seen: set[str] = set()
+    result = []
+    for template in templates:
+        if template.path not in seen:
+            seen.add(template.path)
+            result.append(template)
+    return result
+
+
+class FeatureMatcher:
+    """Finds the bobber from ORB features instead of sliding templates.
+
+    Features of each template image are computed once (see
+    ``TemplateBank.features``). Each search detects features in the search
+    region only and, for every template, looks up each template feature's
+    two nearest region features by Hamming distance, keeps the distinctive
+    ones and fits a similarity transform to them with RANSAC. Querying from
+    the template side keeps the ratio test meaningful: a region full of
+    water texture offers many near-equal neighbours, so random matches are
+    dropped. A pose with at least ``min_inliers`` consistent features is
+    verified by warping the region back onto the template and scoring it
+    with TM_CCOEFF_NORMED, so confidences and ``confidence_threshold`` mean
+    the same as for template matching. The returned box bounds the
+    transformed template, so the bite patch follows the bobber's size on
+    screen. Scale and rotation variants in the bank are not needed and are
+    ignored.
+    """
+
+    def __init__(self, min_inliers: int = 4, max_features: int = 6000):
+        self.min_inliers = max(3, min_inliers)
+        self._detector = orb_detector(max_features, REGION_FAST_THRESHOLD)
+        self._matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+        self._bank: Optional[object] = None
+        self._features: list[tuple[Template, TemplateFeatures]] = []
+
+    def close(self) -> None:
+        self._bank = None
+        self._features = []
+
+    def _prepare(self, templates: Iterable[Template]) -> None:
+        if isinstance(templates, TemplateBank):
+            pairs = templates.features()
+        else:
+            pairs = [(template, template_features(template.gray)) for template in originals(templates)]
+        self._bank = templates
+        self._features = [(template, features) for template, features in pairs if len(features.points) >= 3]
+
+    def find_best_match(
+        self,
+        screen: np.ndarray,
+        templates: Iterable[Template],
+        confidence_threshold: float,
+        origin: tuple[int, int] = (0, 0),
+        pyramid_levels: int = 0,
+        pyramid_candidates: int = 3,
+        certain_confidence: float = 1.0,
+    ) -> Optional[Match]:
+        """Same contract as ``find_best_match``; the pyramid settings do not apply."""
+        if templates is not self._bank:
+            self._prepare(templates)
+        if not self._features:
+            return None
+        gray = to_gray(screen)
+        keypoints, descriptors = self._detector.detectAndCompute(gray, None)
+        if descriptors is None or len(keypoints) < 2:
+            return None
+        screen_points = np.float32([keypoint.pt for keypoint in keypoints])
+
+        best: Optional[Match] = None
+        for template, features in self._features:
+            # One template feature per region feature, or repeated texture collapses the pose.
+            closest: dict[int, cv2.DMatch] = {}
+            for pair in self._matcher.knnMatch(features.descriptors, descriptors, k=2):
+                if len(pair) == 2 and pair[0].distance < RATIO * pair[1].distance:
+                    kept = closest.get(pair[0].trainIdx)
+                    if kept is None or pair[0].distance < kept.distance:
+                        closest[pair[0].trainIdx] = pair[0]
+            good = list(closest.values())
+            if len(good) < self.min_inliers:
+                continue
+            transform, inliers = cv2.estimateAffinePartial2D(
+                features.points[[match.queryIdx for match in good]],
+                screen_points[[match.trainIdx for match in good]],
+                method=cv2.RANSAC, ransacReprojThreshold=4.0,
+            )
+            if transform is None or int(inliers.sum()) < self.min_inliers:
+                continue
+            if not MIN_SCALE <= math.hypot(transform[0, 0], transform[1, 0]) <= MAX_SCALE:
+                continue
+            confidence = self._verify(gray, template, transform)
+            if confidence >= confidence_threshold and (best is None or confidence > best.confidence):
+                best = self._to_match(template, transform, confidence, gray.shape, origin)
+                if confidence >= certain_confidence:
+                    break
+        return best
+
+    @staticmethod
+    def _verify(gray: np.ndarray, template: Template, transform: np.ndarray) -> float:
+        # The transform maps template pixels onto the screen, so the inverse map samples the screen.
+        aligned = cv2.warpAffine(
+            gray, transform, (template.width, template.height),
+            flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP, borderMode=cv2.BORDER_REPLICATE,
+        )
+        return float(cv2.matchTemplate(aligned, template.gray, cv2.TM_CCOEFF_NORMED)[0, 0])
+
+    @staticmethod
+    def _to_match(template, transform, confidence, shape, origin) -> Match:
+        corners = np.float32([[0, 0], [template.width, 0], [0, template.height], [template.width, template.height]])
+        placed = corners @ transform[:, :2].T + transform[:, 2]
+        left, top = np.clip(np.floor(placed.min(axis=0)), 0, None).astype(int)
+        right = min(int(np.ceil(placed[:, 0].max())), shape[1])
+        bottom = min(int(np.ceil(placed[:, 1].max())), shape[0])
+        return Match(
+            template.path, origin[0] + int(left), origin[1] + int(top),
+            max(1, right - int(left)), max(1, bottom - int(top)), confidence,
+        )
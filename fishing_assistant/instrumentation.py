@@ -0,0 +1,163 @@
+"""Hot-path stage timers with fixed-bucket latency histograms."""
+
+from bisect import bisect_left
+from contextlib import nullcontext
+import json
+import math
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable
+
+
+# Upper bucket bounds in milliseconds; the last bucket is unbounded.
+BUCKET_BOUNDS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, math.inf,
+)
+
+_DISABLED = nullcontext()
+
+
+class LatencyHistogram:
+    """Counts of observed latencies in fixed, logarithmically spaced buckets."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKET_BOUNDS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, milliseconds: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Latency below which ``fraction`` of samples fall, interpolated within a bucket."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= target:
+                lower = BUCKET_BOUNDS_MS[index - 1] if index else 0.0
+                upper = min(BUCKET_BOUNDS_MS[index], self.max_ms)
+                return lower + (upper - lower) * (target - cumulative) / count
+            cumulative += count
+        return self.max_ms
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe((time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class Instrumentation:
+    """Per-stage latency histograms plus gauges read at snapshot time.
+
+    ``stage(name)`` returns a context manager that times its block. When
+    disabled it returns one shared no-op context, so an instrumented hot
+    path costs a method call and nothing is recorded. Gauges are callables
+    evaluated only by ``snapshot``.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.gauges: dict[str, Callable[[], float]] = {}
+
+    @classmethod
+    def combined(cls, parts: list["Instrumentation"]) -> "Instrumentation":
+        """Histograms summed over ``parts``; each gauge reads the mean over the parts that have it."""
+        result = cls()
+        for part in parts:
+            for name, histogram in list(part.histograms.items()):
+                result.histograms.setdefault(name, LatencyHistogram()).merge(histogram)
+        for name in {name for part in parts for name in part.gauges}:
+            reads = [part.gauges[name] for part in parts if name in part.gauges]
+            result.gauge(name, lambda reads=reads: sum(read() for read in reads) / len(reads))
+        return result
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _DISABLED
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return _StageTimer(histogram)
+
+    def observe(self, name: str, milliseconds: float) -> None:
+        """Record a latency measured outside a ``stage`` block."""
+        if self.enabled:
+            self.histograms.setdefault(name, LatencyHistogram()).observe(milliseconds)
+
+    def gauge(self, name: str, read: Callable[[], float]) -> None:
+        self.gauges[name] = read
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "stages": {
+                name: {
+                    "count": histogram.count,
+                    "mean_ms": histogram.mean_ms,
+                    "p50_ms": histogram.percentile(0.50),
+                    "p95_ms": histogram.percentile(0.95),
+                    "p99_ms": histogram.percentile(0.99),
+                    "max_ms": histogram.max_ms,
+                }
+                for name, histogram in list(self.histograms.items())
+            },
+            "gauges": {name: float(read()) for name, read in list(self.gauges.items())},
+        }
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP fishing_stage_latency_ms Latency of worker stages in milliseconds.",
+            "# TYPE fishing_stage_latency_ms histogram",
+        ]
+        for name, histogram in list(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKET_BOUNDS_MS, histogram.counts):
+                cumulative += count
+                label = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                lines.append(f'fishing_stage_latency_ms_bucket{{stage="{name}",le="{label}"}} {cumulative}')
+            lines.append(f'fishing_stage_latency_ms_sum{{stage="{name}"}} {histogram.total_ms:.6f}')
+            lines.append(f'fishing_stage_latency_ms_count{{stage="{name}"}} {histogram.count}')
+        for name, read in list(self.gauges.items()):
+            lines.append(f"# TYPE fishing_{name} gauge")
+            lines.append(f"fishing_{name} {float(read()):.6f}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Path) -> None:
+        """Write counters to ``path``: Prometheus text for ``.prom``/``.txt``, otherwise JSON."""
+        path = Path(path)
+        if path.suffix in {".prom", ".txt"}:
+            content = self.prometheus_text()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(content, encoding="utf-8")
+        os.replace(temporary, path)
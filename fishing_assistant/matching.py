@@ -0,0 +1,103 @@
+"""Template matching spread over a persistent thread pool."""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+from .vision import Match, Template, build_pyramid, find_best_match, fitting_templates, match_template, to_gray, to_match
+
+
+# Bands shorter than this many template heights cost more in overlap than
+# they gain in parallelism.
+MIN_BAND_TEMPLATE_HEIGHTS = 4
+
+
+class ParallelMatcher:
+    """Runs ``find_best_match`` work items on a pool of worker threads.
+
+    ``cv2.matchTemplate`` releases the GIL, so templates are matched
+    concurrently. When there are fewer templates than threads and the
+    exhaustive search is used, each template is also split into horizontal
+    bands of the frame. With one thread the serial ``find_best_match`` runs
+    on the calling thread. A ``pool`` shared between matchers is used
+    instead of a private one and is left running by ``close``.
+    """
+
+    def __init__(self, threads: int = 1, pool: Optional[ThreadPoolExecutor] = None):
+        self.threads = max(1, threads)
+        self._owns_pool = pool is None
+        if pool is None and self.threads > 1:
+            pool = ThreadPoolExecutor(self.threads, thread_name_prefix="matcher")
+        self._pool = pool if self.threads > 1 else None
+
+    def close(self) -> None:
+        if self._pool is not None and self._owns_pool:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+
+    def find_best_match(
+        self,
+        screen: np.ndarray,
+        templates: Iterable[Template],
+        confidence_threshold: float,
+        origin: tuple[int, int] = (0, 0),
+        pyramid_levels: int = 0,
+        pyramid_candidates: int = 3,
+        certain_confidence: float = 1.0,
+    ) -> Optional[Match]:
+        if self._pool is None:
+            return find_best_match(
+                screen, templates, confidence_threshold, origin,
+                pyramid_levels, pyramid_candidates, certain_confidence,
+            )
+        screen_gray = to_gray(screen)
+        screen_pyramid = build_pyramid(screen_gray, pyramid_levels)
+        candidates = fitting_templates(templates, screen_gray, len(screen_pyramid) - 1)
+        if not candidates:
+            return None
+
+        futures = []
+        for template, template_pyramid in candidates:
+            if len(screen_pyramid) > 1:
+                futures.append(self._pool.submit(
+                    self._match_pyramid, template, screen_pyramid, template_pyramid, pyramid_candidates,
+                ))
+                continue
+            for top, bottom in self._bands(screen_gray.shape[0], template.height, len(candidates)):
+                futures.append(self._pool.submit(self._match_band, template, screen_gray, top, bottom))
+
+        best: Optional[Match] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                template, confidence, location = future.result()
+                if confidence >= confidence_threshold and (best is None or confidence > best.confidence):
+                    best = to_match(template, confidence, location, origin)
+            if best is not None and best.confidence >= certain_confidence:
+                for future in pending:
+                    future.cancel()
+                break
+        return best
+
+    def _bands(self, screen_height: int, template_height: int, template_count: int) -> list[tuple[int, int]]:
+        """Split the result rows ``[0, screen_height - template_height]`` into bands."""
+        rows = screen_height - template_height + 1
+        count = max(1, self.threads // template_count)
+        count = min(count, max(1, rows // (template_height * MIN_BAND_TEMPLATE_HEIGHTS)))
+        edges = np.linspace(0, rows, count + 1).astype(int)
+        return list(zip(edges[:-1], edges[1:]))
+
+    @staticmethod
+    def _match_band(template: Template, screen: np.ndarray, top: int, bottom: int):
+        band = screen[top:bottom + template.height - 1]
+        result = cv2.matchTemplate(band, template.gray, cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, (x, y) = cv2.minMaxLoc(result)
+        return template, float(confidence), (x, y + top)
+
+    @staticmethod
+    def _match_pyramid(template, screen_pyramid, template_pyramid, candidates):
+        confidence, location = match_template(screen_pyramid, template_pyramid, candidates)
+        return template, confidence, location
@@ -0,0 +1,174 @@
+"""Frame feeds: inline capture, or a capture thread with a frame ring."""
+
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+
+from .capture import FrameSource, Region
+from .scheduler import FrameScheduler
+
+
+# Returns the gray pixels of a screen region within the current frame.
+Grab = Callable[[Region], np.ndarray]
+
+
+class FrameRing:
+    """Preallocated frame slots shared by one producer and one consumer.
+
+    The producer writes into ``acquire()`` and hands the slot over with
+    ``publish()``. ``take()`` returns the newest published frame and recycles
+    every older one, so analysis always sees the freshest frame; when all
+    slots are busy the producer overwrites the oldest unread frame. The
+    consumer owns the returned array until its next ``take()``.
+    """
+
+    def __init__(self, shape: tuple[int, int], capacity: int = 3):
+        capacity = max(2, capacity)
+        self.slots = [np.empty(shape, dtype=np.uint8) for _ in range(capacity)]
+        self.timestamps = [0.0] * capacity
+        self.published = 0
+        self.dropped = 0
+        self._free = list(range(capacity))
+        self._ready: deque[int] = deque()
+        self._held: Optional[int] = None
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def acquire(self) -> int:
+        with self._condition:
+            if self._free:
+                return self._free.pop()
+            self.dropped += 1
+            return self._ready.popleft()
+
+    def publish(self, index: int, timestamp: float) -> None:
+        with self._condition:
+            self.timestamps[index] = timestamp
+            self._ready.append(index)
+            self.published += 1
+            self._condition.notify()
+
+    def take(self, timeout: Optional[float] = None) -> Optional[tuple[np.ndarray, float]]:
+        """Newest frame and its capture time, or None on timeout or close."""
+        with self._condition:
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+            if not self._condition.wait_for(lambda: self._ready or self._closed, timeout):
+                return None
+            if not self._ready:
+                return None
+            self._held = self._ready.pop()
+            self.dropped += len(self._ready)
+            self._free.extend(self._ready)
+            self._ready.clear()
+            return self.slots[self._held], self.timestamps[self._held]
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class DirectFeed:
+    """Captures on the calling thread, paced by a ``FrameScheduler``.
+
+    Each frame grabs only the regions the caller asks for. The caller waits
+    ``delay()`` seconds between frames.
+    """
+
+    def __init__(self, source: FrameSource, scheduler: FrameScheduler):
+        self.source = source
+        self.scheduler = scheduler
+        self.scheduler.restart()
+
+    def next(self) -> Optional[Grab]:
+        self.scheduler.tick()
+        return self.source.grab_gray
+
+    def delay(self) -> float:
+        return self.scheduler.delay()
+
+    def close(self) -> None:
+        pass
+
+
+class PipelinedFeed:
+    """Captures on a producer thread into a ``FrameRing``.
+
+    The whole ``region`` is captured every frame, and capture of the next
+    frame overlaps with analysis of the current one. ``next`` blocks until a
+    fresh frame is published and returns None once ``active`` turns false
+    or the producer has stopped; sub-regions are served as views into the
+    frame.
+    """
+
+    def __init__(
+        self,
+        source: FrameSource,
+        region: Region,
+        scheduler: FrameScheduler,
+        active: Callable[[], bool],
+        capacity: int = 3,
+    ):
+        self.source = source
+        self.region = region
+        self.scheduler = scheduler
+        self.active = active
+        self.ring = FrameRing((region[3], region[2]), capacity)
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+        self.scheduler.restart()
+        self._thread = threading.Thread(target=self._produce, name="frame-producer", daemon=True)
+        self._thread.start()
+
+    def _produce(self) -> None:
+        try:
+            while not self._done.is_set():
+                self.scheduler.tick()
+                index = self.ring.acquire()
+                self.source.grab_gray(self.region, out=self.ring.slots[index])
+                self.ring.publish(index, self.scheduler.clock())
+                self._done.wait(self.scheduler.delay())
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.ring.close()
+
+    def next(self) -> Optional[Grab]:
+        # Wake at least once per frame period to notice a stop request.
+        timeout = max(self.scheduler.period, 0.05)
+        while self.active():
+            taken = self.ring.take(timeout)
+            if taken is not None:
+                return self._view_of(taken[0])
+            if self.ring.closed:
+                if self.error is not None:
+                    raise self.error
+                return None
+        return None
+
+    def _view_of(self, frame: np.ndarray) -> Grab:
+        left, top = self.region[:2]
+
+        def grab(region: Region) -> np.ndarray:
+            x, y = region[0] - left, region[1] - top
+            return frame[y:y + region[3], x:x + region[2]]
+
+        return grab
+
+    def delay(self) -> float:
+        # The producer paces capture; ``next`` already waits for a fresh frame.
+        return 0.0
+
+    def close(self) -> None:
+        self._done.set()
+        self.ring.close()
+        self._thread.join()
+
@@ -0,0 +1,197 @@
+"""Frame recording to memory-mapped ``.npy`` chunks, and replay sources."""
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from .capture import FrameSource, Region, crop_gray
+
+
+META_FILE = "meta.json"
+TIMESTAMPS_FILE = "timestamps.npy"
+
+
+def _chunk_name(index: int) -> str:
+    return f"frames_{index:04d}.npy"
+
+
+class FrameRecorder:
+    """Appends gray frames of one region to fixed-size memory-mapped chunks.
+
+    ``directory`` holds ``frames_NNNN.npy`` stacks of ``chunk_frames`` frames,
+    the relative capture times in ``timestamps.npy`` and ``meta.json`` with
+    the region, frame count, configuration and optional labels. Recording
+    stops after ``max_frames`` frames or once the frames would take more
+    than ``max_bytes``, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        region: Region,
+        config: Optional[dict[str, Any]] = None,
+        chunk_frames: int = 256,
+        max_frames: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.region = tuple(region)
+        self.config = config or {}
+        self.labels: dict[str, Any] = {}
+        if max_bytes is not None:
+            frames = max_bytes // max(1, self.region[2] * self.region[3])
+            max_frames = frames if max_frames is None else min(max_frames, frames)
+        # Chunks are allocated whole, so none is larger than the budget.
+        self.chunk_frames = max(1, min(chunk_frames, max_frames or chunk_frames))
+        self.max_frames = max_frames
+        self.count = 0
+        self._timestamps: list[float] = []
+        self._chunk: Optional[np.ndarray] = None
+        self._started = time.monotonic()
+
+    @property
+    def full(self) -> bool:
+        return self.max_frames is not None and self.count >= self.max_frames
+
+    def next_slot(self) -> Optional[np.ndarray]:
+        """Reserve and return the buffer for the next frame, or None when full."""
+        if self.full:
+            return None
+        offset = self.count % self.chunk_frames
+        if offset == 0:
+            self._flush_chunk()
+            shape = (self.chunk_frames, self.region[3], self.region[2])
+            self._chunk = np.lib.format.open_memmap(
+                self.directory / _chunk_name(self.count // self.chunk_frames),
+                mode="w+", dtype=np.uint8, shape=shape,
+            )
+        self._timestamps.append(time.monotonic() - self._started)
+        self.count += 1
+        return self._chunk[offset]
+
+    def add(self, frame: np.ndarray, timestamp: Optional[float] = None) -> None:
+        slot = self.next_slot()
+        if slot is None:
+            return
+        np.copyto(slot, frame)
+        if timestamp is not None:
+            self._timestamps[-1] = timestamp
+
+    def _flush_chunk(self) -> None:
+        if self._chunk is not None:
+            self._chunk.flush()
+            self._chunk = None
+
+    def close(self) -> None:
+        self._flush_chunk()
+        np.save(self.directory / TIMESTAMPS_FILE, np.asarray(self._timestamps, dtype=np.float64))
+        meta = {
+            "region": list(self.region),
+            "count": self.count,
+            "chunk_frames": self.chunk_frames,
+            "config": self.config,
+            "labels": self.labels,
+        }
+        (self.directory / META_FILE).write_text(
+            json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+
+@dataclass
+class Recording:
+    region: Region
+    timestamps: np.ndarray
+    chunks: list[np.ndarray]
+    chunk_frames: int
+    config: dict[str, Any] = field(default_factory=dict)
+    labels: dict[str, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def duration(self) -> float:
+        return float(self.timestamps[-1]) if len(self.timestamps) else 0.0
+
+    def frame(self, index: int) -> np.ndarray:
+        return self.chunks[index // self.chunk_frames][index % self.chunk_frames]
+
+    def index_at(self, seconds: float) -> int:
+        """Index of the newest frame captured at or before ``seconds``."""
+        index = int(np.searchsorted(self.timestamps, seconds, side="right")) - 1
+        return min(max(0, index), len(self.timestamps) - 1)
+
+
+def load_recording(directory: Path) -> Recording:
+    """Open a recording; frames stay memory-mapped and are never copied."""
+    directory = Path(directory)
+    meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+    timestamps = np.load(directory / TIMESTAMPS_FILE)[:meta["count"]]
+    chunk_frames = meta["chunk_frames"]
+    chunk_count = (len(timestamps) + chunk_frames - 1) // chunk_frames
+    chunks = [np.load(directory / _chunk_name(index), mmap_mode="r") for index in range(chunk_count)]
+    return Recording(
+        region=tuple(meta["region"]),
+        timestamps=timestamps,
+        chunks=chunks,
+        chunk_frames=chunk_frames,
+        config=meta.get("config", {}),
+        labels=meta.get("labels", {}),
+    )
+
+
+class RecordingFrameSource(FrameSource):
+    """Wraps a live source and records every grab as a full-region frame.
+
+    The first grab fixes the recorded region (normally the game client area).
+    Each later grab captures that whole region into the recorder and serves
+    the requested sub-region from it, so replay can reproduce any crop.
+    ``kwargs`` go to the ``FrameRecorder``; once it is full, grabs are
+    passed straight through.
+    """
+
+    def __init__(self, inner: FrameSource, directory: Path, config: Optional[dict[str, Any]] = None, **kwargs) -> None:
+        super().__init__()
+        self.inner = inner
+        self.directory = Path(directory)
+        self.config = config
+        self.recorder_options = kwargs
+        self.recorder: Optional[FrameRecorder] = None
+
+    def grab_gray(self, region: Region, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if self.recorder is None:
+            self.recorder = FrameRecorder(self.directory, region, self.config, **self.recorder_options)
+        slot = self.recorder.next_slot()
+        if slot is None:
+            return self.inner.grab_gray(region, out)
+        full_region = self.recorder.region
+        self.inner.grab_gray(full_region, out=slot)
+        return crop_gray(slot, region, full_region[:2], self._buffer(region, out))
+
+    def close(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+        self.inner.close()
+        super().close()
+
+
+class ReplayFrameSource(FrameSource):
+    """Serves recorded frames according to a caller-supplied clock.
+
+    ``clock`` returns seconds since the replay started; each grab returns the
+    newest recorded frame at that time, cropped to the requested region.
+    """
+
+    def __init__(self, recording: Recording, clock: Callable[[], float]) -> None:
+        super().__init__()
+        self.recording = recording
+        self.clock = clock
+
+    def grab_gray(self, region: Region, out: Optional[np.ndarray] = None) -> np.ndarray:
+        frame = self.recording.frame(self.recording.index_at(self.clock()))
+        return crop_gray(frame, region, self.recording.region[:2], self._buffer(region, out))
@@ -0,0 +1,79 @@
+"""Headless replay of recorded frames through the fishing engine."""
+
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+from .audio import AudioSource
+from .config import AppConfig, config_from_dict
+from .controls import RecordedControls
+from .engine import FishingEngine, VirtualClock
+from .recording import Recording, ReplayFrameSource
+from .vision import Template, TemplateBank
+from .window import FixedWindow
+
+
+@dataclass
+class ReplayResult:
+    actions: list[tuple[float, str]] = field(default_factory=list)
+    logs: list[str] = field(default_factory=list)
+
+    def first(self, action: str) -> Optional[float]:
+        return next((at for at, name in self.actions if name == action), None)
+
+
+class ReplayEngine(FishingEngine):
+    """A ``FishingEngine`` driven by a recording instead of the game.
+
+    Time is virtual: waits advance the clock instantly while real processing
+    time still counts, so replay runs faster than real time but measured
+    latencies include the cost of capture and detection. Inputs are recorded
+    as ``(time, action)`` pairs and the session ends with the recording.
+    With ``pipelined_capture`` the producer thread paces itself in real
+    time, so such a replay runs at the recording's own speed. Recordings
+    have no sound, so bites are only seen unless an ``audio`` source is
+    given, which should be paced by ``clock.now``.
+    """
+
+    # Virtual time runs ahead of an action thread, so input is issued inline.
+    threaded_input = False
+
+    def __init__(
+        self,
+        config: AppConfig,
+        recording: Recording,
+        templates: Optional[list[Template]] = None,
+        audio: Optional[AudioSource] = None,
+        clock: Optional[VirtualClock] = None,
+    ):
+        clock = clock or VirtualClock()
+        if audio is None:
+            config = replace(config, bite_source="visual")
+        super().__init__(
+            config,
+            ReplayFrameSource(recording, clock.now),
+            RecordedControls(clock),
+            clock,
+            TemplateBank.from_templates(templates) if templates is not None else None,
+            window=FixedWindow(recording.region),
+            audio=audio,
+        )
+        self.recording = recording
+
+    def active(self) -> bool:
+        return super().active() and self.clock.now() <= self.recording.duration
+
+
+def replay(
+    recording: Recording,
+    config: Optional[AppConfig] = None,
+    templates: Optional[list[Template]] = None,
+) -> ReplayResult:
+    """Run one engine session over ``recording`` on the calling thread.
+
+    ``templates`` skips loading ``config.image_paths`` from disk.
+    """
+    config = replace(config or config_from_dict(recording.config), record_directory="", stats_database="")
+    engine = ReplayEngine(config, recording, templates)
+    engine.run()
+    logs = [event.message(config.language) for event in engine.events.drain()]
+    return ReplayResult(engine.controls.actions, logs)
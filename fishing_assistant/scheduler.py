@@ -0,0 +1,59 @@
+"""Fixed-rate pacing for capture loops."""
+
+import time
+from typing import Callable
+
+from .bite import RunningStats
+
+
+class FrameScheduler:
+    """Paces a loop at ``fps`` frames per second on a fixed slot grid.
+
+    Call ``tick`` when a frame starts and sleep for ``delay()`` once it has
+    been processed, so only the remainder of the slot is spent waiting. If
+    processing overruns, the missed slots are skipped and counted instead of
+    shifting every later frame. ``restart`` begins a new run (for example a
+    new cast) while keeping the accumulated statistics.
+    """
+
+    def __init__(self, fps: float, clock: Callable[[], float] = time.monotonic):
+        self.period = 1.0 / fps
+        self.clock = clock
+        self.frames = 0
+        self.skipped = 0
+        self.intervals = RunningStats()
+        self._next = None
+        self._last = None
+
+    def restart(self) -> None:
+        self._next = None
+        self._last = None
+
+    def tick(self) -> None:
+        now = self.clock()
+        if self._last is not None:
+            self.intervals.update(now - self._last)
+        self._last = now
+        self.frames += 1
+        self._next = (now if self._next is None else self._next) + self.period
+
+    def delay(self) -> float:
+        """Seconds to sleep until the next slot, skipping slots already missed."""
+        if self._next is None:
+            return 0.0
+        remaining = self._next - self.clock()
+        if remaining < 0:
+            missed = int(-remaining // self.period) + 1
+            self.skipped += missed
+            self._next += missed * self.period
+            remaining += missed * self.period
+        return remaining
+
+    @property
+    def fps(self) -> float:
+        return 1.0 / self.intervals.mean if self.intervals.count and self.intervals.mean > 0 else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """Standard deviation of frame intervals, in seconds."""
+        return self.intervals.std
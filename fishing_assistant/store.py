@@ -0,0 +1,279 @@
+"""Append-only session statistics in SQLite, and throughput reports."""
+
+from dataclasses import dataclass
+import hashlib
+import json
+from pathlib import Path
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .config import AppConfig, data_path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    config_hash TEXT NOT NULL,
+    config TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS casts (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    at REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    confidence REAL,
+    search_seconds REAL,
+    bite_seconds REAL,
+    loot_seconds REAL
+);
+CREATE TABLE IF NOT EXISTS presses (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    at REAL NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS casts_by_session ON casts(session_id);
+"""
+
+# Cast outcomes. A reel is counted as false when the bobber was still in
+# place after the loot wait, which is all that can be seen from the screen.
+OUTCOMES = ("caught", "false_reel", "timeout", "no_bobber", "stopped")
+
+# Settings that do not change how a session fishes, left out of the config hash.
+UNTUNED_FIELDS = frozenset({
+    "language", "duration_hours", "log_max_lines", "log_file", "log_file_max_kb", "log_file_backups",
+    "metrics_log_interval", "metrics_export_path", "metrics_export_interval", "instrumentation",
+    "record_directory", "record_max_mb", "template_cache_directory", "stats_database",
+})
+
+# Text keys of the report columns, in the order of ``Report.cells``.
+REPORT_COLUMNS = (
+    "report_label", "report_started", "report_hours", "report_casts", "report_casts_per_hour",
+    "report_catch_rate", "report_false_reel_rate", "report_afk", "report_search", "report_bite",
+)
+
+# Queued writes are committed in batches of at most this many rows.
+WRITE_BATCH = 256
+
+
+def config_hash(config: dict[str, Any]) -> str:
+    tuned = {key: value for key, value in config.items() if key not in UNTUNED_FIELDS}
+    return hashlib.sha1(json.dumps(tuned, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def database_path(config: AppConfig) -> Optional[Path]:
+    """Where ``config`` keeps its statistics; relative paths live in the per-user data directory."""
+    return data_path(config.stats_database)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open the store in WAL mode, so reports can read while a session writes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+@dataclass
+class CastRecord:
+    """One cast; the seconds count from the cast key, loot from the click."""
+
+    at: float
+    outcome: str = "stopped"
+    confidence: Optional[float] = None
+    search_seconds: Optional[float] = None
+    bite_seconds: Optional[float] = None
+    loot_seconds: Optional[float] = None
+
+
+_CLOSE = object()
+
+
+class SessionWriter:
+    """Records one session from a background thread.
+
+    ``cast`` and ``press`` only enqueue, so the fishing loop never waits
+    for the disk; the writer thread owns the connection and commits queued
+    rows in batches. ``failed`` receives the first error, after which
+    nothing more is written.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        config: dict[str, Any],
+        failed: Callable[[Exception], None] = lambda exc: None,
+    ):
+        self.path = Path(path)
+        self.config = config
+        self.failed = failed
+        self.session_id: Optional[int] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="session-store", daemon=True)
+        self._thread.start()
+
+    def cast(self, record: CastRecord) -> None:
+        self._queue.put((
+            "INSERT INTO casts VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (record.at, record.outcome, record.confidence, record.search_seconds,
+             record.bite_seconds, record.loot_seconds),
+        ))
+
+    def press(self, kind: str) -> None:
+        self._queue.put(("INSERT INTO presses VALUES (?, ?, ?)", (time.time(), kind)))
+
+    def close(self) -> None:
+        """Write the remaining rows, mark the session ended and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            connection = connect(self.path)
+        except (OSError, sqlite3.Error) as exc:
+            self.failed(exc)
+            return
+        try:
+            with connection:
+                self.session_id = connection.execute(
+                    "INSERT INTO sessions (started_at, config_hash, config) VALUES (?, ?, ?)",
+                    (time.time(), config_hash(self.config), json.dumps(self.config, ensure_ascii=False)),
+                ).lastrowid
+            closing = False
+            while not closing:
+                batch = [self._queue.get()]
+                while len(batch) < WRITE_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                closing = batch[-1] is _CLOSE
+                with connection:
+                    for item in batch:
+                        if item is _CLOSE:
+                            continue
+                        statement, values = item
+                        connection.execute(statement, (self.session_id, *values))
+                    if closing:
+                        connection.execute(
+                            "UPDATE sessions SET ended_at = ? WHERE id = ?", (time.time(), self.session_id)
+                        )
+        except sqlite3.Error as exc:
+            self.failed(exc)
+        finally:
+            connection.close()
+
+
+@dataclass
+class Report:
+    """Throughput of one session, or of every session run with one config."""
+
+    label: str
+    started_at: float
+    hours: float
+    casts: int
+    caught: int
+    false_reels: int
+    timeouts: int
+    afk_presses: int
+    search_seconds: list[float]
+    bite_seconds: list[float]
+
+    @property
+    def casts_per_hour(self) -> float:
+        return self.casts / self.hours if self.hours > 0 else 0.0
+
+    @property
+    def catch_rate(self) -> float:
+        return self.caught / self.casts if self.casts else 0.0
+
+    @property
+    def false_reel_rate(self) -> float:
+        reels = self.caught + self.false_reels
+        return self.false_reels / reels if reels else 0.0
+
+    @staticmethod
+    def percentile(samples: list[float], fraction: float) -> float:
+        # Linear interpolation like numpy's default, which the window does not import at startup.
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        position = fraction * (len(ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    def distribution(self, samples: list[float]) -> str:
+        return f"{self.percentile(samples, 0.5):.2f} / {self.percentile(samples, 0.95):.2f}"
+
+    def cells(self) -> list[str]:
+        return [
+            self.label,
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(self.started_at)),
+            f"{self.hours:.2f}",
+            str(self.casts),
+            f"{self.casts_per_hour:.0f}",
+            f"{self.catch_rate:.0%}",
+            f"{self.false_reel_rate:.0%}",
+            str(self.afk_presses),
+            self.distribution(self.search_seconds),
+            self.distribution(self.bite_seconds),
+        ]
+
+
+def _report(label: str, sessions: list[tuple], casts: list[tuple], presses: int) -> Report:
+    started_at = min(session[1] for session in sessions)
+    # A session that never closed ends, as far as is known, at its last cast.
+    seconds = sum(
+        (session[2] or max([cast[3] for cast in casts if cast[4] == session[0]], default=session[1])) - session[1]
+        for session in sessions
+    )
+    outcomes = [cast[0] for cast in casts]
+    return Report(
+        label, started_at, seconds / 3600, len(casts),
+        outcomes.count("caught"), outcomes.count("false_reel"), outcomes.count("timeout"), presses,
+        [cast[1] for cast in casts if cast[1] is not None],
+        [cast[2] for cast in casts if cast[2] is not None],
+    )
+
+
+def reports(path: Path, by_config: bool = False) -> list[Report]:
+    """Per-session reports, oldest first, or one report per config hash."""
+    connection = connect(Path(path))
+    try:
+        sessions = connection.execute(
+            "SELECT id, started_at, ended_at, config_hash FROM sessions ORDER BY started_at"
+        ).fetchall()
+        casts: dict[int, list[tuple]] = {}
+        for values in connection.execute(
+            "SELECT outcome, search_seconds, bite_seconds, at, session_id FROM casts"
+        ):
+            casts.setdefault(values[4], []).append(values)
+        afk = dict(connection.execute(
+            "SELECT session_id, COUNT(*) FROM presses WHERE kind = 'afk' GROUP BY session_id"
+        ).fetchall())
+    finally:
+        connection.close()
+
+    if not by_config:
+        return [
+            _report(f"#{session[0]}", [session], casts.get(session[0], []), afk.get(session[0], 0))
+            for session in sessions
+        ]
+    groups: dict[str, list[tuple]] = {}
+    for session in sessions:
+        groups.setdefault(session[3], []).append(session)
+    return [
+        _report(
+            digest, grouped,
+            [cast for session in grouped for cast in casts.get(session[0], [])],
+            sum(afk.get(session[0], 0) for session in grouped),
+        )
+        for digest, grouped in groups.items()
+    ]
@@ -0,0 +1,257 @@
+"""Several fishing sessions, one per game window, in one process."""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+import heapq
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Callable, Optional
+
+from .backends import BackendUnavailable, load_backend
+from .capture import FrameSource, ScreenFrameSource
+from .config import CONFIG_FILE, AppConfig
+from .controls import Controls
+from .engine import FishingEngine, load_template_bank, reload_template_bank, snapshot
+from .events import LogChannel, LogEvent
+from .instrumentation import Instrumentation
+from .vision import TemplateBank
+from .window import CachedWindow
+
+
+# How often ``Supervisor.run`` checks for new settings and finished sessions, in seconds.
+POLL_INTERVAL = 0.2
+
+
+class FocusArbiter:
+    """Serializes input between windows.
+
+    Keyboard and pointer input goes to the foreground window, so each action
+    runs under one lock after its window has been brought to the front, if
+    another session or the user took the focus since the last action, and
+    given ``settle`` seconds to accept input. Switches are counted.
+    """
+
+    def __init__(self, backend, settle: float = 0.2, sleep: Callable[[float], None] = time.sleep):
+        self.backend = backend
+        self.settle = settle
+        self.sleep = sleep
+        self.focused: Optional[int] = None
+        self.pointer_owner: Optional[int] = None
+        self.switches = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def focus(self, handle: int):
+        with self._lock:
+            if self.focused != handle or self.backend.foreground_window() != handle:
+                self.backend.activate_handle(handle)
+                self.sleep(self.settle)
+                self.focused = handle
+                self.switches += 1
+            yield
+
+
+class WindowControls(Controls):
+    """``Controls`` bound to one window handle, sharing a ``FocusArbiter``.
+
+    Clicks go wherever the pointer is, so if another session moved it since
+    this session's last ``move_to``, it is moved back before clicking.
+    """
+
+    def __init__(self, backend, handle: int, arbiter: FocusArbiter):
+        self.backend = backend
+        self.handle = handle
+        self.arbiter = arbiter
+        self._target: Optional[tuple[int, int]] = None
+
+    def press(self, key: str) -> None:
+        with self.arbiter.focus(self.handle):
+            self.backend.press(key)
+
+    def move_to(self, x: int, y: int) -> None:
+        with self.arbiter.focus(self.handle):
+            self.backend.move_to(x, y)
+            self.arbiter.pointer_owner = self.handle
+            self._target = (x, y)
+
+    def click(self) -> None:
+        with self.arbiter.focus(self.handle):
+            if self.arbiter.pointer_owner != self.handle and self._target is not None:
+                self.backend.move_to(*self._target, duration=0)
+                self.arbiter.pointer_owner = self.handle
+            self.backend.click()
+
+
+@dataclass(frozen=True)
+class SessionEvent:
+    """A session's log event, labelled with the session it came from."""
+
+    label: str
+    event: LogEvent
+
+    @property
+    def timestamp(self) -> float:
+        return self.event.timestamp
+
+    def message(self, language: str) -> str:
+        return f"[{self.label}] {self.event.message(language)}"
+
+
+@dataclass
+class Session:
+    label: str
+    handle: int
+    engine: FishingEngine
+    thread: Optional[threading.Thread] = None
+
+
+class Supervisor:
+    """Runs one ``FishingEngine`` per game window, each on its own thread.
+
+    Windows are the given ``handles`` or every visible window titled
+    ``config.game_window_title``. All sessions share one template bank,
+    decoded once, and one matcher thread pool sized to the CPU count, and
+    their input is serialized by a ``FocusArbiter``. Windows must not
+    overlap, because each session captures its own client area from the
+    screen. ``update_config`` only hands the settings over; the thread in
+    ``run`` updates the shared bank once and passes it to every session.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        handles: Optional[list[int]] = None,
+        backend=None,
+        frames: Callable[[int], FrameSource] = lambda handle: ScreenFrameSource(),
+        templates: Optional[TemplateBank] = None,
+        config_path: Path = CONFIG_FILE,
+    ):
+        self.config = config
+        self.handles = handles
+        self.backend = backend
+        self.frames = frames
+        self.templates = templates
+        self.config_path = config_path
+        self.events = LogChannel(config.metrics_log_interval)
+        self.sessions: list[Session] = []
+        self.arbiter: Optional[FocusArbiter] = None
+        self.pool: Optional[ThreadPoolExecutor] = None
+        self.bank: Optional[TemplateBank] = None
+        self._stop_event = threading.Event()
+        self._update_lock = threading.Lock()
+        self._updated = threading.Event()
+        self._pending: Optional[AppConfig] = None
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._updated.set()
+        for session in self.sessions:
+            session.engine.stop()
+
+    def run(self) -> None:
+        """Start every session, apply new settings until all of them have finished."""
+        if not self.start():
+            return
+        try:
+            while any(session.thread.is_alive() for session in self.sessions):
+                if self._updated.wait(POLL_INTERVAL):
+                    self._apply_updates()
+            for session in self.sessions:
+                session.thread.join()
+        finally:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def start(self) -> bool:
+        with self._update_lock:
+            if self._pending is not None:
+                # Settings changed before the sessions exist: they are created with them.
+                self.config, self._pending = self._pending, None
+        try:
+            backend = self.backend or load_backend()
+        except (BackendUnavailable, ImportError) as exc:
+            self.events.emit("backend_unavailable", error=str(exc))
+            return False
+        handles = self.handles if self.handles is not None else backend.find_windows(self.config.game_window_title)
+        if not handles:
+            self.events.emit("window_failed")
+            return False
+        templates = self.templates
+        if templates is None:
+            templates = load_template_bank(
+                self.config, lambda name: self.events.emit("template_unreadable", name=name)
+            )
+        if not templates:
+            self.events.emit("no_template")
+            return False
+        # Built before the sessions start so their first searches don't wait for them; smaller
+        # search areas need shallower pyramids, which the bank builds once under its lock.
+        if self.config.pyramid_levels:
+            templates.pyramids(self.config.pyramid_levels)
+        if self.config.bobber_locator == "features":
+            templates.features()
+
+        self.bank = templates
+        self._bank_config = snapshot(self.config)
+        self.threads = os.cpu_count() or 1
+        self.pool = ThreadPoolExecutor(self.threads, thread_name_prefix="matcher")
+        session_config = self._session_config(self.config)
+        self.arbiter = FocusArbiter(backend)
+        self.events.emit("clients_found", count=len(handles))
+        for index, handle in enumerate(handles):
+            engine = FishingEngine(
+                session_config, self.frames(handle), WindowControls(backend, handle, self.arbiter),
+                templates=templates, config_path=self.config_path, pool=self.pool,
+                # Focus is taken per action, so a session only tracks its client area.
+                window=CachedWindow(backend, self.config.game_window_title, handle, activate=False),
+            )
+            session = Session(f"#{index + 1}", handle, engine)
+            session.thread = threading.Thread(target=engine.run, name=f"session-{index + 1}", daemon=True)
+            # Listed before the check, so a concurrent ``stop`` either sees the session or is seen here.
+            self.sessions.append(session)
+            if self._stop_event.is_set():
+                engine.stop()
+        for session in self.sessions:
+            session.thread.start()
+        return True
+
+    def _session_config(self, config: AppConfig) -> AppConfig:
+        # The speakers play every window's sound, so a splash cannot be told apart by session.
+        return replace(config, match_threads=self.threads, bite_source="visual")
+
+    def update_config(self, config: AppConfig) -> None:
+        """Hand new settings to the supervisor thread; the latest call wins."""
+        with self._update_lock:
+            self._pending = snapshot(config)
+        self._updated.set()
+
+    def _apply_updates(self) -> None:
+        self._updated.clear()
+        with self._update_lock:
+            config, self._pending = self._pending, None
+        if config is None or self.bank is None:
+            return
+        self.bank = reload_template_bank(
+            self.bank, self._bank_config, config,
+            lambda name: self.events.emit("template_unreadable", name=name),
+        )
+        self._bank_config = config
+        if config.pyramid_levels:
+            self.bank.pyramids(config.pyramid_levels)
+        if config.bobber_locator == "features":
+            self.bank.features()
+        for session in self.sessions:
+            session.engine.update_config(self._session_config(config), self.bank)
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return Instrumentation.combined([session.engine.instrumentation for session in self.sessions])
+
+    def drain(self, limit: Optional[int] = None) -> list:
+        """Supervisor and session events, oldest first; ``limit`` applies per channel."""
+        batches = [self.events.drain(limit)]
+        for session in self.sessions:
+            batches.append([SessionEvent(session.label, event) for event in session.engine.events.drain(limit)])
+        return list(heapq.merge(*batches, key=lambda event: event.timestamp))
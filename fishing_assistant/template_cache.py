@@ -0,0 +1,170 @@
+"""Content-addressed on-disk cache of preprocessed template banks."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .vision import DUPLICATE_TOLERANCE, MIN_PYRAMID_SIZE, LogCallback, TemplateBank, load_templates
+
+
+# Bump when the stored layout or the preprocessing changes meaning.
+CACHE_VERSION = 2
+# Banks beyond this many, least recently used first, are deleted.
+MAX_CACHED_BANKS = 8
+INDEX_FILE = "index.json"
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for block in iter(lambda: stream.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TemplateCache:
+    """Stores each deduplicated bank as ``<key>.npy`` pixels plus ``<key>.json`` entries.
+
+    The key hashes the content of every source image together with the
+    variant settings, so editing or replacing an image selects a new entry.
+    Content hashes are remembered per path by size and modification time,
+    which makes a warm start a few ``stat`` calls and one memory map: the
+    bank's templates are read-only views into the mapped file.
+    """
+
+    def __init__(self, directory: Path, max_banks: int = MAX_CACHED_BANKS):
+        self.directory = Path(directory)
+        self.max_banks = max_banks
+        self.hits = 0
+        self.misses = 0
+        self._index: Optional[dict[str, list]] = None
+        self._index_dirty = False
+
+    def load_templates(
+        self,
+        paths: Iterable[str],
+        log: Optional[LogCallback] = None,
+        unreadable_message: str = "⚠ 无法读取模板：{name}",
+        scales: Iterable[float] = (1.0,),
+        angles: Iterable[float] = (),
+        pyramid_levels: int = 0,
+        features: bool = False,
+    ) -> TemplateBank:
+        """Same result as ``vision.load_templates``, served from the cache when possible."""
+        paths, scales, angles = list(paths), list(scales), list(angles)
+        key = self.key(paths, scales, angles)
+        cached = self._open(key)
+        if cached is not None:
+            self.hits += 1
+            bank, unreadable = cached
+        else:
+            self.misses += 1
+            unreadable: list[str] = []
+            bank = load_templates(paths, unreadable.append, "{name}", scales, angles)
+            self._store(key, bank, unreadable)
+        if log:
+            for name in unreadable:
+                log(unreadable_message.format(name=name))
+        if pyramid_levels:
+            bank.pyramids(pyramid_levels)
+        if features:
+            bank.features()
+        return bank
+
+    def key(self, paths: list[str], scales: list[float], angles: list[float]) -> str:
+        files = [[path, self._digest(Path(path))] for path in paths]
+        self._save_index()
+        description = {
+            "version": CACHE_VERSION, "files": files, "scales": scales, "angles": angles,
+            "tolerance": DUPLICATE_TOLERANCE, "min_size": MIN_PYRAMID_SIZE,
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+    def _digest(self, path: Path) -> Optional[str]:
+        """Content hash of ``path``, reused while its size and mtime are unchanged."""
+        index = self._load_index()
+        try:
+            status = path.stat()
+        except OSError:
+            return None
+        name = str(path.resolve())
+        known = index.get(name)
+        if known and known[0] == status.st_size and known[1] == status.st_mtime_ns:
+            return known[2]
+        try:
+            digest = file_digest(path)
+        except OSError:
+            return None
+        index[name] = [status.st_size, status.st_mtime_ns, digest]
+        self._index_dirty = True
+        return digest
+
+    def _load_index(self) -> dict[str, list]:
+        if self._index is None:
+            try:
+                self._index = json.loads((self.directory / INDEX_FILE).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self) -> None:
+        if not self._index_dirty:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._write(self.directory / INDEX_FILE, json.dumps(self._index).encode("utf-8"))
+            self._index_dirty = False
+        except OSError:
+            pass
+
+    def _open(self, key: str) -> Optional[tuple[TemplateBank, list[str]]]:
+        meta_path = self.directory / f"{key}.json"
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta["entries"]:
+                pixels = np.load(self.directory / f"{key}.npy", mmap_mode="r")
+            else:
+                pixels = np.empty(0, dtype=np.uint8)
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return TemplateBank(pixels, meta["entries"]), meta["unreadable"]
+
+    def _store(self, key: str, bank: TemplateBank, unreadable: list[str]) -> None:
+        # Pixels are written first; the metadata file marks a complete entry.
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if len(bank):
+                temporary = self.directory / f"{key}.npy.tmp"
+                with open(temporary, "wb") as stream:
+                    np.save(stream, np.ascontiguousarray(bank.pixels))
+                os.replace(temporary, self.directory / f"{key}.npy")
+            meta = {"entries": bank.entries, "unreadable": unreadable}
+            self._write(self.directory / f"{key}.json", json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        except OSError:
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        metas = sorted(
+            (path for path in self.directory.glob("*.json") if path.name != INDEX_FILE),
+            key=lambda path: path.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for meta_path in metas[self.max_banks:]:
+            try:
+                meta_path.with_suffix(".npy").unlink(missing_ok=True)
+                meta_path.unlink()
+            except OSError:
+                # Still mapped by a running session on Windows; retry next time.
+                pass
+
+    @staticmethod
+    def _write(path: Path, content: bytes) -> None:
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_bytes(content)
+        os.replace(temporary, path)
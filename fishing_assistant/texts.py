@@ -13,18 +13,59 @@ ZH_CN = {
     "afk_key": "防挂机按键", "afk_range": "防挂机间隔（分钟）", "to": "至",
     "confidence": "模板匹配置信度", "mean_difference": "平均差异阈值", "pixel_threshold": "单像素变化阈值",
     "pixel_ratio": "变化像素比例", "confirmation_frames": "连续确认帧数",
+    "bite_detector": "咬钩判断方式", "bite_diff": "固定阈值", "bite_adaptive": "自适应水面噪声",
+    "bite_flow": "光流跟踪浮漂下沉",
+    "flow_displacement": "光流下沉距离（像素）",
+    "bite_source": "咬钩信号", "bite_source_visual": "只看画面", "bite_source_audio": "只听声音",
+    "bite_source_any": "画面或声音", "audio_reference": "咬钩水花录音（WAV）", "browse": "选择…",
+    "audio_filter": "WAV 音频 (*.wav);;所有文件 (*)", "audio_threshold": "声音相似度阈值",
+    "adaptive_sigma": "自适应灵敏度（标准差倍数）",
+    "bobber_locator": "浮漂搜索方式", "locator_template": "模板匹配", "locator_features": "ORB 特征点（适应缩放与旋转）",
+    "pyramid_levels": "金字塔搜索层数（0 为关闭）", "pyramid_candidates": "金字塔候选数量",
     "detection_hint": "需同时满足平均差异和变化像素比例，并持续多帧，能降低水波与光影误触发。",
     "start": "开始运行", "stop": "安全停止", "ready": "准备就绪",
     "image_filter": "图片 (*.png *.jpg *.jpeg *.bmp);;所有文件 (*)",
     "save_failed": "⚠ 保存配置失败：{error}", "need_image": "❌ 请先添加至少一张浮漂模板",
     "need_hotkey": "❌ 请填写钓鱼快捷键", "need_window": "❌ 请填写游戏窗口标题",
+    "backend_unavailable": "❌ 当前系统无法控制游戏窗口：{error}",
     "started": "▶ 钓鱼程序已启动", "stopped": "■ 钓鱼程序已停止",
     "stop_requested": "🛑 已请求安全停止，正在结束当前操作…", "afk_pressed": "⏱ 防挂机：按下 {key}",
     "no_template": "❌ 没有可读取的浮漂模板", "window_failed": "❌ 游戏窗口激活失败，请检查窗口标题",
     "use_bait": "🪱 使用鱼饵…", "cast": "🎣 抛竿钓鱼…", "not_caught": "🟡 本轮未确认咬钩，准备重新抛竿",
     "runtime_error": "❌ 运行错误：{error}", "float_found": "🔍 找到浮漂，置信度 {confidence:.2f}",
     "metrics": "📊 差异 {difference:.1f} / 像素比例 {ratio:.1%} / 确认 {current}/{required}",
+    "flow_metrics": "📊 浮漂下沉 {offset:.1f} 像素 / 跟踪点 {points} / 确认 {current}/{required}",
+    "audio_bite": "🔊 听到咬钩水花，相似度 {score:.2f}，滞后 {delay:.2f} 秒",
+    "audio_failed": "⚠ 声音检测不可用：{error}；改为只看画面",
+    "audio_no_reference": "未选择咬钩水花录音",
     "bite_confirmed": "🟢 已确认咬钩，右键收杆", "template_unreadable": "⚠ 无法读取模板：{name}",
+    "config_updated": "⚙ 已应用新设置，模板变体 {templates} 个",
+    "frame_stats": "⏲ {phase}：实际 {fps:.1f} 帧/秒，抖动 {jitter:.1f} 毫秒，跳过 {skipped} 帧",
+    "phase_search": "浮漂搜索", "phase_bite": "咬钩监测",
+    "cycle_stats": "🔁 每小时抛竿 {casts_per_hour:.0f} 次，空闲占 {idle:.0%}；当前节奏：抛竿 {search_delay:.1f} 秒后搜索，{cast_timeout:.0f} 秒未咬钩放弃，收杆 {reel_pause:.1f} 秒后重抛",
+    "perf_cycle": "每小时抛竿 {casts_per_hour:.0f} 次 / 空闲占比 {idle:.0%}",
+    "window_stats": "🪟 激活游戏窗口 {activations} 次，沿用已知位置 {reuses} 次",
+    "roi_stats": "📍 区域预测命中 {hits} 次 / 未命中 {misses} 次，约节省搜索时间 {saved:.1f} 秒/小时",
+    "tab_performance": "性能", "instrumentation": "采集各阶段耗时统计",
+    "performance_hint": "显示本次运行各阶段耗时的分位数（毫秒）；关闭采集后几乎没有额外开销，下次启动生效。",
+    "perf_stage": "阶段", "perf_count": "次数", "perf_fps": "实际帧率：浮漂搜索 {search:.1f} 帧/秒 / 咬钩监测 {bite:.1f} 帧/秒",
+    "stage_templates": "加载模板", "stage_activate": "激活窗口", "stage_input": "键鼠输入", "stage_frame_wait": "等待帧",
+    "stage_capture": "截图", "stage_match": "模板匹配", "stage_bite": "咬钩判断", "stage_log": "日志",
+    "stage_bite_to_click": "咬钩到点击", "stage_audio": "声音检测", "stage_splash_to_bite": "水花到识别",
+    "metrics_export_failed": "⚠ 无法导出性能统计：{error}",
+    "stats_failed": "⚠ 无法写入运行统计：{error}",
+    "tab_statistics": "统计", "statistics_hint": "每次运行的抛竿记录保存在 {path}，可比较不同设置的效果。",
+    "statistics_by_config": "按设置汇总", "refresh": "刷新", "no_statistics": "还没有运行记录",
+    "report_label": "运行/设置", "report_started": "开始时间", "report_hours": "时长（小时）", "report_casts": "抛竿",
+    "report_casts_per_hour": "每小时抛竿", "report_catch_rate": "收获率", "report_false_reel_rate": "误收杆率",
+    "report_afk": "防挂机", "report_search": "找到浮漂 p50/p95（秒）", "report_bite": "咬钩 p50/p95（秒）",
+    "no_clips": "没有找到标注的录制片段", "calibration_false_reels": "误收杆", "calibration_misses": "漏检",
+    "calibration_latency": "平均咬钩延迟（秒）", "calibration_saved": "已把标 * 的设置写入 {path}",
+    "multi_client": "同时运行所有同名游戏窗口", "multi_client_hint": "每个窗口独立钓鱼，键鼠输入会轮流切换窗口；窗口之间不能重叠。",
+    "clients_found": "🪟 找到 {count} 个游戏窗口", "sessions": "会话状态",
+    "session_label": "会话", "session_state": "状态", "session_casts": "抛竿", "session_catches": "收杆",
+    "state_starting": "启动中", "state_casting": "抛竿", "state_searching": "寻找浮漂", "state_monitoring": "等待咬钩",
+    "state_waiting": "等待下一轮", "state_stopped": "已停止",
 }
 
 EN_US = {
@@ -38,18 +79,59 @@ EN_US = {
     "afk_key": "Anti-AFK key", "afk_range": "Anti-AFK interval (minutes)", "to": "to",
     "confidence": "Template confidence", "mean_difference": "Mean difference threshold", "pixel_threshold": "Pixel-change threshold",
     "pixel_ratio": "Changed-pixel ratio", "confirmation_frames": "Confirmation frames",
+    "bite_detector": "Bite detection", "bite_diff": "Fixed thresholds", "bite_adaptive": "Adaptive water noise",
+    "bite_flow": "Optical flow bobber dip",
+    "flow_displacement": "Optical flow dip (pixels)",
+    "bite_source": "Bite signal", "bite_source_visual": "Screen only", "bite_source_audio": "Sound only",
+    "bite_source_any": "Screen or sound", "audio_reference": "Bite splash clip (WAV)", "browse": "Browse…",
+    "audio_filter": "WAV audio (*.wav);;All files (*)", "audio_threshold": "Sound similarity threshold",
+    "adaptive_sigma": "Adaptive sensitivity (standard deviations)",
+    "bobber_locator": "Bobber search", "locator_template": "Template matching", "locator_features": "ORB features (scale and rotation tolerant)",
+    "pyramid_levels": "Pyramid search levels (0 = off)", "pyramid_candidates": "Pyramid candidates",
     "detection_hint": "A bite must satisfy both change thresholds for several consecutive frames, reducing false triggers from water and lighting.",
     "start": "Start", "stop": "Stop Safely", "ready": "Ready",
     "image_filter": "Images (*.png *.jpg *.jpeg *.bmp);;All Files (*)",
     "save_failed": "⚠ Could not save settings: {error}", "need_image": "❌ Add at least one bobber template first",
     "need_hotkey": "❌ Enter the fishing hotkey", "need_window": "❌ Enter the game window title",
+    "backend_unavailable": "❌ The game window cannot be controlled on this system: {error}",
     "started": "▶ Fishing assistant started", "stopped": "■ Fishing assistant stopped",
     "stop_requested": "🛑 Safe stop requested; finishing the current operation…", "afk_pressed": "⏱ Anti-AFK: pressed {key}",
     "no_template": "❌ No readable bobber templates", "window_failed": "❌ Could not activate the game window; check its title",
     "use_bait": "🪱 Applying bait…", "cast": "🎣 Casting…", "not_caught": "🟡 No bite confirmed; preparing to cast again",
     "runtime_error": "❌ Runtime error: {error}", "float_found": "🔍 Bobber found; confidence {confidence:.2f}",
     "metrics": "📊 Difference {difference:.1f} / changed pixels {ratio:.1%} / confirmation {current}/{required}",
+    "flow_metrics": "📊 Bobber dip {offset:.1f} px / tracked points {points} / confirmation {current}/{required}",
+    "audio_bite": "🔊 Bite splash heard, similarity {score:.2f}, {delay:.2f} s after it began",
+    "audio_failed": "⚠ Sound detection unavailable: {error}; watching the screen only",
+    "audio_no_reference": "no bite splash clip selected",
     "bite_confirmed": "🟢 Bite confirmed; right-clicking", "template_unreadable": "⚠ Could not read template: {name}",
+    "config_updated": "⚙ New settings applied; {templates} template variants",
+    "frame_stats": "⏲ {phase}: {fps:.1f} FPS achieved, {jitter:.1f} ms jitter, {skipped} frames skipped",
+    "phase_search": "Bobber search", "phase_bite": "Bite monitoring",
+    "cycle_stats": "🔁 {casts_per_hour:.0f} casts per hour, {idle:.0%} idle; current timing: search {search_delay:.1f} s after casting, give up after {cast_timeout:.0f} s without a bite, recast {reel_pause:.1f} s after reeling in",
+    "perf_cycle": "{casts_per_hour:.0f} casts per hour / {idle:.0%} idle",
+    "window_stats": "🪟 Game window activated {activations} times; known position reused {reuses} times",
+    "roi_stats": "📍 Predicted-region hits {hits} / misses {misses}; about {saved:.1f} s of search saved per hour",
+    "tab_performance": "Performance", "instrumentation": "Collect per-stage timings",
+    "performance_hint": "Latency percentiles of each stage in this run, in milliseconds. Collection costs almost nothing when off; changes apply at the next start.",
+    "perf_stage": "Stage", "perf_count": "Count", "perf_fps": "Achieved rate: bobber search {search:.1f} FPS / bite monitoring {bite:.1f} FPS",
+    "stage_templates": "Load templates", "stage_activate": "Activate window", "stage_input": "Input", "stage_frame_wait": "Frame wait",
+    "stage_capture": "Capture", "stage_match": "Template matching", "stage_bite": "Bite detection", "stage_log": "Logging",
+    "stage_bite_to_click": "Bite to click", "stage_audio": "Sound detection", "stage_splash_to_bite": "Splash to detection",
+    "metrics_export_failed": "⚠ Could not export performance statistics: {error}",
+    "stats_failed": "⚠ Could not write session statistics: {error}",
+    "tab_statistics": "Statistics", "statistics_hint": "Every cast is recorded in {path}, so settings can be compared across sessions.",
+    "statistics_by_config": "Group by settings", "refresh": "Refresh", "no_statistics": "No sessions recorded yet",
+    "report_label": "Session/settings", "report_started": "Started", "report_hours": "Hours", "report_casts": "Casts",
+    "report_casts_per_hour": "Casts/hour", "report_catch_rate": "Catch rate", "report_false_reel_rate": "False reels",
+    "report_afk": "Anti-AFK", "report_search": "Bobber found p50/p95 (s)", "report_bite": "Bite p50/p95 (s)",
+    "no_clips": "No labelled clips found", "calibration_false_reels": "False reels", "calibration_misses": "Missed",
+    "calibration_latency": "Mean bite latency (s)", "calibration_saved": "Saved the settings marked * to {path}",
+    "multi_client": "Run every game window with this title", "multi_client_hint": "Each window fishes on its own and input switches between them; the windows must not overlap.",
+    "clients_found": "🪟 Found {count} game windows", "sessions": "Sessions",
+    "session_label": "Session", "session_state": "State", "session_casts": "Casts", "session_catches": "Catches",
+    "state_starting": "Starting", "state_casting": "Casting", "state_searching": "Searching", "state_monitoring": "Monitoring",
+    "state_waiting": "Waiting", "state_stopped": "Stopped",
 }
 
 TRANSLATIONS = {"zh_CN": ZH_CN, "en_US": EN_US}
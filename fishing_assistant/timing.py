@@ -0,0 +1,124 @@
+"""Cast cycle timing learned from the session's own casts."""
+
+from collections import deque
+from dataclasses import dataclass
+import math
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class TimingProfile:
+    """Waits of one cast cycle, in seconds.
+
+    ``cast_timeout`` counts from the end of ``search_delay``. The defaults
+    are the fixed timings the cycle has always used and stay the fallback
+    until enough casts have been observed.
+    """
+
+    search_delay: float = 1.5
+    cast_timeout: float = 20.0
+    reel_pause: float = 3.0
+    bait_pause: float = 2.0
+    bait_interval: float = 660.0
+
+
+FALLBACK_PROFILE = TimingProfile()
+
+
+class TimingModel:
+    """Per-cast observations and the profile they imply.
+
+    Three delays are observed on every cast: from the cast key to the
+    bobber being found, from the cast key to a confirmed bite, and from the
+    click to the bobber disappearing once the catch is looted. With
+    ``min_samples`` observations of a delay its wait is derived from the
+    latest ``history`` of them and clamped to the fallback:
+
+    - searching starts ``margin`` before the 5th percentile of bobber
+      delays, so the first search frame rarely comes too late;
+    - a cast is abandoned ``margin`` after the 98th percentile of bites;
+    - the next cast follows ``margin`` after the 90th percentile of loots.
+
+    A cast given up without a bite and a loot not seen within the pause are
+    recorded as lasting longer than any wait. Without them only the delays
+    that beat the current wait would be observed and the waits could only
+    shrink; with them a percentile that reaches past the wait restores the
+    fallback.
+    The bait timings are set by the game and always come from the fallback.
+    Time spent in fixed waits is counted as idle for the cycle metrics.
+    """
+
+    def __init__(
+        self,
+        fallback: TimingProfile = FALLBACK_PROFILE,
+        adaptive: bool = True,
+        history: int = 50,
+        min_samples: int = 5,
+        margin: float = 0.3,
+    ):
+        self.fallback = fallback
+        self.adaptive = adaptive
+        self.min_samples = min_samples
+        self.margin = margin
+        self.bobber: deque[float] = deque(maxlen=history)
+        self.bite: deque[float] = deque(maxlen=history)
+        self.loot: deque[float] = deque(maxlen=history)
+        self.profile = fallback
+        self.idle_seconds = 0.0
+
+    def record_bobber(self, seconds: float) -> None:
+        self.bobber.append(seconds)
+        self._update()
+
+    def record_bite(self, seconds: float) -> None:
+        self.bite.append(seconds)
+        self._update()
+
+    def record_no_bite(self) -> None:
+        self.record_bite(math.inf)
+
+    def record_loot(self, seconds: float) -> None:
+        self.loot.append(seconds)
+        self._update()
+
+    def record_no_loot(self) -> None:
+        self.record_loot(math.inf)
+
+    def record_idle(self, seconds: float) -> None:
+        self.idle_seconds += seconds
+
+    def idle_ratio(self, elapsed: float) -> float:
+        return min(1.0, self.idle_seconds / elapsed) if elapsed > 0 else 0.0
+
+    def _quantile(self, samples: deque, fraction: float) -> Optional[float]:
+        if len(samples) < self.min_samples:
+            return None
+        values = np.sort(np.fromiter(samples, float, len(samples)))
+        # Linear interpolation as in np.quantile; reaching an unfinished
+        # observation gives no finite wait.
+        position = fraction * (len(values) - 1)
+        lower, upper = math.floor(position), math.ceil(position)
+        if math.isinf(values[upper]):
+            return math.inf
+        return float(values[lower] + (values[upper] - values[lower]) * (position - lower))
+
+    def _update(self) -> None:
+        if not self.adaptive:
+            return
+        fallback = self.fallback
+        search_delay, cast_timeout = fallback.search_delay, fallback.cast_timeout
+        reel_pause = fallback.reel_pause
+        bobber = self._quantile(self.bobber, 0.05)
+        if bobber is not None:
+            search_delay = min(fallback.search_delay, max(0.3, bobber - self.margin))
+        bite = self._quantile(self.bite, 0.98)
+        if bite is not None:
+            cast_timeout = min(fallback.cast_timeout, max(5.0, bite + self.margin - search_delay))
+        loot = self._quantile(self.loot, 0.90)
+        if loot is not None:
+            reel_pause = min(fallback.reel_pause, max(0.5, loot + self.margin))
+        self.profile = TimingProfile(
+            search_delay, cast_timeout, reel_pause, fallback.bait_pause, fallback.bait_interval,
+        )
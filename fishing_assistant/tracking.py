@@ -0,0 +1,63 @@
+"""Search-region prediction from recent bobber positions."""
+
+from collections import deque
+from typing import Optional
+
+from .capture import Region
+from .vision import Match
+
+
+class BobberTracker:
+    """Keeps recent matches and proposes a small region to search first.
+
+    The proposed region covers every recent bobber position plus ``margin``
+    pixels on each side, clipped to the client area. Search outcomes are
+    counted so the saving over full-window searches can be reported.
+    """
+
+    def __init__(self, history: int = 10, margin: int = 150):
+        self.matches: deque[Match] = deque(maxlen=max(1, history))
+        self.margin = margin
+        self.hits = 0
+        self.misses = 0
+        self.roi_seconds = 0.0
+        self.full_searches = 0
+        self.full_seconds = 0.0
+
+    def record(self, match: Match) -> None:
+        self.matches.append(match)
+
+    def roi(self, region: Region) -> Optional[Region]:
+        if not self.matches:
+            return None
+        left = min(m.x for m in self.matches) - self.margin
+        top = min(m.y for m in self.matches) - self.margin
+        right = max(m.x + m.width for m in self.matches) + self.margin
+        bottom = max(m.y + m.height for m in self.matches) + self.margin
+        left, top = max(left, region[0]), max(top, region[1])
+        right = min(right, region[0] + region[2])
+        bottom = min(bottom, region[1] + region[3])
+        if right <= left or bottom <= top or (right - left) * (bottom - top) >= region[2] * region[3]:
+            return None
+        return left, top, right - left, bottom - top
+
+    def record_roi_search(self, found: bool, seconds: float) -> None:
+        self.roi_seconds += seconds
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def record_full_search(self, seconds: float) -> None:
+        self.full_searches += 1
+        self.full_seconds += seconds
+
+    def saved_seconds(self) -> float:
+        """Estimated search time saved compared with always searching the full window.
+
+        Each ROI hit avoided one full search; every ROI search, hit or miss,
+        cost its own time.
+        """
+        if not self.full_searches:
+            return 0.0
+        return self.hits * self.full_seconds / self.full_searches - self.roi_seconds
@@ -1,10 +1,14 @@
 """PyQt5 user interface."""
 
+from dataclasses import replace
 import os
+import sqlite3
 import time
+from typing import TYPE_CHECKING, Optional, Union
 
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtWidgets import (
+    QCheckBox,
     QFileDialog,
     QComboBox,
     QDoubleSpinBox,
@@ -17,15 +21,22 @@ from PyQt5.QtWidgets import (
     QMainWindow,
     QPushButton,
     QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
     QTabWidget,
-    QTextEdit,
+    QPlainTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
-from .config import AppConfig, load_config, save_config
+from .backends import warm_up
+from .config import AppConfig, data_path, load_config, save_config
+from .events import open_log_file
+from .store import REPORT_COLUMNS, database_path, reports
 from .texts import LANGUAGES, text
-from .worker import FishingWorker
+
+if TYPE_CHECKING:
+    from .worker import FishingWorker, SupervisorWorker
 
 
 STYLE = """
@@ -33,7 +44,7 @@ QMainWindow, QWidget { background: #f4f7fb; color: #24324a; font-size: 14px; }
 QTabWidget::pane { border: 1px solid #dce4ef; border-radius: 10px; background: white; top: -1px; }
 QTabBar::tab { background: #e8eef7; padding: 10px 18px; margin-right: 3px; border-radius: 7px 7px 0 0; }
 QTabBar::tab:selected { background: #ffffff; color: #1769aa; font-weight: 600; }
-QLineEdit, QSpinBox, QDoubleSpinBox, QListWidget, QTextEdit {
+QLineEdit, QSpinBox, QDoubleSpinBox, QListWidget, QPlainTextEdit, QTableWidget {
     background: white; border: 1px solid #cfd9e7; border-radius: 7px; padding: 7px;
 }
 QLineEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus { border: 1px solid #2684ff; }
@@ -49,14 +60,30 @@ QLabel#section { font-size: 16px; font-weight: 700; margin-top: 5px; }
 QFrame#status { background: #eaf5ff; border-radius: 8px; }
 """
 
+# Worker log events are drained on the GUI thread in batches at this period.
+LOG_DRAIN_INTERVAL_MS = 200
+LOG_DRAIN_BATCH = 500
+# The performance tab and session table read the worker at this period.
+PERFORMANCE_REFRESH_MS = 1000
+PERCENTILE_COLUMNS = ("p50_ms", "p95_ms", "p99_ms")
+SESSION_COLUMNS = ("session_label", "session_state", "session_casts", "session_catches")
+
 
 class FishingAssistantWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.config = load_config()
-        self.worker: FishingWorker | None = None
+        self.worker: Optional[Union["FishingWorker", "SupervisorWorker"]] = None
         self._closing = False
         self._changing_language = False
+        self._log_file = None
+        self._open_log_file()
+        self.log_timer = QTimer(self)
+        self.log_timer.setInterval(LOG_DRAIN_INTERVAL_MS)
+        self.log_timer.timeout.connect(self._drain_log)
+        self.performance_timer = QTimer(self)
+        self.performance_timer.setInterval(PERFORMANCE_REFRESH_MS)
+        self.performance_timer.timeout.connect(self._refresh_performance)
         self.setWindowTitle(self._t("window_title"))
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
         self.setStyleSheet(STYLE)
@@ -64,6 +91,8 @@ class FishingAssistantWindow(QMainWindow):
         self.setMinimumSize(650, 650)
         self._build_ui()
         self._populate_config()
+        # OpenCV and the automation libraries load once the window is up.
+        QTimer.singleShot(0, warm_up)
 
     def _t(self, key: str, **values) -> str:
         return text(key, self.config.language, **values)
@@ -86,6 +115,10 @@ class FishingAssistantWindow(QMainWindow):
         self.tabs.addTab(self._window_tab(), self._t("tab_window"))
         self.tabs.addTab(self._detection_tab(), self._t("tab_detection"))
         self.tabs.addTab(self._log_tab(), self._t("tab_log"))
+        self.tabs.addTab(self._performance_tab(), self._t("tab_performance"))
+        self.tabs.addTab(self._statistics_tab(), self._t("tab_statistics"))
+        self.tabs.currentChanged.connect(self._tab_changed)
+        self._connect_live_settings()
         layout.addWidget(self.tabs, 1)
 
         controls = QHBoxLayout()
@@ -158,6 +191,12 @@ class FishingAssistantWindow(QMainWindow):
         layout.addWidget(hint)
         self.game_window_title = QLineEdit()
         layout.addWidget(self.game_window_title)
+        self.multi_client = QCheckBox(self._t("multi_client"))
+        multi_client_hint = QLabel(self._t("multi_client_hint"))
+        multi_client_hint.setWordWrap(True)
+        multi_client_hint.setObjectName("subtitle")
+        layout.addWidget(self.multi_client)
+        layout.addWidget(multi_client_hint)
 
         layout.addWidget(self._section(self._t("afk_settings")))
         form = QFormLayout()
@@ -188,6 +227,24 @@ class FishingAssistantWindow(QMainWindow):
         hint.setObjectName("subtitle")
         layout.addWidget(hint)
         form = QFormLayout()
+        self.bite_detector = QComboBox()
+        self.bite_detector.addItem(self._t("bite_diff"), "diff")
+        self.bite_detector.addItem(self._t("bite_adaptive"), "adaptive")
+        self.bite_detector.addItem(self._t("bite_flow"), "flow")
+        self.adaptive_sigma = self._double_spin(0.5, 20.0, 0.5, 1)
+        self.flow_displacement = self._double_spin(0.5, 30.0, 0.5, 1)
+        self.bite_source = QComboBox()
+        for source in ("visual", "audio", "any"):
+            self.bite_source.addItem(self._t(f"bite_source_{source}"), source)
+        audio_widget = QWidget()
+        audio_layout = QHBoxLayout(audio_widget)
+        audio_layout.setContentsMargins(0, 0, 0, 0)
+        self.audio_reference = QLineEdit()
+        browse_button = QPushButton(self._t("browse"))
+        browse_button.clicked.connect(self.browse_audio_reference)
+        audio_layout.addWidget(self.audio_reference)
+        audio_layout.addWidget(browse_button)
+        self.audio_threshold = self._double_spin(0.1, 1.0, 0.05, 2)
         self.confidence = self._double_spin(0.1, 1.0, 0.05, 2)
         self.mean_difference = self._double_spin(0, 255, 1, 1)
         self.pixel_threshold = QSpinBox()
@@ -195,11 +252,27 @@ class FishingAssistantWindow(QMainWindow):
         self.pixel_ratio = self._double_spin(0.01, 1.0, 0.01, 2)
         self.confirmation_frames = QSpinBox()
         self.confirmation_frames.setRange(1, 10)
+        self.bobber_locator = QComboBox()
+        for locator in ("template", "features"):
+            self.bobber_locator.addItem(self._t(f"locator_{locator}"), locator)
+        self.pyramid_levels = QSpinBox()
+        self.pyramid_levels.setRange(0, 4)
+        self.pyramid_candidates = QSpinBox()
+        self.pyramid_candidates.setRange(1, 20)
         form.addRow(self._t("confidence"), self.confidence)
         form.addRow(self._t("mean_difference"), self.mean_difference)
         form.addRow(self._t("pixel_threshold"), self.pixel_threshold)
         form.addRow(self._t("pixel_ratio"), self.pixel_ratio)
         form.addRow(self._t("confirmation_frames"), self.confirmation_frames)
+        form.addRow(self._t("bite_detector"), self.bite_detector)
+        form.addRow(self._t("adaptive_sigma"), self.adaptive_sigma)
+        form.addRow(self._t("flow_displacement"), self.flow_displacement)
+        form.addRow(self._t("bite_source"), self.bite_source)
+        form.addRow(self._t("audio_reference"), audio_widget)
+        form.addRow(self._t("audio_threshold"), self.audio_threshold)
+        form.addRow(self._t("bobber_locator"), self.bobber_locator)
+        form.addRow(self._t("pyramid_levels"), self.pyramid_levels)
+        form.addRow(self._t("pyramid_candidates"), self.pyramid_candidates)
         layout.addLayout(form)
         layout.addStretch()
         return tab
@@ -210,12 +283,69 @@ class FishingAssistantWindow(QMainWindow):
         layout.setContentsMargins(18, 18, 18, 18)
         self.status = QLabel(self._t("ready"))
         self.status.setObjectName("subtitle")
-        self.log_output = QTextEdit()
+        self.log_output = QPlainTextEdit()
         self.log_output.setReadOnly(True)
+        self.log_output.setMaximumBlockCount(self.config.log_max_lines)
+        self.sessions_table = QTableWidget(0, len(SESSION_COLUMNS))
+        self.sessions_table.setHorizontalHeaderLabels([self._t(name) for name in SESSION_COLUMNS])
+        self.sessions_table.verticalHeader().setVisible(False)
+        self.sessions_table.horizontalHeader().setStretchLastSection(True)
+        self.sessions_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.sessions_table.setMaximumHeight(140)
         layout.addWidget(self.status)
+        layout.addWidget(self._section(self._t("sessions")))
+        layout.addWidget(self.sessions_table)
         layout.addWidget(self.log_output, 1)
         return tab
 
+    def _performance_tab(self) -> QWidget:
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setContentsMargins(18, 18, 18, 18)
+        hint = QLabel(self._t("performance_hint"))
+        hint.setWordWrap(True)
+        hint.setObjectName("subtitle")
+        self.instrumentation = QCheckBox(self._t("instrumentation"))
+        self.achieved_fps = QLabel(self._t("perf_fps", search=0.0, bite=0.0))
+        self.cycle_rate = QLabel(self._t("perf_cycle", casts_per_hour=0.0, idle=0.0))
+        self.performance_table = QTableWidget(0, 2 + len(PERCENTILE_COLUMNS))
+        self.performance_table.setHorizontalHeaderLabels(
+            [self._t("perf_stage"), self._t("perf_count")] + [name[:3] for name in PERCENTILE_COLUMNS]
+        )
+        self.performance_table.verticalHeader().setVisible(False)
+        self.performance_table.horizontalHeader().setStretchLastSection(True)
+        self.performance_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(hint)
+        layout.addWidget(self.instrumentation)
+        layout.addWidget(self.achieved_fps)
+        layout.addWidget(self.cycle_rate)
+        layout.addWidget(self.performance_table, 1)
+        return tab
+
+    def _statistics_tab(self) -> QWidget:
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setContentsMargins(18, 18, 18, 18)
+        self.statistics_hint = QLabel()
+        self.statistics_hint.setWordWrap(True)
+        self.statistics_hint.setObjectName("subtitle")
+        controls = QHBoxLayout()
+        self.statistics_by_config = QCheckBox(self._t("statistics_by_config"))
+        self.statistics_by_config.toggled.connect(self._refresh_statistics)
+        refresh = QPushButton(self._t("refresh"))
+        refresh.clicked.connect(self._refresh_statistics)
+        controls.addWidget(self.statistics_by_config)
+        controls.addStretch()
+        controls.addWidget(refresh)
+        self.statistics_table = QTableWidget(0, len(REPORT_COLUMNS))
+        self.statistics_table.setHorizontalHeaderLabels([self._t(key) for key in REPORT_COLUMNS])
+        self.statistics_table.verticalHeader().setVisible(False)
+        self.statistics_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.statistics_hint)
+        layout.addLayout(controls)
+        layout.addWidget(self.statistics_table, 1)
+        return tab
+
     @staticmethod
     def _double_spin(minimum: float, maximum: float, step: float, decimals: int) -> QDoubleSpinBox:
         spin = QDoubleSpinBox()
@@ -233,6 +363,7 @@ class FishingAssistantWindow(QMainWindow):
         self.bait_hotkey.setText(self.config.bait_hotkey)
         self.duration.setValue(self.config.duration_hours)
         self.game_window_title.setText(self.config.game_window_title)
+        self.multi_client.setChecked(self.config.multi_client)
         self.afk_key.setText(self.config.afk_key)
         self.afk_min.setValue(self.config.afk_time_min)
         self.afk_max.setValue(self.config.afk_time_max)
@@ -241,10 +372,22 @@ class FishingAssistantWindow(QMainWindow):
         self.pixel_threshold.setValue(self.config.changed_pixel_threshold)
         self.pixel_ratio.setValue(self.config.changed_pixel_ratio)
         self.confirmation_frames.setValue(self.config.confirmation_frames)
+        self.bite_detector.setCurrentIndex(max(0, self.bite_detector.findData(self.config.bite_detector)))
+        self.adaptive_sigma.setValue(self.config.adaptive_sigma)
+        self.flow_displacement.setValue(self.config.flow_displacement)
+        self.bite_source.setCurrentIndex(max(0, self.bite_source.findData(self.config.bite_source)))
+        self.audio_reference.setText(self.config.audio_reference)
+        self.audio_threshold.setValue(self.config.audio_threshold)
+        self.bobber_locator.setCurrentIndex(max(0, self.bobber_locator.findData(self.config.bobber_locator)))
+        self.pyramid_levels.setValue(self.config.pyramid_levels)
+        self.pyramid_candidates.setValue(self.config.pyramid_candidates)
+        self.instrumentation.setChecked(self.config.instrumentation)
         self._refresh_images()
 
     def _read_config(self) -> AppConfig:
-        config = AppConfig(
+        # Start from the current config so settings without a widget survive.
+        config = replace(
+            self.config,
             image_paths=list(self.config.image_paths),
             language=self.language.currentData() or "zh_CN",
             fishing_hotkey=self.fishing_hotkey.text().strip(),
@@ -253,12 +396,23 @@ class FishingAssistantWindow(QMainWindow):
             difference_threshold=self.mean_difference.value(),
             confidence_threshold=self.confidence.value(),
             game_window_title=self.game_window_title.text().strip(),
+            multi_client=self.multi_client.isChecked(),
             afk_time_min=self.afk_min.value(),
             afk_time_max=self.afk_max.value(),
             afk_key=self.afk_key.text().strip(),
             changed_pixel_threshold=self.pixel_threshold.value(),
             changed_pixel_ratio=self.pixel_ratio.value(),
             confirmation_frames=self.confirmation_frames.value(),
+            bite_detector=self.bite_detector.currentData() or "diff",
+            adaptive_sigma=self.adaptive_sigma.value(),
+            flow_displacement=self.flow_displacement.value(),
+            bite_source=self.bite_source.currentData() or "visual",
+            audio_reference=self.audio_reference.text().strip(),
+            audio_threshold=self.audio_threshold.value(),
+            bobber_locator=self.bobber_locator.currentData() or "template",
+            pyramid_levels=self.pyramid_levels.value(),
+            pyramid_candidates=self.pyramid_candidates.value(),
+            instrumentation=self.instrumentation.isChecked(),
         )
         config.normalize()
         return config
@@ -272,11 +426,19 @@ class FishingAssistantWindow(QMainWindow):
                 self.config.image_paths.append(path)
         self._refresh_images()
         self._save()
+        self._push_config()
+
+    def browse_audio_reference(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, self._t("audio_reference"), "", self._t("audio_filter"))
+        if path:
+            self.audio_reference.setText(path)
+            self._save()
 
     def clear_images(self) -> None:
         self.config.image_paths.clear()
         self._refresh_images()
         self._save()
+        self._push_config()
 
     def _refresh_images(self) -> None:
         self.image_list.clear()
@@ -286,8 +448,85 @@ class FishingAssistantWindow(QMainWindow):
         self.image_list.addItems([os.path.basename(path) for path in self.config.image_paths])
 
     def log(self, message: str) -> None:
-        self.log_output.append(f"[{time.strftime('%H:%M:%S')}] {message}")
-        self.status.setText(message)
+        self._show_log([(time.time(), message)])
+
+    def _show_log(self, entries: list[tuple[float, str]]) -> None:
+        self.log_output.appendPlainText("\n".join(
+            f"[{time.strftime('%H:%M:%S', time.localtime(timestamp))}] {message}"
+            for timestamp, message in entries
+        ))
+        self.status.setText(entries[-1][1])
+        if self._log_file:
+            for _, message in entries:
+                self._log_file.info(message)
+
+    def _drain_log(self, limit: Optional[int] = LOG_DRAIN_BATCH) -> None:
+        if not self.worker:
+            return
+        events = self.worker.drain(limit)
+        if events:
+            self._show_log([(event.timestamp, event.message(self.config.language)) for event in events])
+
+    def _refresh_performance(self) -> None:
+        if not self.worker:
+            return
+        snapshot = self.worker.instrumentation.snapshot()
+        gauges = snapshot["gauges"]
+        self.achieved_fps.setText(self._t(
+            "perf_fps", search=gauges.get("search_fps", 0.0), bite=gauges.get("bite_fps", 0.0)
+        ))
+        self.cycle_rate.setText(self._t(
+            "perf_cycle", casts_per_hour=gauges.get("casts_per_hour", 0.0), idle=gauges.get("idle_ratio", 0.0)
+        ))
+        stages = snapshot["stages"]
+        self.performance_table.setRowCount(len(stages))
+        for row, (name, stats) in enumerate(sorted(stages.items())):
+            cells = [self._t(f"stage_{name}"), str(stats["count"])]
+            cells += [f"{stats[column]:.2f}" for column in PERCENTILE_COLUMNS]
+            for column, value in enumerate(cells):
+                self.performance_table.setItem(row, column, QTableWidgetItem(value))
+        self._refresh_sessions()
+
+    def _refresh_sessions(self) -> None:
+        engines = self.worker.engines
+        self.sessions_table.setRowCount(len(engines))
+        for row, (label, engine) in enumerate(engines):
+            cells = [label, self._t(f"state_{engine.state}"), str(engine.casts), str(engine.catches)]
+            for column, value in enumerate(cells):
+                self.sessions_table.setItem(row, column, QTableWidgetItem(value))
+
+    def _tab_changed(self, index: int) -> None:
+        if self.tabs.widget(index) is self.statistics_table.parentWidget():
+            self._refresh_statistics()
+
+    def _refresh_statistics(self) -> None:
+        database = database_path(self.config)
+        self.statistics_hint.setText(self._t("statistics_hint", path=database or "-"))
+        rows = []
+        if database is not None and database.exists():
+            try:
+                rows = [report.cells() for report in reports(database, self.statistics_by_config.isChecked())]
+            except sqlite3.Error as exc:
+                self.log(self._t("stats_failed", error=exc))
+        self.statistics_table.setRowCount(len(rows))
+        for row, cells in enumerate(rows):
+            for column, value in enumerate(cells):
+                self.statistics_table.setItem(row, column, QTableWidgetItem(value))
+        self.statistics_table.resizeColumnsToContents()
+
+    def _open_log_file(self) -> None:
+        path = data_path(self.config.log_file)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._log_file = open_log_file(
+                path,
+                self.config.log_file_max_kb * 1024,
+                self.config.log_file_backups,
+            )
+        except OSError:
+            self._log_file = None
 
     def _save(self) -> None:
         try:
@@ -296,6 +535,29 @@ class FishingAssistantWindow(QMainWindow):
         except OSError as exc:
             self.log(self._t("save_failed", error=exc))
 
+    def _connect_live_settings(self) -> None:
+        """Edits to these settings reach a running session at its next frame."""
+        for spin in (
+            self.confidence, self.mean_difference, self.pixel_threshold, self.pixel_ratio,
+            self.confirmation_frames, self.adaptive_sigma, self.flow_displacement, self.audio_threshold,
+            self.pyramid_levels, self.pyramid_candidates, self.afk_min, self.afk_max,
+        ):
+            spin.valueChanged.connect(self._settings_changed)
+        for combo in (self.bite_detector, self.bobber_locator):
+            combo.currentIndexChanged.connect(self._settings_changed)
+        for line in (self.fishing_hotkey, self.bait_hotkey, self.afk_key):
+            line.editingFinished.connect(self._settings_changed)
+
+    def _settings_changed(self) -> None:
+        if self._changing_language or not (self.worker and self.worker.isRunning()):
+            return
+        self._save()
+        self._push_config()
+
+    def _push_config(self) -> None:
+        if self.worker and self.worker.isRunning():
+            self.worker.update_config(self.config)
+
     def start_fishing(self) -> None:
         self._save()
         if not self.config.image_paths:
@@ -311,21 +573,31 @@ class FishingAssistantWindow(QMainWindow):
             self.tabs.setCurrentIndex(1)
             return
 
-        self.worker = FishingWorker(self.config, self)
-        self.worker.log_signal.connect(self.log)
+        from .worker import FishingWorker, SupervisorWorker
+
+        worker_type = SupervisorWorker if self.config.multi_client else FishingWorker
+        self.worker = worker_type(self.config, self)
         self.worker.finished.connect(self._worker_finished)
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.tabs.setCurrentIndex(3)
         self.log(self._t("started"))
         self.worker.start()
+        self.log_timer.start()
+        self.performance_timer.start()
 
     def stop_fishing(self) -> None:
         if self.worker and self.worker.isRunning():
             self.stop_button.setEnabled(False)
             self.worker.stop()
+            self.log(self._t("stop_requested"))
 
     def _worker_finished(self) -> None:
+        self.log_timer.stop()
+        self.performance_timer.stop()
+        self._drain_log(limit=None)
+        self._refresh_performance()
+        self._refresh_statistics()
         worker = self.worker
         self.worker = None
         if worker:
@@ -341,6 +613,7 @@ class FishingAssistantWindow(QMainWindow):
         if self.worker and self.worker.isRunning():
             self._closing = True
             self.worker.stop()
+            self.log(self._t("stop_requested"))
             event.ignore()
             return
         event.accept()
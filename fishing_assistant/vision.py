@@ -2,11 +2,11 @@
 
 from dataclasses import dataclass
 from pathlib import Path
+import threading
 from typing import Callable, Iterable, Optional
 
 import cv2
 import numpy as np
-import pyautogui
 
 
 LogCallback = Callable[[str], None]
@@ -16,6 +16,8 @@ LogCallback = Callable[[str], None]
 class Template:
     path: str
     gray: np.ndarray
+    scale: float = 1.0
+    angle: float = 0.0
 
     @property
     def width(self) -> int:
@@ -26,6 +28,155 @@ class Template:
         return self.gray.shape[0]
 
 
+# Variants of equal size whose mean absolute difference is below this many
+# gray levels are treated as duplicates and only the first one is kept.
+DUPLICATE_TOLERANCE = 2.0
+
+
+class TemplateBank:
+    """Template variants packed into one contiguous pixel buffer.
+
+    ``entries`` describe each variant as ``(path, offset, height, width,
+    scale, angle)``; every ``Template.gray`` is a zero-copy view into
+    ``pixels``. Pyramids for the coarse-to-fine search are built once per
+    depth and cached, and so are the ORB features of the feature search.
+    The caches are filled under a lock, so sessions can share one bank.
+    """
+
+    def __init__(self, pixels: np.ndarray, entries: Iterable[tuple[str, int, int, int, float, float]]):
+        self.pixels = pixels
+        self.entries = [tuple(entry) for entry in entries]
+        self.templates = [
+            Template(path, pixels[offset:offset + height * width].reshape(height, width), scale, angle)
+            for path, offset, height, width, scale, angle in self.entries
+        ]
+        self.sizes = np.array([(t.height, t.width) for t in self.templates], dtype=np.int32).reshape(-1, 2)
+        self._pyramids: dict[int, list[list[np.ndarray]]] = {}
+        self._features: Optional[list] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_templates(cls, templates: Iterable[Template]) -> "TemplateBank":
+        templates = list(templates)
+        pixels = np.empty(sum(t.gray.size for t in templates), dtype=np.uint8)
+        entries, offset = [], 0
+        for template in templates:
+            pixels[offset:offset + template.gray.size] = template.gray.ravel()
+            entries.append((template.path, offset, template.height, template.width, template.scale, template.angle))
+            offset += template.gray.size
+        return cls(pixels, entries)
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def __iter__(self):
+        return iter(self.templates)
+
+    def __getitem__(self, index: int) -> Template:
+        return self.templates[index]
+
+    def fitting(self, height: int, width: int) -> np.ndarray:
+        """Indices of the variants no larger than ``height`` x ``width``."""
+        return np.flatnonzero((self.sizes[:, 0] <= height) & (self.sizes[:, 1] <= width))
+
+    def pyramids(self, levels: int) -> list[list[np.ndarray]]:
+        with self._lock:
+            if levels not in self._pyramids:
+                self._pyramids[levels] = [build_pyramid(t.gray, levels) for t in self.templates]
+            return self._pyramids[levels]
+
+    def updated(self, paths: Iterable[str], decode: Callable[[list[str]], "TemplateBank"]) -> "TemplateBank":
+        """A bank for ``paths`` that reuses this bank's variants of the images it already holds.
+
+        Only the other paths are passed to ``decode``; variants of paths no
+        longer listed are dropped. Pyramids and features already built for
+        kept variants are carried over instead of being computed again.
+        """
+        paths = list(dict.fromkeys(paths))
+        order = {path: index for index, path in enumerate(paths)}
+        held = {template.path for template in self.templates}
+        added = [path for path in paths if path not in held]
+        fresh = decode(added) if added else TemplateBank.from_templates([])
+        # (bank, index) of every variant, in the order of ``paths``.
+        sources = [(self, index) for index, template in enumerate(self.templates) if template.path in order]
+        sources += [(fresh, index) for index in range(len(fresh)) if fresh[index].path in order]
+        sources.sort(key=lambda source: order[source[0][source[1]].path])
+        bank = TemplateBank.from_templates(source[index] for source, index in sources)
+        # Sessions may still be filling this bank's caches.
+        with self._lock:
+            cached = {self: dict(self._pyramids), fresh: fresh._pyramids}
+            held_features = self._features
+        for levels in cached[self].keys() | cached[fresh].keys():
+            bank._pyramids[levels] = [
+                cached[source][levels][index] if levels in cached[source] else build_pyramid(source[index].gray, levels)
+                for source, index in sources
+            ]
+        if held_features is not None or fresh._features is not None:
+            held = (held_features or []) + (fresh._features or [])
+            computed = {template.path: features for template, features in held}
+            from .features import originals, template_features
+
+            bank._features = [
+                (template, computed.get(template.path) or template_features(template.gray))
+                for template in originals(bank.templates)
+            ]
+        return bank
+
+    def features(self) -> list:
+        """``(template, TemplateFeatures)`` for the first variant of each image."""
+        with self._lock:
+            if self._features is None:
+                from .features import originals, template_features
+
+                self._features = [(t, template_features(t.gray)) for t in originals(self.templates)]
+            return self._features
+
+
+def template_variants(
+    template: Template,
+    scales: Iterable[float] = (1.0,),
+    angles: Iterable[float] = (),
+) -> list[Template]:
+    """Scaled and rotated copies of ``template``; the unrotated variant always comes first.
+
+    Scaled copies smaller than ``MIN_PYRAMID_SIZE`` are left out, but the
+    unscaled image never is, and it stands in for ``scales`` when every
+    scaled copy would be too small, so no readable template is lost.
+    """
+    variants = []
+    for scale in scales:
+        if scale == 1.0:
+            scaled = template.gray
+        else:
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            scaled = cv2.resize(template.gray, None, fx=scale, fy=scale, interpolation=interpolation)
+            if min(scaled.shape[:2]) < MIN_PYRAMID_SIZE:
+                continue
+        variants.append(Template(template.path, scaled, scale))
+        height, width = scaled.shape[:2]
+        for angle in angles:
+            if angle % 360 == 0:
+                continue
+            rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+            rotated = cv2.warpAffine(scaled, rotation, (width, height), borderMode=cv2.BORDER_REPLICATE)
+            variants.append(Template(template.path, rotated, scale, angle))
+    if not variants:
+        variants.append(Template(template.path, template.gray))
+    return variants
+
+
+def deduplicate(templates: Iterable[Template], tolerance: float = DUPLICATE_TOLERANCE) -> list[Template]:
+    kept: list[Template] = []
+    by_shape: dict[tuple[int, int], list[np.ndarray]] = {}
+    for template in templates:
+        same_shape = by_shape.setdefault(template.gray.shape, [])
+        if any(cv2.norm(template.gray, other, cv2.NORM_L1) / template.gray.size < tolerance for other in same_shape):
+            continue
+        same_shape.append(template.gray)
+        kept.append(template)
+    return kept
+
+
 @dataclass(frozen=True)
 class Match:
     template_path: str
@@ -42,68 +193,186 @@ class ChangeMetrics:
     changed_ratio: float
 
 
+def read_template(path: str) -> Optional[np.ndarray]:
+    # np.fromfile + imdecode supports Chinese and other Unicode paths on Windows.
+    try:
+        data = np.fromfile(path, dtype=np.uint8)
+        image = cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
+    except (OSError, ValueError):
+        return None
+    if image is None or image.size == 0:
+        return None
+    return image
+
+
 def load_templates(
     paths: Iterable[str],
     log: Optional[LogCallback] = None,
     unreadable_message: str = "⚠ 无法读取模板：{name}",
-) -> list[Template]:
-    templates: list[Template] = []
+    scales: Iterable[float] = (1.0,),
+    angles: Iterable[float] = (),
+    pyramid_levels: int = 0,
+    features: bool = False,
+) -> TemplateBank:
+    """Decode templates once and expand them into a deduplicated bank.
+
+    ``pyramid_levels`` and ``features`` precompute what the pyramid and the
+    feature search need.
+    """
+    scales, angles = list(scales), list(angles)
+    variants: list[Template] = []
     for path in paths:
-        # np.fromfile + imdecode supports Chinese and other Unicode paths on Windows.
-        try:
-            data = np.fromfile(path, dtype=np.uint8)
-            image = cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
-        except (OSError, ValueError):
-            image = None
-        if image is None or image.size == 0:
+        image = read_template(path)
+        if image is None:
             if log:
                 log(unreadable_message.format(name=Path(path).name))
             continue
-        templates.append(Template(path, image))
-    return templates
+        variants.extend(template_variants(Template(path, image), scales, angles))
+    bank = TemplateBank.from_templates(deduplicate(variants))
+    if pyramid_levels:
+        bank.pyramids(pyramid_levels)
+    if features:
+        bank.features()
+    return bank
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """Return ``image`` as single-channel gray; gray input is returned as is."""
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
 
+# Coarse templates smaller than this lose too much structure to be matched.
+MIN_PYRAMID_SIZE = 8
 
-def screenshot_bgr(region: Optional[tuple[int, int, int, int]] = None) -> np.ndarray:
-    screenshot = pyautogui.screenshot(region=region)
-    return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
+
+def build_pyramid(gray: np.ndarray, levels: int) -> list[np.ndarray]:
+    """Return ``[gray, gray/2, gray/4, ...]`` with ``levels`` reductions."""
+    pyramid = [gray]
+    for _ in range(levels):
+        if min(pyramid[-1].shape[:2]) < 2 * MIN_PYRAMID_SIZE:
+            break
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def _top_locations(result: np.ndarray, count: int, radius: tuple[int, int]) -> list[tuple[int, int]]:
+    """Best ``count`` peaks of a match result, suppressing each peak's neighbourhood."""
+    locations = []
+    for _ in range(count):
+        _, confidence, _, (x, y) = cv2.minMaxLoc(result)
+        if confidence <= -1:
+            break
+        locations.append((x, y))
+        result[max(0, y - radius[1]):y + radius[1] + 1, max(0, x - radius[0]):x + radius[0] + 1] = -1
+    return locations
+
+
+def match_template(
+    screen_pyramid: list[np.ndarray],
+    template_pyramid: list[np.ndarray],
+    candidates: int = 3,
+) -> tuple[float, tuple[int, int]]:
+    """Best TM_CCOEFF_NORMED confidence and full-resolution location.
+
+    With more than one usable level, the deepest level shared by screen and
+    template is searched first and only windows around its best
+    ``candidates`` peaks are re-matched at full resolution, so the reported
+    confidence is always a full-resolution score.
+    """
+    screen, template = screen_pyramid[0], template_pyramid[0]
+    level = min(len(screen_pyramid), len(template_pyramid)) - 1
+    if level == 0:
+        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, location = cv2.minMaxLoc(result)
+        return float(confidence), location
+
+    coarse_template = template_pyramid[level]
+    coarse = cv2.matchTemplate(screen_pyramid[level], coarse_template, cv2.TM_CCOEFF_NORMED)
+    radius = (coarse_template.shape[1] // 2, coarse_template.shape[0] // 2)
+    scale = 1 << level
+    margin = 2 * scale
+    height, width = template.shape[:2]
+    best_confidence, best_location = -1.0, (0, 0)
+    for x, y in _top_locations(coarse, max(1, candidates), radius):
+        left = min(max(0, x * scale - margin), screen.shape[1] - width)
+        top = min(max(0, y * scale - margin), screen.shape[0] - height)
+        right = min(screen.shape[1], x * scale + width + margin)
+        bottom = min(screen.shape[0], y * scale + height + margin)
+        result = cv2.matchTemplate(screen[top:bottom, left:right], template, cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, (dx, dy) = cv2.minMaxLoc(result)
+        if confidence > best_confidence:
+            best_confidence, best_location = float(confidence), (left + dx, top + dy)
+    return best_confidence, best_location
+
+
+def fitting_templates(
+    templates: Iterable[Template],
+    screen_gray: np.ndarray,
+    levels: int,
+) -> list[tuple[Template, list[np.ndarray]]]:
+    """Templates that fit inside the screen, each paired with its pyramid."""
+    height, width = screen_gray.shape[:2]
+    if isinstance(templates, TemplateBank):
+        pyramids = templates.pyramids(levels)
+        return [(templates[i], pyramids[i]) for i in templates.fitting(height, width)]
+    return [
+        (template, build_pyramid(template.gray, levels))
+        for template in templates
+        if template.height <= height and template.width <= width
+    ]
+
+
+def to_match(template: Template, confidence: float, location: tuple[int, int], origin: tuple[int, int]) -> Match:
+    return Match(
+        template.path,
+        origin[0] + location[0],
+        origin[1] + location[1],
+        template.width,
+        template.height,
+        float(confidence),
+    )
 
 
 def find_best_match(
-    screenshot: np.ndarray,
+    screen: np.ndarray,
     templates: Iterable[Template],
     confidence_threshold: float,
     origin: tuple[int, int] = (0, 0),
+    pyramid_levels: int = 0,
+    pyramid_candidates: int = 3,
+    certain_confidence: float = 1.0,
 ) -> Optional[Match]:
-    screen_gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
+    """Best template match above the threshold.
+
+    ``pyramid_levels`` > 0 enables the coarse-to-fine search of
+    :func:`match_template`; 0 keeps the exhaustive full-resolution search.
+    The remaining templates are skipped once a match reaches
+    ``certain_confidence``.
+    """
+    screen_gray = to_gray(screen)
+    screen_pyramid = build_pyramid(screen_gray, pyramid_levels)
     best: Optional[Match] = None
-    for template in templates:
-        if template.height > screen_gray.shape[0] or template.width > screen_gray.shape[1]:
-            continue
-        result = cv2.matchTemplate(screen_gray, template.gray, cv2.TM_CCOEFF_NORMED)
-        _, confidence, _, location = cv2.minMaxLoc(result)
+    for template, template_pyramid in fitting_templates(templates, screen_gray, len(screen_pyramid) - 1):
+        confidence, location = match_template(screen_pyramid, template_pyramid, pyramid_candidates)
         if confidence >= confidence_threshold and (best is None or confidence > best.confidence):
-            best = Match(
-                template.path,
-                origin[0] + location[0],
-                origin[1] + location[1],
-                template.width,
-                template.height,
-                float(confidence),
-            )
+            best = to_match(template, confidence, location, origin)
+            if confidence >= certain_confidence:
+                break
     return best
 
 
 def prepare_gray(image: np.ndarray) -> np.ndarray:
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    return cv2.GaussianBlur(gray, (5, 5), 0)
+    return cv2.GaussianBlur(to_gray(image), (5, 5), 0)
 
 
 def calculate_change(
     baseline_gray: np.ndarray,
-    current_bgr: np.ndarray,
+    current: np.ndarray,
     pixel_threshold: int,
 ) -> ChangeMetrics:
-    current_gray = prepare_gray(current_bgr)
+    current_gray = prepare_gray(current)
     if baseline_gray.shape != current_gray.shape:
         return ChangeMetrics(0.0, 0.0)
     difference = cv2.absdiff(baseline_gray, current_gray)
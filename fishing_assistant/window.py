@@ -0,0 +1,71 @@
+"""The game window's client area, re-activated only when it changed."""
+
+from typing import Optional
+
+from .capture import Region
+
+
+class WindowProvider:
+    """Finds the game window and keeps it ready for input.
+
+    ``acquire`` returns the client area in screen pixels, or None when
+    there is no usable window, and whether the window was just brought to
+    the foreground and so needs a moment before it accepts input.
+    """
+
+    def acquire(self) -> tuple[Optional[Region], bool]:
+        raise NotImplementedError
+
+
+class FixedWindow(WindowProvider):
+    """A window that never moves and always has focus, for replays and tests."""
+
+    def __init__(self, region: Region):
+        self.region = region
+
+    def acquire(self) -> tuple[Optional[Region], bool]:
+        return self.region, False
+
+
+class CachedWindow(WindowProvider):
+    """A backend window whose handle and client area are kept between casts.
+
+    Each ``acquire`` only checks that the handle is still a window, that it
+    still has focus and that its client area is unchanged, which costs a
+    few cheap calls. The window is looked up again when it disappeared,
+    and activated and measured again when it moved, resized or lost focus.
+    A ``handle`` binds the provider to one window, which is never replaced
+    by another window with the same title. With ``activate`` false focus is
+    left to the caller and only the geometry is tracked.
+    """
+
+    def __init__(self, backend, title: str, handle: Optional[int] = None, activate: bool = True):
+        self.backend = backend
+        self.title = title
+        self.handle = handle
+        self.bound = handle is not None
+        self.activate = activate
+        self.region: Optional[Region] = None
+        self.activations = 0
+        self.reuses = 0
+
+    def acquire(self) -> tuple[Optional[Region], bool]:
+        if self.handle is None or not self.backend.is_window(self.handle):
+            self.region = None
+            if self.bound:
+                return None, False
+            self.handle = self.backend.find_window(self.title)
+            if self.handle is None:
+                return None, False
+
+        region = self.backend.client_region(self.handle)
+        focused = not self.activate or self.backend.foreground_window() == self.handle
+        if region is not None and region == self.region and focused:
+            self.reuses += 1
+            return region, False
+        if self.activate:
+            # Restores a minimized window, whose client area reads as None.
+            region = self.backend.activate_handle(self.handle)
+            self.activations += 1
+        self.region = region
+        return region, self.activate and region is not None
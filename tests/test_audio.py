@@ -0,0 +1,132 @@
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from fishing_assistant.audio import (
+    ArrayAudioSource,
+    AudioBiteDetector,
+    AudioListener,
+    AudioRing,
+    read_wav,
+    resample,
+)
+
+RATE = 8000
+
+
+def splash(seconds: float = 0.4, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    at = np.arange(int(seconds * RATE)) / RATE
+    return (0.5 * rng.normal(0, 1, len(at)) * np.exp(-at * 10)).astype(np.float32)
+
+
+def stream(seconds: float, splashes: list[float], seed: int = 1) -> np.ndarray:
+    """Background noise with the reference splash added at ``splashes`` seconds."""
+    samples = np.random.default_rng(seed).normal(0, 0.05, int(seconds * RATE)).astype(np.float32)
+    clip = splash()
+    for at in splashes:
+        start = int(at * RATE)
+        samples[start:start + len(clip)] += clip[:len(samples) - start]
+    return samples
+
+
+class AudioRingTests(unittest.TestCase):
+    def test_latest_samples_come_out_in_order_across_the_wrap(self):
+        ring = AudioRing(5)
+        out = np.empty(5)
+        ring.extend(np.array([1.0, 2.0]))
+        self.assertEqual(ring.latest(4, out).tolist(), [0.0, 0.0, 1.0, 2.0])
+        ring.extend(np.array([3.0, 4.0, 5.0, 6.0]))
+        self.assertEqual(ring.latest(5, out).tolist(), [2.0, 3.0, 4.0, 5.0, 6.0])
+        ring.extend(np.arange(7.0, 15.0))
+        self.assertEqual(ring.latest(3, out).tolist(), [12.0, 13.0, 14.0])
+
+
+class AudioBiteDetectorTests(unittest.TestCase):
+    def feed(self, detector, samples, block):
+        detections = []
+        for start in range(0, len(samples), block):
+            detections.extend(detector.feed(samples[start:start + block]))
+        return detections
+
+    def test_splashes_are_reported_once_with_their_start_time(self):
+        samples = stream(6.0, [1.0, 3.7])
+        for block in (128, 1000, 9000):
+            detector = AudioBiteDetector(splash(), RATE, max_block=1024)
+            detections = self.feed(detector, samples, block)
+            self.assertEqual([round(detection.at, 2) for detection in detections], [1.0, 3.7])
+            self.assertTrue(all(detection.score > 0.9 for detection in detections))
+
+    def test_noise_and_other_sounds_are_ignored_at_any_volume(self):
+        samples = stream(4.0, [])
+        samples[RATE:RATE + 2000] += 0.8 * np.sin(np.arange(2000) * 0.3)
+        samples[2 * RATE:2 * RATE + 3000] += splash(seed=5)[:3000]
+        detector = AudioBiteDetector(splash(), RATE)
+        self.assertEqual(self.feed(detector, samples * 10, 512), [])
+        self.assertEqual(self.feed(detector, np.zeros(RATE, dtype=np.float32), 512), [])
+
+    def test_reset_ignores_audio_heard_before(self):
+        samples = stream(2.0, [0.5])
+        detector = AudioBiteDetector(splash(), RATE)
+        self.feed(detector, samples[:int(0.6 * RATE)], 256)
+        detector.reset()
+        self.assertEqual(self.feed(detector, samples[int(0.6 * RATE):], 256), [])
+
+    def test_silent_reference_is_rejected(self):
+        with self.assertRaises(ValueError):
+            AudioBiteDetector(np.zeros(100, dtype=np.float32), RATE)
+
+
+class AudioSourceTests(unittest.TestCase):
+    def test_wav_file_is_read_as_mono_floats(self):
+        left = (np.arange(100) * 300 - 15000).astype("<i2")
+        right = np.zeros(100, dtype="<i2")
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "splash.wav"
+            with wave.open(str(path), "wb") as writer:
+                writer.setnchannels(2)
+                writer.setsampwidth(2)
+                writer.setframerate(RATE)
+                writer.writeframes(np.column_stack((left, right)).tobytes())
+            samples, rate = read_wav(path)
+            source = ArrayAudioSource.from_wav(path, block=10, clock=lambda: 1.0)
+        self.assertEqual(rate, RATE)
+        np.testing.assert_allclose(samples, left / 65536, atol=1e-6)
+        self.assertEqual(source.sample_rate, RATE)
+
+    def test_unreadable_wav_is_a_value_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "splash.wav"
+            path.write_bytes(b"not a wav file")
+            with self.assertRaises(ValueError):
+                read_wav(path)
+
+    def test_resampling_keeps_duration(self):
+        self.assertEqual(len(resample(splash(), RATE, 2 * RATE)), 2 * len(splash()))
+
+    def test_blocks_arrive_as_the_clock_passes_them(self):
+        now = [0.0]
+        source = ArrayAudioSource(np.arange(RATE, dtype=np.float32), RATE, block=1000, clock=lambda: now[0])
+        self.assertEqual(source.read(), [])
+        source.start()
+        now[0] = 0.3
+        self.assertEqual([block[0] for block in source.read()], [0.0, 1000.0])
+        now[0] = 5.0
+        self.assertEqual(len(source.read()), 6)
+
+    def test_listener_drops_audio_heard_before_reset(self):
+        now = [0.0]
+        source = ArrayAudioSource(stream(3.0, [0.2, 2.0]), RATE, clock=lambda: now[0])
+        listener = AudioListener(source, AudioBiteDetector(splash(), RATE))
+        listener.start()
+        now[0] = 1.0
+        listener.reset()
+        now[0] = 3.0
+        self.assertEqual([round(detection.at, 1) for detection in listener.poll()], [2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
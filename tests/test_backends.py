@@ -0,0 +1,27 @@
+import importlib.util
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from fishing_assistant import backends
+
+
+class BackendTests(unittest.TestCase):
+    def test_unsupported_platform_raises(self):
+        with mock.patch.object(backends, "_backend", None), mock.patch.object(sys, "platform", "plan9"):
+            with self.assertRaises(backends.BackendUnavailable):
+                backends.load_backend()
+
+    @unittest.skipUnless(importlib.util.find_spec("PyQt5"), "PyQt5 is not installed")
+    def test_ui_import_defers_vision_and_automation(self):
+        probe = (
+            "import sys, fishing_assistant.ui; "
+            "print(sorted(m for m in ('cv2', 'fishing_assistant.worker', 'pyautogui') if m in sys.modules))"
+        )
+        output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from fishing_assistant.bite import (
+    AdaptiveBiteDetector,
+    BiteDetector,
+    FlowBiteDetector,
+    RunningStats,
+    create_bite_detector,
+)
+from fishing_assistant.config import AppConfig
+from fishing_assistant.vision import calculate_change, prepare_gray
+
+
+class BiteDetectorTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.baseline = rng.integers(0, 256, (30, 40), dtype=np.uint8)
+        self.frame = rng.integers(0, 256, (30, 40), dtype=np.uint8)
+        self.detector = BiteDetector(20, 12.0, 0.08, 2)
+        self.detector.reset(self.baseline)
+
+    def test_metrics_match_stateless_calculation(self):
+        for threshold in (1, 20, 200):
+            self.detector.pixel_threshold = threshold
+            expected = calculate_change(prepare_gray(self.baseline), self.frame, threshold)
+            metrics = self.detector.measure(self.frame)
+            self.assertAlmostEqual(metrics.mean_difference, expected.mean_difference, places=6)
+            self.assertAlmostEqual(metrics.changed_ratio, expected.changed_ratio, places=6)
+
+    def test_bite_needs_consecutive_changed_frames(self):
+        changed = 255 - self.baseline
+        self.assertFalse(self.detector.update(changed))
+        self.assertFalse(self.detector.update(self.baseline))
+        self.assertFalse(self.detector.update(changed))
+        self.assertTrue(self.detector.update(changed))
+
+    def test_buffers_are_reused_for_same_patch_size(self):
+        buffer = self.detector._difference
+        self.detector.reset(self.frame)
+        self.detector.measure(self.baseline)
+        self.assertIs(self.detector._difference, buffer)
+        self.assertEqual(self.detector.consecutive, 0)
+
+    def test_mismatched_frame_reports_no_change(self):
+        metrics = self.detector.measure(np.zeros((5, 5), dtype=np.uint8))
+        self.assertEqual((metrics.mean_difference, metrics.changed_ratio), (0.0, 0.0))
+
+
+class AdaptiveBiteDetectorTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(1)
+        self.baseline = np.full((30, 40), 100, dtype=np.uint8)
+        self.detector = AdaptiveBiteDetector(20, 50.0, 0.5, 2, learning_frames=10, sigma=4.0)
+        self.detector.reset(self.baseline)
+
+    def noisy(self, amplitude):
+        noise = self.rng.integers(-amplitude, amplitude + 1, self.baseline.shape)
+        return np.clip(self.baseline.astype(int) + noise, 0, 255).astype(np.uint8)
+
+    def test_running_stats_match_numpy(self):
+        values = self.rng.normal(5, 2, 200)
+        stats = RunningStats()
+        for value in values:
+            stats.update(value)
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.variance, values.var(ddof=1))
+
+    def test_water_noise_is_learned_and_ignored(self):
+        for _ in range(60):
+            self.assertFalse(self.detector.update(self.noisy(30)))
+        self.assertFalse(self.detector.learning)
+
+    def test_deviation_below_fixed_thresholds_fires_after_learning(self):
+        for _ in range(10):
+            self.detector.update(self.noisy(4))
+        bite = self.noisy(4)
+        bite[5:25, 10:30] = 160
+        self.assertFalse(self.detector.update(bite))
+        self.assertTrue(self.detector.update(bite))
+        self.assertLess(self.detector.metrics.mean_difference, 50.0)
+
+    def test_early_bite_uses_fixed_thresholds(self):
+        self.assertFalse(self.detector.update(255 - self.baseline))
+        self.assertTrue(self.detector.update(255 - self.baseline))
+        self.assertEqual(self.detector.difference_stats.count, 0)
+
+    def test_config_selects_detector(self):
+        self.assertIs(type(create_bite_detector(AppConfig())), BiteDetector)
+        self.assertIs(type(create_bite_detector(AppConfig(bite_detector="adaptive"))), AdaptiveBiteDetector)
+        self.assertIs(type(create_bite_detector(AppConfig(bite_detector="flow"))), FlowBiteDetector)
+
+
+class FlowBiteDetectorTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.water = cv2.GaussianBlur(rng.integers(60, 120, (80, 64), dtype=np.uint8), (7, 7), 0)
+        self.bobber = np.full((24, 24), 40, dtype=np.uint8)
+        cv2.circle(self.bobber, (12, 12), 8, 200, -1)
+        cv2.line(self.bobber, (12, 0), (12, 23), 250, 2)
+        self.detector = FlowBiteDetector(3.0, 2)
+        self.detector.reset(self.frame(0))
+
+    def frame(self, dip, water_shift=0):
+        frame = np.roll(self.water, water_shift, axis=1)[:64].copy()
+        frame[20 + dip:44 + dip, 20:44] = self.bobber
+        return frame
+
+    def test_dip_fires_after_confirmation(self):
+        self.assertFalse(self.detector.update(self.frame(0)))
+        self.assertFalse(self.detector.update(self.frame(8)))
+        self.assertTrue(self.detector.update(self.frame(8)))
+        self.assertGreater(self.detector.offset, 6.0)
+        key, values = self.detector.log_values()
+        self.assertEqual((key, values["current"], values["required"]), ("flow_metrics", 2, 2))
+
+    def test_wobble_and_water_motion_do_not_fire(self):
+        for index in range(30):
+            self.assertFalse(self.detector.update(self.frame(index % 2, water_shift=index % 5)))
+        self.assertLess(abs(self.detector.offset), 3.0)
+
+    def test_mismatched_frame_is_ignored(self):
+        self.assertFalse(self.detector.update(np.zeros((5, 5), dtype=np.uint8)))
+        self.assertEqual(self.detector.consecutive, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
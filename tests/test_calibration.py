@@ -0,0 +1,179 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from fishing_assistant.__main__ import main
+from fishing_assistant.bite import BiteDetector
+from fishing_assistant.calibration import (
+    apply_settings, choose, evaluate, first_reels, load_clips, measure_clip,
+)
+from fishing_assistant.config import AppConfig, load_config, save_config
+from fishing_assistant.recording import FrameRecorder
+from fishing_assistant.vision import Template
+
+
+BOBBER = (40, 30, 24, 24)
+
+
+def sprite(size=24):
+    image = np.full((size, size), 60, dtype=np.uint8)
+    cv2.circle(image, (size // 2, size // 2), size // 3, 200, -1)
+    cv2.line(image, (size // 2, 1), (size // 2, size - 2), 250, 2)
+    return image
+
+
+def cast_frames(seed, bite_frame=12, count=20, noise=6, appear=2):
+    """Water frames, the bobber from ``appear`` on, dipping from ``bite_frame``."""
+    rng = np.random.default_rng(seed)
+    x, y, width, height = BOBBER
+    frames = []
+    for index in range(count):
+        frame = np.full((96, 128), 90, dtype=np.uint8)
+        frame = cv2.add(frame, rng.integers(0, noise + 1, frame.shape, dtype=np.uint8))
+        if index >= appear:
+            dip = 8 if bite_frame is not None and index >= bite_frame else 0
+            frame[y + dip:y + dip + height, x:x + width] = sprite()
+        frames.append(frame)
+    return frames
+
+
+def record_clip(directory, frames, labels, fps=10.0):
+    recorder = FrameRecorder(directory, (0, 0, frames[0].shape[1], frames[0].shape[0]), chunk_frames=8)
+    recorder.labels = labels
+    for index, frame in enumerate(frames):
+        recorder.add(frame, index / fps)
+    recorder.close()
+
+
+def first_detection(frames, settings):
+    detector = BiteDetector(
+        settings["changed_pixel_threshold"], settings["difference_threshold"],
+        settings["changed_pixel_ratio"], settings["confirmation_frames"],
+    )
+    detector.reset(frames[0])
+    for index, frame in enumerate(frames[1:]):
+        if detector.update(frame):
+            return index
+    return -1
+
+
+class CalibrationTests(unittest.TestCase):
+    def patches(self, frames):
+        x, y, width, height = BOBBER
+        return [frame[y:y + height, x:x + width] for frame in frames]
+
+    def test_measurements_match_the_bite_detector(self):
+        frames = cast_frames(1)[2:]
+        clip = measure_clip("cast", frames, np.arange(len(frames)) / 10, 10, bobber=BOBBER)
+        detector = BiteDetector(20, 0.0, 0.0, 1)
+        detector.reset(self.patches(frames)[0])
+        for index, patch in enumerate(self.patches(frames)[1:]):
+            metrics = detector.measure(patch)
+            self.assertAlmostEqual(clip.means[index], metrics.mean_difference, places=6)
+            self.assertAlmostEqual(clip.ratios[index, 20], metrics.changed_ratio, places=6)
+        self.assertEqual(clip.bite, 9)
+
+    def test_vectorized_reels_match_the_detector_frame_by_frame(self):
+        frames = cast_frames(2, noise=40)[2:]
+        clip = measure_clip("cast", frames, np.arange(len(frames)) / 10, 10, bobber=BOBBER)
+        differences = np.array([2.0, 6.0, 15.0])
+        ratios = np.array([0.02, 0.1, 0.3])
+        confirmations = np.array([1, 2, 3])
+        for pixel in (5, 20, 40):
+            measurements = [(clip.means, clip.ratios[:, pixel])]
+            fired = first_reels(measurements, differences, ratios, confirmations)[0]
+            for c, confirmation in enumerate(confirmations):
+                for d, difference in enumerate(differences):
+                    for r, ratio in enumerate(ratios):
+                        settings = dict(
+                            changed_pixel_threshold=pixel, difference_threshold=difference,
+                            changed_pixel_ratio=ratio, confirmation_frames=confirmation,
+                        )
+                        expected = first_detection(self.patches(frames), settings)
+                        self.assertEqual(fired[c, d, r], expected, settings)
+
+    def test_pareto_front_trades_false_reels_for_latency(self):
+        clips = [
+            measure_clip(f"cast{seed}", frames[2:], np.arange(18) / 10, 10, bobber=BOBBER)
+            for seed in range(4)
+            for frames in [cast_frames(seed, noise=30)]
+        ]
+        evaluation = evaluate(clips, workers=1)
+        self.assertNotIn("confidence_threshold", evaluation.parameters)
+        front = evaluation.pareto_front()
+        self.assertEqual(front[0].false_reels, 0)
+        self.assertEqual(front[0].misses, 0)
+        for better, worse in zip(front, front[1:]):
+            self.assertLess(better.false_reels, worse.false_reels)
+            self.assertGreater(better.latency, worse.latency)
+        for candidate in front:
+            dominated = (
+                (evaluation.false_reels <= candidate.false_reels)
+                & (evaluation.latency < candidate.latency - 1e-9)
+            )
+            self.assertFalse(dominated.any())
+        chosen = choose(front)
+        self.assertEqual(chosen, front[0])
+        config = apply_settings(AppConfig(image_paths=["bobber.png"]), chosen)
+        self.assertEqual(config.confirmation_frames, chosen.settings["confirmation_frames"])
+        self.assertEqual(config.image_paths, ["bobber.png"])
+
+    def test_process_pool_matches_inline_evaluation(self):
+        clips = [measure_clip("cast", cast_frames(3, noise=30)[2:], np.arange(18) / 10, 10, bobber=BOBBER)]
+        grid = dict(
+            difference_threshold=[2.0, 8.0], changed_pixel_threshold=[10, 20, 30],
+            changed_pixel_ratio=[0.05, 0.2], confirmation_frames=[1, 2],
+        )
+        inline, pooled = evaluate(clips, grid, workers=1), evaluate(clips, grid, workers=2)
+        np.testing.assert_array_equal(inline.false_reels, pooled.false_reels)
+        np.testing.assert_array_equal(inline.latency, pooled.latency)
+
+    def test_confidence_threshold_avoids_water_before_the_bobber_lands(self):
+        templates = [Template("bobber.png", sprite())]
+        frames = cast_frames(4, appear=4)
+        # A bobber-like glint on the water before the bobber lands.
+        frames[1][60:84, 90:114] = cv2.GaussianBlur(sprite(), (7, 7), 0)
+        clip = measure_clip(
+            "cast", frames, np.arange(20) / 10, 12, baseline_frame=4, bobber=BOBBER, templates=templates
+        )
+        self.assertGreater(clip.bobber_confidence, 0.99)
+        self.assertLess(clip.early_confidence, 0.95)
+        confidences = np.array([0.5, clip.early_confidence, 0.95, 1.01])
+        self.assertEqual(clip.locked(confidences).tolist(), [False, False, True, False])
+
+    def test_command_saves_the_chosen_settings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            cv2.imwrite(str(root / "bobber.png"), sprite())
+            config_path = root / "settings.json"
+            config = AppConfig(image_paths=[str(root / "bobber.png")], template_cache_directory="")
+            save_config(config, config_path)
+            for seed in range(3):
+                record_clip(
+                    root / "clips" / f"cast{seed}", cast_frames(seed, noise=30),
+                    {"bite_at": 1.2, "baseline_frame": 2, "bobber": list(BOBBER)},
+                )
+            clips = load_clips(root / "clips")
+            self.assertEqual([clip.bite for clip in clips], [9, 9, 9])
+            output = io.StringIO()
+            with redirect_stdout(output):
+                status = main(
+                    ["calibrate", str(root / "clips"), "--config", str(config_path), "--workers", "1"]
+                )
+            self.assertEqual(status, 0)
+            self.assertIn("*", output.getvalue())
+            saved = load_config(config_path)
+            self.assertNotEqual(
+                (saved.difference_threshold, saved.changed_pixel_ratio),
+                (AppConfig.difference_threshold, AppConfig.changed_pixel_ratio),
+            )
+            self.assertEqual(saved.image_paths, [str(root / "bobber.png")])
+
+
+if __name__ == "__main__":
+    unittest.main()
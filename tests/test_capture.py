@@ -0,0 +1,40 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from fishing_assistant.capture import ArrayFrameSource
+
+
+class ArrayFrameSourceTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frames = [rng.integers(0, 256, (60, 80, 3), dtype=np.uint8) for _ in range(2)]
+
+    def test_region_is_cropped_to_gray(self):
+        source = ArrayFrameSource(self.frames, origin=(100, 50))
+        gray = source.grab_gray((110, 60, 20, 10))
+        expected = cv2.cvtColor(self.frames[0], cv2.COLOR_BGR2GRAY)[10:20, 10:30]
+        np.testing.assert_array_equal(gray, expected)
+
+    def test_buffer_is_reused_between_grabs(self):
+        source = ArrayFrameSource(self.frames)
+        first = source.grab_gray((0, 0, 8, 8))
+        second = source.grab_gray((0, 0, 8, 8))
+        self.assertIs(first, second)
+
+    def test_out_of_frame_area_is_black(self):
+        source = ArrayFrameSource([np.full((10, 10), 200, dtype=np.uint8)])
+        gray = source.grab_gray((5, 5, 10, 10))
+        self.assertEqual(gray[:5, :5].min(), 200)
+        self.assertEqual(gray[5:, :].max(), 0)
+
+    def test_sequence_stops_on_last_frame_without_loop(self):
+        frames = [np.full((4, 4), value, dtype=np.uint8) for value in (1, 2)]
+        source = ArrayFrameSource(frames, loop=False)
+        values = [int(source.grab_gray((0, 0, 4, 4))[0, 0]) for _ in range(3)]
+        self.assertEqual(values, [1, 2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 import json
+from pathlib import Path
 import unittest
 from unittest.mock import patch
 
-from fishing_assistant.config import AppConfig, load_config, save_config
+from fishing_assistant.config import AppConfig, data_path, load_config, save_config
 from fishing_assistant.texts import EN_US, ZH_CN, text
 
 
@@ -22,6 +23,11 @@ class ConfigTests(unittest.TestCase):
         config.normalize()
         self.assertEqual(config.afk_time_max, 20)
 
+    def test_pyramid_settings_are_clamped(self):
+        config = AppConfig(pyramid_levels=9, pyramid_candidates=0)
+        config.normalize()
+        self.assertEqual((config.pyramid_levels, config.pyramid_candidates), (4, 1))
+
     def test_unicode_paths_round_trip_serialization(self):
         config = AppConfig(image_paths=[r"D:\截图\浮漂.png"])
         with patch("pathlib.Path.write_text") as write_text:
@@ -36,6 +42,14 @@ class ConfigTests(unittest.TestCase):
         ):
             self.assertEqual(load_config().language, "zh_CN")
 
+    def test_written_files_live_in_the_user_data_directory(self):
+        with patch("sys.platform", "linux"), patch.dict("os.environ", {"XDG_DATA_HOME": "/home/me/.data"}):
+            self.assertEqual(
+                data_path("fishing_stats.sqlite3"), Path("/home/me/.data/fishing_assistant/fishing_stats.sqlite3")
+            )
+            self.assertEqual(data_path("/tmp/stats.sqlite3"), Path("/tmp/stats.sqlite3"))
+            self.assertIsNone(data_path(""))
+
     def test_translation_keys_match(self):
         self.assertEqual(set(ZH_CN), set(EN_US))
         self.assertEqual(text("start", "en_US"), "Start")
@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from fishing_assistant.controls import InputQueue, RecordedControls
+from fishing_assistant.engine import Clock
+from fishing_assistant.instrumentation import Instrumentation
+
+
+class FailingControls(RecordedControls):
+    def press(self, key):
+        raise OSError("no input device")
+
+
+class InputQueueTests(unittest.TestCase):
+    def test_pointer_moves_do_not_block_the_caller(self):
+        controls = RecordedControls(Clock(), move_duration=0.25)
+        actions = InputQueue(controls)
+        started = time.perf_counter()
+        actions.move_to(10, 20)
+        actions.click()
+        self.assertLess(time.perf_counter() - started, 0.1)
+        actions.close()
+        self.assertEqual([name for _, name in controls.actions], ["move:10,20", "click"])
+
+    def test_flush_waits_for_queued_actions(self):
+        controls = RecordedControls(Clock(), move_duration=0.05)
+        actions = InputQueue(controls)
+        actions.move_to(1, 2)
+        actions.flush()
+        self.assertEqual(len(controls.actions), 1)
+        actions.close()
+
+    def test_click_latency_and_input_time_are_recorded(self):
+        instrumentation = Instrumentation()
+        controls = RecordedControls(Clock(), move_duration=0.05)
+        actions = InputQueue(controls, instrumentation)
+        actions.move_to(1, 2)
+        actions.click()
+        actions.close()
+        stages = instrumentation.snapshot()["stages"]
+        self.assertEqual(stages["input"]["count"], 2)
+        self.assertEqual(stages["bite_to_click"]["count"], 1)
+        self.assertGreaterEqual(stages["bite_to_click"]["max_ms"], 40)
+
+    def test_failures_are_reported_and_later_actions_still_run(self):
+        errors = []
+        controls = FailingControls(Clock())
+        actions = InputQueue(controls, failed=errors.append)
+        actions.press("f")
+        actions.click()
+        actions.close()
+        self.assertEqual([str(error) for error in errors], ["no input device"])
+        self.assertEqual([name for _, name in controls.actions], ["click"])
+
+
+if __name__ == "__main__":
+    unittest.main()
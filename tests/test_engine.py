@@ -0,0 +1,263 @@
+import asyncio
+from contextlib import redirect_stdout
+from dataclasses import replace
+import io
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+import wave
+
+import cv2
+import numpy as np
+
+from fishing_assistant import backends
+from fishing_assistant.__main__ import main
+from fishing_assistant.audio import ArrayAudioSource
+from fishing_assistant.capture import ArrayFrameSource
+from fishing_assistant.config import AppConfig, save_config
+from fishing_assistant.controls import RecordedControls
+from fishing_assistant.engine import Clock, FishingEngine, VirtualClock, run_async
+from fishing_assistant.recording import FrameRecorder, load_recording
+from fishing_assistant.replay import ReplayEngine, replay
+from fishing_assistant.store import reports
+from fishing_assistant.vision import Template, TemplateBank
+from fishing_assistant.window import FixedWindow
+
+from .test_audio import RATE, splash, stream
+from .test_vision import scene, sprite
+
+BITE_AT = 2.5
+
+
+def record_cast(directory: str, fps: float = 10.0, duration: float = 4.0, gone_at: float = float("inf")):
+    """Water, a bobber from 0.5 s until ``gone_at``, and a dip of the bobber at ``BITE_AT``."""
+    water, bobber = scene(160, 120), sprite()
+    recorder = FrameRecorder(directory, (0, 0, 160, 120))
+    for index in range(int(duration * fps)):
+        at = index / fps
+        frame = water.copy()
+        if 0.5 <= at < gone_at:
+            dip = 8 if at >= BITE_AT else 0
+            frame[60 + dip:92 + dip, 80:112] = bobber
+        recorder.add(frame, at)
+    recorder.close()
+    return load_recording(directory), bobber
+
+
+def session_config(**overrides) -> AppConfig:
+    values = dict(
+        fishing_hotkey="f", afk_time_min=60, afk_time_max=60, template_cache_directory="", stats_database=""
+    )
+    values.update(overrides)
+    return AppConfig(**values)
+
+
+class EngineTests(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.recording, self.bobber = record_cast(self._directory.name)
+        self.templates = [Template("bobber.png", self.bobber)]
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_replay_casts_moves_and_reels_in_after_the_bite(self):
+        result = replay(self.recording, session_config(), self.templates)
+        self.assertEqual([name for _, name in result.actions], ["press:f", "move:102,82", "click"])
+        self.assertTrue(BITE_AT <= result.first("click") < BITE_AT + 0.5)
+
+    def test_feature_locator_finds_the_same_bobber(self):
+        result = replay(self.recording, session_config(bobber_locator="features"), self.templates)
+        self.assertEqual([name for _, name in result.actions], ["press:f", "move:102,82", "click"])
+
+    def test_cast_timings_are_observed_and_stored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recording, _ = record_cast(directory, gone_at=BITE_AT + 0.8)
+            database = Path(directory) / "stats.sqlite3"
+            engine = ReplayEngine(session_config(stats_database=str(database)), recording, self.templates)
+            engine.run()
+            [report] = reports(database)
+        self.assertEqual((report.casts, report.caught), (1, 1))
+        timing = engine.timing
+        self.assertTrue(1.5 <= timing.bobber[0] < 1.8)
+        self.assertTrue(BITE_AT <= timing.bite[0] < BITE_AT + 0.5)
+        self.assertTrue(0.3 <= timing.loot[0] < 1.0)
+        self.assertIn("cycle_stats", [event.key for event in engine.events.drain()])
+
+    def test_relative_metrics_export_path_is_in_the_user_data_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = session_config(metrics_export_path="metrics.json")
+            with mock.patch.object(sys, "platform", "linux"), mock.patch.dict("os.environ", {"XDG_DATA_HOME": directory}):
+                ReplayEngine(config, self.recording, self.templates).run()
+            self.assertTrue((Path(directory) / "fishing_assistant" / "metrics.json").exists())
+
+    def test_relative_record_directory_is_in_the_user_data_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = session_config(record_directory="recordings")
+            with mock.patch.object(sys, "platform", "linux"), mock.patch.dict("os.environ", {"XDG_DATA_HOME": directory}):
+                ReplayEngine(config, self.recording, self.templates).run()
+            [recording] = (Path(directory) / "fishing_assistant" / "recordings").iterdir()
+            self.assertTrue((recording / "meta.json").exists())
+
+    def test_statistics_failures_are_logged_by_the_engine_thread(self):
+        with tempfile.TemporaryDirectory() as directory:
+            blocker = Path(directory) / "file"
+            blocker.write_text("")
+            config = session_config(stats_database=str(blocker / "stats.sqlite3"))
+            engine = ReplayEngine(config, self.recording, self.templates)
+            emit, threads = engine.events.emit, []
+
+            def recording_emit(key, **values):
+                threads.append(threading.current_thread())
+                emit(key, **values)
+
+            engine.events.emit = recording_emit
+            engine.run()
+        self.assertIn("stats_failed", [event.key for event in engine.events.drain()])
+        self.assertEqual(set(threads), {threading.main_thread()})
+
+    def test_splash_is_heard_when_listening_for_sound(self):
+        with tempfile.TemporaryDirectory() as directory:
+            reference = Path(directory) / "splash.wav"
+            with wave.open(str(reference), "wb") as writer:
+                writer.setnchannels(1)
+                writer.setsampwidth(2)
+                writer.setframerate(RATE)
+                writer.writeframes((splash() * 32767).astype("<i2").tobytes())
+            clock = VirtualClock()
+            audio = ArrayAudioSource(stream(4.0, [3.0]), RATE, block=256, clock=clock.now)
+            config = session_config(bite_source="audio", audio_reference=str(reference))
+            engine = ReplayEngine(config, self.recording, self.templates, audio=audio, clock=clock)
+            engine.run()
+        clicks = [at for at, name in engine.controls.actions if name == "click"]
+        self.assertEqual(len(clicks), 1)
+        self.assertTrue(3.0 < clicks[0] < 3.6)
+        self.assertIn("audio_bite", [event.key for event in engine.events.drain()])
+
+        fallback = ReplayEngine(session_config(bite_source="audio"), self.recording, self.templates, audio=audio)
+        fallback.run()
+        self.assertTrue(BITE_AT <= fallback.controls.actions[-1][0] < BITE_AT + 0.5)
+        self.assertIn("audio_failed", [event.key for event in fallback.events.drain()])
+
+    def run_with_update(self, engine, at, config):
+        """Drive ``engine`` like ``run`` and hand it ``config`` once the clock passes ``at``."""
+        steps = engine.steps()
+        try:
+            seconds = next(steps)
+            while True:
+                engine.clock.pause(seconds)
+                if at is not None and engine.clock.now() >= at:
+                    engine.update_config(config)
+                    at = None
+                seconds = steps.send(engine.active())
+        except StopIteration:
+            pass
+
+    def test_added_template_is_used_from_the_next_frame(self):
+        directory = Path(self._directory.name)
+        cv2.imwrite(str(directory / "bobber.png"), self.bobber)
+        cv2.imwrite(str(directory / "noise.png"), np.random.default_rng(3).integers(0, 256, (32, 32), dtype=np.uint8))
+        config = session_config(image_paths=[str(directory / "noise.png")])
+        engine = ReplayEngine(config, self.recording)
+        self.run_with_update(engine, 1.8, replace(config, image_paths=[str(directory / "bobber.png")]))
+        actions = engine.controls.actions
+        self.assertEqual([name for _, name in actions], ["press:f", "move:102,82", "click"])
+        self.assertGreaterEqual(actions[1][0], 1.8)
+        self.assertEqual([template.path for template in engine.bank], [str(directory / "bobber.png")])
+        self.assertIn("config_updated", [event.key for event in engine.events.drain()])
+
+    def test_thresholds_change_during_a_cast(self):
+        engine = ReplayEngine(session_config(difference_threshold=255.0), self.recording, self.templates)
+        self.run_with_update(engine, 2.2, session_config())
+        self.assertEqual(engine.detector.difference_threshold, AppConfig.difference_threshold)
+        self.assertEqual([name for _, name in engine.controls.actions], ["press:f", "move:102,82", "click"])
+        self.assertTrue(BITE_AT <= engine.controls.actions[-1][0] < BITE_AT + 0.5)
+
+    def test_asyncio_driver_matches_blocking_driver(self):
+        engine = ReplayEngine(session_config(), self.recording, self.templates)
+        asyncio.run(run_async(engine))
+        blocking = replay(self.recording, session_config(), self.templates)
+        self.assertEqual(
+            [name for _, name in engine.controls.actions],
+            [name for _, name in blocking.actions],
+        )
+
+    def test_stopping_during_a_pause_counts_only_the_time_waited(self):
+        engine = FishingEngine(
+            session_config(), ArrayFrameSource([scene(160, 120)]), RecordedControls(Clock()), Clock(),
+            TemplateBank.from_templates(self.templates), window=FixedWindow((0, 0, 160, 120)),
+        )
+        # The cast is followed by a 1.5 s search delay; stop half a second into it.
+        threading.Timer(0.5, engine.stop).start()
+        started = time.monotonic()
+        engine.run()
+        elapsed = time.monotonic() - started
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(engine.casts, 1)
+        self.assertTrue(0.4 <= engine.timing.idle_seconds <= elapsed)
+
+    def test_session_without_a_backend_stops_and_says_why(self):
+        engine = FishingEngine(session_config(), ArrayFrameSource([scene(160, 120)]))
+        with mock.patch.object(backends, "_backend", None), mock.patch.object(sys, "platform", "plan9"):
+            engine.run()
+            asyncio.run(run_async(engine))
+        self.assertIsInstance(engine.setup_error, backends.BackendUnavailable)
+        self.assertEqual(engine.state, "stopped")
+        self.assertEqual([event.key for event in engine.events.drain()], ["backend_unavailable"] * 2)
+
+    def test_cancelling_the_task_stops_the_session_safely(self):
+        source = ArrayFrameSource([scene(160, 120)])
+        engine = FishingEngine(
+            session_config(), source, RecordedControls(Clock()), Clock(),
+            TemplateBank.from_templates(self.templates), window=FixedWindow((0, 0, 160, 120)),
+        )
+
+        async def cancel_soon():
+            task = asyncio.create_task(run_async(engine))
+            await asyncio.sleep(2.6)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        started = time.perf_counter()
+        asyncio.run(cancel_soon())
+        self.assertLess(time.perf_counter() - started, 3.5)
+        self.assertFalse(engine.active())
+        self.assertIn("frame_stats", [event.key for event in engine.events.drain()])
+
+
+class CommandLineTests(unittest.TestCase):
+    def test_missing_settings_file_is_a_usage_error(self):
+        with self.assertRaises(SystemExit) as raised:
+            main(["run", "--config", "does-not-exist.json"])
+        self.assertEqual(raised.exception.code, 2)
+
+    def test_incomplete_settings_are_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "settings.json"
+            save_config(AppConfig(image_paths=["bobber.png"]), path)
+            self.assertEqual(main(["run", "--config", str(path)]), 2)
+
+    def test_missing_backend_is_reported_and_nothing_is_left_open(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "settings.json"
+            cv2.imwrite(str(Path(directory) / "bobber.png"), sprite())
+            save_config(AppConfig(
+                image_paths=["bobber.png"], fishing_hotkey="f", game_window_title="Game",
+                template_cache_directory="", record_directory=str(Path(directory) / "recordings"),
+            ), path)
+            output = io.StringIO()
+            with mock.patch.object(backends, "_backend", None), mock.patch.object(sys, "platform", "plan9"):
+                with redirect_stdout(output):
+                    status = main(["run", "--config", str(path)])
+            self.assertEqual(status, 1)
+            self.assertIn("plan9", output.getvalue())
+            self.assertEqual(sorted(item.name for item in Path(directory).iterdir()), ["bobber.png", "settings.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from fishing_assistant.events import LogChannel, LogEvent, open_log_file
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LogChannelTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.channel = LogChannel(metrics_interval=1.0, clock=self.clock)
+
+    def test_events_drain_in_order_and_in_batches(self):
+        for index in range(5):
+            self.channel.emit("cast", index=index)
+        self.assertEqual([e.values["index"] for e in self.channel.drain(3)], [0, 1, 2])
+        self.assertEqual([e.values["index"] for e in self.channel.drain()], [3, 4])
+        self.assertEqual(self.channel.drain(), [])
+
+    def test_metrics_are_coalesced_to_interval(self):
+        for tick in range(25):
+            self.clock.now = tick * 0.1
+            self.channel.metric("metrics", tick=tick)
+        ticks = [e.values["tick"] for e in self.channel.drain()]
+        self.assertEqual(ticks, [0, 10, 20])
+        self.assertEqual(self.channel.coalesced, 21)
+
+    def test_latest_skipped_metric_precedes_next_event(self):
+        self.channel.metric("metrics", tick=0)
+        self.clock.now = 0.3
+        self.channel.metric("metrics", tick=3)
+        self.channel.emit("bite_confirmed")
+        self.assertEqual(
+            [(e.key, e.values.get("tick")) for e in self.channel.drain()],
+            [("metrics", 0), ("metrics", 3), ("bite_confirmed", None)],
+        )
+
+    def test_event_message_uses_language(self):
+        event = LogEvent("float_found", {"confidence": 0.876})
+        self.assertEqual(event.message("en_US"), "🔍 Bobber found; confidence 0.88")
+
+
+class LogFileTests(unittest.TestCase):
+    def test_log_file_rotates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "activity.log"
+            logger = open_log_file(path, max_bytes=200, backups=2)
+            for index in range(20):
+                logger.info("message %d", index)
+            for handler in logger.handlers:
+                handler.close()
+            self.assertTrue(path.exists())
+            self.assertTrue(path.with_name("activity.log.1").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from fishing_assistant.features import FeatureMatcher, template_features
+from fishing_assistant.vision import Match, Template, TemplateBank, template_variants
+
+from .test_vision import scene
+
+
+def bobber(size=64, seed=1):
+    rng = np.random.default_rng(seed)
+    image = np.full((size, size), 50, dtype=np.uint8)
+    cv2.circle(image, (size // 2, size // 2), size // 3, 190, -1)
+    cv2.line(image, (size // 2, 2), (size // 2, size - 3), 240, 2)
+    cv2.ellipse(image, (size // 3, size // 3), (size // 6, size // 10), 30, 0, 360, 110, -1)
+    return image + rng.integers(0, 12, image.shape, dtype=np.uint8)
+
+
+def placed(image, scale, angle, x, y, seed=0):
+    """A water scene with ``image`` scaled and rotated about its centre at ``(x, y)``."""
+    frame = scene(640, 480, seed)
+    resized = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    height, width = resized.shape
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    frame[y:y + height, x:x + width] = cv2.warpAffine(
+        resized, rotation, (width, height), borderMode=cv2.BORDER_REPLICATE
+    )
+    return frame, (x + width / 2, y + height / 2)
+
+
+class FeatureMatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.bobber = bobber()
+        self.bank = TemplateBank.from_templates([Template("bobber.png", self.bobber)])
+        self.matcher = FeatureMatcher()
+
+    def assertFoundAt(self, match, centre, size):
+        self.assertIsInstance(match, Match)
+        self.assertEqual(match.template_path, "bobber.png")
+        self.assertAlmostEqual(match.x + match.width / 2, centre[0], delta=4)
+        self.assertAlmostEqual(match.y + match.height / 2, centre[1], delta=4)
+        self.assertTrue(size * 0.9 <= match.width <= size * 1.5)
+
+    def test_scaled_and_rotated_bobber_is_found(self):
+        for scale, angle in ((1.0, 0.0), (1.4, 0.0), (1.0, 30.0), (1.25, -20.0)):
+            frame, centre = placed(self.bobber, scale, angle, 300, 200)
+            match = self.matcher.find_best_match(frame, self.bank, 0.6, origin=(10, 20))
+            self.assertFoundAt(match, (centre[0] + 10, centre[1] + 20), 64 * scale)
+            self.assertGreater(match.confidence, 0.6)
+
+    def test_water_without_bobber_is_not_matched(self):
+        for seed in range(3):
+            self.assertIsNone(self.matcher.find_best_match(scene(640, 480, seed), self.bank, 0.5))
+
+    def test_plain_template_lists_are_accepted(self):
+        frame, centre = placed(self.bobber, 1.0, 0.0, 100, 60)
+        match = self.matcher.find_best_match(frame, [Template("bobber.png", self.bobber)], 0.6)
+        self.assertFoundAt(match, centre, 64)
+
+    def test_bank_features_cover_each_image_once(self):
+        variants = template_variants(Template("bobber.png", self.bobber), (1.0, 1.5), (30.0,))
+        bank = TemplateBank.from_templates(variants + [Template("other.png", bobber(seed=2))])
+        features = bank.features()
+        self.assertIs(bank.features(), features)
+        self.assertEqual([template.path for template, _ in features], ["bobber.png", "other.png"])
+        template, computed = features[0]
+        self.assertEqual((template.scale, template.angle), (1.0, 0.0))
+        self.assertGreaterEqual(len(computed.points), 10)
+        self.assertEqual(computed.descriptors.shape, (len(computed.points), 32))
+        self.assertTrue(((computed.points >= 0) & (computed.points < 64)).all())
+
+    def test_featureless_template_never_matches(self):
+        flat = Template("flat.png", np.full((40, 40), 128, dtype=np.uint8))
+        self.assertEqual(len(template_features(flat.gray).points), 0)
+        self.assertIsNone(self.matcher.find_best_match(scene(640, 480), [flat], 0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
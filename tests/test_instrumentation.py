@@ -0,0 +1,69 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fishing_assistant.instrumentation import Instrumentation, LatencyHistogram
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_percentiles_fall_in_the_observed_buckets(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(3.0)
+        for _ in range(10):
+            histogram.observe(40.0)
+        self.assertTrue(2.5 <= histogram.percentile(0.50) <= 5.0)
+        self.assertTrue(25 <= histogram.percentile(0.95) <= 40.0)
+        self.assertLessEqual(histogram.percentile(0.99), histogram.max_ms)
+        self.assertAlmostEqual(histogram.mean_ms, 6.7)
+
+    def test_empty_histogram_reports_zero(self):
+        self.assertEqual(LatencyHistogram().percentile(0.99), 0.0)
+
+
+class InstrumentationTests(unittest.TestCase):
+    def test_stage_records_one_sample_per_block(self):
+        instrumentation = Instrumentation()
+        for _ in range(3):
+            with instrumentation.stage("match"):
+                pass
+        instrumentation.gauge("search_fps", lambda: 2.5)
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot["stages"]["match"]["count"], 3)
+        self.assertEqual(snapshot["gauges"], {"search_fps": 2.5})
+
+    def test_disabled_stages_share_a_no_op_context(self):
+        instrumentation = Instrumentation(enabled=False)
+        self.assertIs(instrumentation.stage("match"), instrumentation.stage("capture"))
+        with instrumentation.stage("match"):
+            pass
+        self.assertEqual(instrumentation.snapshot()["stages"], {})
+
+    def test_export_format_follows_suffix(self):
+        instrumentation = Instrumentation()
+        instrumentation.histograms["capture"] = LatencyHistogram()
+        instrumentation.histograms["capture"].observe(1.2)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "metrics.json"
+            prom_path = Path(directory) / "metrics.prom"
+            instrumentation.export(json_path)
+            instrumentation.export(prom_path)
+            self.assertEqual(json.loads(json_path.read_text())["stages"]["capture"]["count"], 1)
+            text = prom_path.read_text()
+        self.assertIn('fishing_stage_latency_ms_bucket{stage="capture",le="2.5"} 1', text)
+        self.assertIn('fishing_stage_latency_ms_count{stage="capture"} 1', text)
+
+    def test_combined_sums_histograms_and_averages_gauges(self):
+        parts = [Instrumentation(), Instrumentation()]
+        for part, fps in zip(parts, (2.0, 4.0)):
+            with part.stage("match"):
+                pass
+            part.gauge("search_fps", lambda fps=fps: fps)
+        snapshot = Instrumentation.combined(parts).snapshot()
+        self.assertEqual(snapshot["stages"]["match"]["count"], 2)
+        self.assertEqual(snapshot["gauges"], {"search_fps": 3.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from fishing_assistant.matching import ParallelMatcher
+from fishing_assistant.vision import Template, find_best_match
+
+from tests.test_vision import scene, sprite
+
+
+class ParallelMatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.frame = scene(640, 480)
+        self.bobber = sprite()
+        self.frame[300:332, 420:452] = self.bobber
+        self.templates = [Template(f"t{seed}", sprite(seed=seed)) for seed in range(2, 5)]
+        self.templates.append(Template("bobber", self.bobber))
+        self.matcher = ParallelMatcher(4)
+
+    def tearDown(self):
+        self.matcher.close()
+
+    def test_parallel_result_equals_serial(self):
+        serial = find_best_match(self.frame, self.templates, 0.3, (5, 7))
+        parallel = self.matcher.find_best_match(self.frame, self.templates, 0.3, (5, 7))
+        self.assertEqual(parallel, serial)
+
+    def test_single_template_is_split_into_bands(self):
+        self.assertGreater(len(self.matcher._bands(480, 32, 1)), 1)
+        match = self.matcher.find_best_match(self.frame, [Template("bobber", self.bobber)], 0.9)
+        self.assertEqual((match.x, match.y), (420, 300))
+
+    def test_pyramid_search_in_parallel(self):
+        match = self.matcher.find_best_match(self.frame, self.templates, 0.9, pyramid_levels=2)
+        self.assertEqual((match.template_path, match.x, match.y), ("bobber", 420, 300))
+
+    def test_certain_match_returns_early(self):
+        match = self.matcher.find_best_match(self.frame, self.templates, 0.3, certain_confidence=0.95)
+        self.assertGreaterEqual(match.confidence, 0.95)
+        self.assertEqual((match.x, match.y), (420, 300))
+
+    def test_single_thread_runs_serially(self):
+        matcher = ParallelMatcher(1)
+        self.assertIsNone(matcher._pool)
+        self.assertEqual(matcher.find_best_match(self.frame, self.templates, 0.9).template_path, "bobber")
+
+
+if __name__ == "__main__":
+    unittest.main()
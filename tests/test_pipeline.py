@@ -0,0 +1,68 @@
+import threading
+import unittest
+
+import numpy as np
+
+from fishing_assistant.capture import ArrayFrameSource
+from fishing_assistant.pipeline import FrameRing, PipelinedFeed
+from fishing_assistant.scheduler import FrameScheduler
+
+
+class FrameRingTests(unittest.TestCase):
+    def publish(self, ring, value):
+        index = ring.acquire()
+        ring.slots[index].fill(value)
+        ring.publish(index, float(value))
+
+    def test_take_returns_newest_and_drops_older(self):
+        ring = FrameRing((2, 2), capacity=3)
+        for value in (1, 2):
+            self.publish(ring, value)
+        frame, timestamp = ring.take(0)
+        self.assertEqual((int(frame[0, 0]), timestamp), (2, 2.0))
+        self.assertEqual(ring.dropped, 1)
+
+    def test_producer_overwrites_oldest_when_full(self):
+        ring = FrameRing((1, 1), capacity=2)
+        self.publish(ring, 1)
+        held, _ = ring.take(0)
+        for value in (2, 3, 4):
+            self.publish(ring, value)
+        self.assertEqual(int(held[0, 0]), 1)
+        self.assertEqual(int(ring.take(0)[0][0, 0]), 4)
+
+    def test_close_wakes_waiting_consumer(self):
+        ring = FrameRing((1, 1))
+        threading.Timer(0.05, ring.close).start()
+        self.assertIsNone(ring.take(5))
+        self.assertTrue(ring.closed)
+
+
+class PipelinedFeedTests(unittest.TestCase):
+    def test_frames_flow_and_feed_stops(self):
+        frames = [np.full((20, 30), value, dtype=np.uint8) for value in range(5)]
+        source = ArrayFrameSource(frames, origin=(100, 100))
+        feed = PipelinedFeed(source, (100, 100, 30, 20), FrameScheduler(200), lambda: True)
+        try:
+            seen = set()
+            for _ in range(10):
+                grab = feed.next()
+                patch = grab((105, 110, 10, 5))
+                self.assertEqual(patch.shape, (5, 10))
+                seen.add(int(patch[0, 0]))
+            self.assertGreater(len(seen), 1)
+        finally:
+            feed.close()
+        self.assertTrue(feed.ring.closed)
+
+    def test_inactive_feed_returns_none(self):
+        source = ArrayFrameSource([np.zeros((4, 4), dtype=np.uint8)])
+        feed = PipelinedFeed(source, (0, 0, 4, 4), FrameScheduler(100), lambda: False)
+        try:
+            self.assertIsNone(feed.next())
+        finally:
+            feed.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
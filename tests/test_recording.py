@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from fishing_assistant.capture import ArrayFrameSource
+from fishing_assistant.recording import FrameRecorder, RecordingFrameSource, ReplayFrameSource, load_recording
+
+
+class RecordingTests(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _record(self, count: int, chunk_frames: int = 2):
+        recorder = FrameRecorder(self.directory, (10, 20, 6, 4), {"language": "en_US"}, chunk_frames=chunk_frames)
+        for index in range(count):
+            recorder.add(np.full((4, 6), index, dtype=np.uint8), index * 0.5)
+        recorder.labels["bite_at"] = 1.0
+        recorder.close()
+        return load_recording(self.directory)
+
+    def test_frames_round_trip_across_chunks(self):
+        recording = self._record(5)
+        self.assertEqual(len(recording), 5)
+        self.assertEqual(recording.region, (10, 20, 6, 4))
+        self.assertEqual([int(recording.frame(i)[0, 0]) for i in range(5)], [0, 1, 2, 3, 4])
+        self.assertEqual(recording.config["language"], "en_US")
+        self.assertEqual(recording.labels["bite_at"], 1.0)
+
+    def test_max_frames_stops_recording(self):
+        recorder = FrameRecorder(self.directory, (0, 0, 2, 2), max_frames=2)
+        for _ in range(4):
+            recorder.add(np.zeros((2, 2), dtype=np.uint8))
+        recorder.close()
+        self.assertEqual(len(load_recording(self.directory)), 2)
+
+    def test_byte_budget_stops_recording_and_passes_grabs_through(self):
+        frames = [np.full((4, 6), index, dtype=np.uint8) for index in range(5)]
+        source = RecordingFrameSource(ArrayFrameSource(frames), self.directory, max_bytes=3 * 24 + 10)
+        grabbed = [int(source.grab_gray((0, 0, 6, 4))[0, 0]) for _ in range(5)]
+        source.close()
+        self.assertEqual(grabbed, [0, 1, 2, 3, 4])
+        recording = load_recording(self.directory)
+        self.assertEqual([int(recording.frame(i)[0, 0]) for i in range(len(recording))], [0, 1, 2])
+        self.assertEqual(recording.chunks[0].shape[0], 3)
+
+    def test_replay_source_follows_clock(self):
+        recording = self._record(4)
+        now = [0.0]
+        source = ReplayFrameSource(recording, lambda: now[0])
+        now[0] = 1.2
+        self.assertEqual(int(source.grab_gray((12, 21, 2, 2))[0, 0]), 2)
+        now[0] = 99
+        self.assertEqual(int(source.grab_gray((10, 20, 6, 4))[0, 0]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from fishing_assistant.scheduler import FrameScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FrameSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = FrameScheduler(10, self.clock)
+
+    def run_frames(self, count, work):
+        for _ in range(count):
+            self.scheduler.tick()
+            self.clock.now += work
+            self.clock.now += self.scheduler.delay()
+
+    def test_only_remainder_of_slot_is_slept(self):
+        self.scheduler.tick()
+        self.clock.now += 0.03
+        self.assertAlmostEqual(self.scheduler.delay(), 0.07)
+
+    def test_steady_load_hits_target_rate(self):
+        self.run_frames(20, 0.04)
+        self.assertAlmostEqual(self.scheduler.fps, 10.0)
+        self.assertAlmostEqual(self.scheduler.jitter, 0.0)
+        self.assertEqual(self.scheduler.skipped, 0)
+
+    def test_overrun_skips_slots_instead_of_drifting(self):
+        self.scheduler.tick()
+        self.clock.now += 0.25
+        self.assertAlmostEqual(self.scheduler.delay(), 0.05)
+        self.assertEqual(self.scheduler.skipped, 2)
+        self.clock.now += 0.05
+        self.scheduler.tick()
+        self.clock.now += 0.01
+        self.assertAlmostEqual(self.scheduler.delay(), 0.09)
+
+    def test_restart_does_not_count_gap_between_runs(self):
+        self.run_frames(3, 0.01)
+        self.clock.now += 30
+        self.scheduler.restart()
+        self.run_frames(3, 0.01)
+        self.assertEqual(self.scheduler.frames, 6)
+        self.assertAlmostEqual(self.scheduler.fps, 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
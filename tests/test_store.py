@@ -0,0 +1,71 @@
+import io
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from fishing_assistant.__main__ import main
+from fishing_assistant.config import AppConfig, save_config
+from fishing_assistant.store import CastRecord, SessionWriter, config_hash, reports
+
+
+def write_session(path, config, outcomes):
+    writer = SessionWriter(path, config)
+    for index, outcome in enumerate(outcomes):
+        writer.cast(CastRecord(1000.0 + index, outcome, 0.9, 1.5 + index, 6.0 + index))
+    writer.press("afk")
+    writer.close()
+    return writer
+
+
+class SessionStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name) / "stats.sqlite3"
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_sessions_are_written_in_wal_mode(self):
+        writer = write_session(self.path, {"confidence_threshold": 0.7}, ["caught", "timeout"])
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM casts").fetchone()[0], 2)
+        ended_at = connection.execute("SELECT ended_at FROM sessions WHERE id = ?", (writer.session_id,)).fetchone()[0]
+        connection.close()
+        self.assertIsNotNone(ended_at)
+
+    def test_report_rates_and_latencies(self):
+        write_session(self.path, {}, ["caught", "caught", "false_reel", "timeout"])
+        [report] = reports(self.path)
+        self.assertEqual((report.casts, report.caught, report.timeouts, report.afk_presses), (4, 2, 1, 1))
+        self.assertAlmostEqual(report.catch_rate, 0.5)
+        self.assertAlmostEqual(report.false_reel_rate, 1 / 3)
+        self.assertAlmostEqual(report.percentile(report.search_seconds, 0.5), 3.0)
+        self.assertEqual(report.cells()[0], "#1")
+
+    def test_sessions_with_the_same_tuning_are_grouped(self):
+        write_session(self.path, {"confidence_threshold": 0.7, "language": "zh_CN"}, ["caught"])
+        write_session(self.path, {"confidence_threshold": 0.7, "language": "en_US"}, ["timeout"])
+        write_session(self.path, {"confidence_threshold": 0.8}, ["caught"])
+        grouped = {report.label: report.casts for report in reports(self.path, by_config=True)}
+        self.assertEqual(grouped, {
+            config_hash({"confidence_threshold": 0.7}): 2,
+            config_hash({"confidence_threshold": 0.8}): 1,
+        })
+
+    def test_report_command(self):
+        settings = Path(self._directory.name) / "settings.json"
+        save_config(AppConfig(stats_database=str(self.path), language="en_US"), settings)
+        write_session(self.path, {}, ["caught"])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main(["report", "--config", str(settings)]), 0)
+        header, row = output.getvalue().splitlines()
+        self.assertTrue(header.startswith("Session/settings"))
+        self.assertTrue(row.startswith("#1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+from dataclasses import replace
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import cv2
+
+from fishing_assistant import backends, supervisor as supervisor_module
+from fishing_assistant.capture import ArrayFrameSource
+from fishing_assistant.supervisor import FocusArbiter, Supervisor, WindowControls
+from fishing_assistant.vision import Template, TemplateBank
+
+from .test_engine import session_config
+from .test_vision import scene, sprite
+
+
+class FakeBackend:
+    """Records window and input calls; every handle has the same client area."""
+
+    def __init__(self, handles=(1, 2)):
+        self.handles = list(handles)
+        self.actions = []
+        self.foreground = None
+        self._lock = threading.Lock()
+
+    def _record(self, action):
+        with self._lock:
+            self.actions.append(action)
+
+    def find_windows(self, title):
+        return self.handles
+
+    def is_window(self, handle):
+        return handle in self.handles
+
+    def client_region(self, handle):
+        return (0, 0, 160, 120)
+
+    def foreground_window(self):
+        return self.foreground
+
+    def activate_handle(self, handle):
+        self._record(f"activate:{handle}")
+        self.foreground = handle
+        return True
+
+    def press(self, key):
+        self._record(f"press:{key}")
+
+    def move_to(self, x, y, duration=0.25):
+        self._record(f"move:{x},{y}")
+
+    def click(self, button="right"):
+        self._record("click")
+
+
+class WindowControlsTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.arbiter = FocusArbiter(self.backend, sleep=lambda seconds: None)
+        self.first = WindowControls(self.backend, 1, self.arbiter)
+        self.second = WindowControls(self.backend, 2, self.arbiter)
+
+    def test_focus_switches_only_when_the_window_changes(self):
+        self.first.press("f")
+        self.first.press("f")
+        self.second.press("f")
+        self.assertEqual(self.backend.actions, ["activate:1", "press:f", "press:f", "activate:2", "press:f"])
+        self.assertEqual(self.arbiter.switches, 2)
+
+    def test_focus_taken_by_another_window_is_taken_back(self):
+        self.first.press("f")
+        self.backend.foreground = 99
+        self.first.press("f")
+        self.assertEqual(self.backend.actions, ["activate:1", "press:f", "activate:1", "press:f"])
+        self.assertEqual(self.arbiter.switches, 2)
+
+    def test_click_moves_the_pointer_back_after_another_session_moved_it(self):
+        self.first.move_to(10, 20)
+        self.second.move_to(30, 40)
+        self.first.click()
+        self.assertEqual(self.backend.actions[-3:], ["activate:1", "move:10,20", "click"])
+
+
+class SupervisorTests(unittest.TestCase):
+    def test_sessions_share_templates_and_pool(self):
+        backend = FakeBackend()
+        templates = TemplateBank.from_templates([Template("bobber.png", sprite())])
+        supervisor = Supervisor(
+            session_config(), backend=backend, templates=templates,
+            frames=lambda handle: ArrayFrameSource([scene(160, 120)]),
+        )
+        thread = threading.Thread(target=supervisor.run)
+        thread.start()
+        time.sleep(1.0)
+        supervisor.stop()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+        self.assertEqual([session.label for session in supervisor.sessions], ["#1", "#2"])
+        for session in supervisor.sessions:
+            self.assertIs(session.engine.templates, templates)
+            self.assertIs(session.engine.pool, supervisor.pool)
+            self.assertEqual((session.engine.state, session.engine.casts), ("stopped", 1))
+        self.assertEqual(sorted(backend.actions), ["activate:1", "activate:2", "press:f", "press:f"])
+        messages = [event.message("en_US") for event in supervisor.drain()]
+        self.assertEqual(messages[0], "🪟 Found 2 game windows")
+        self.assertIn("[#2] 🎣 Casting…", messages)
+
+    def test_updated_templates_are_decoded_once_for_every_session(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [str(Path(directory) / name) for name in ("a.png", "b.png")]
+            for seed, path in enumerate(paths, 1):
+                cv2.imwrite(path, sprite(seed=seed))
+            config = session_config(image_paths=paths[:1])
+            supervisor = Supervisor(
+                config, backend=FakeBackend(),
+                frames=lambda handle: ArrayFrameSource([scene(160, 120)]),
+            )
+            reloads, original = [], supervisor_module.reload_template_bank
+
+            def reload(*arguments):
+                reloads.append(threading.current_thread())
+                return original(*arguments)
+
+            thread = threading.Thread(target=supervisor.run)
+            thread.start()
+            time.sleep(0.5)
+            first = supervisor.bank
+            with mock.patch.object(supervisor_module, "reload_template_bank", reload):
+                supervisor.update_config(replace(config, image_paths=paths[1:], confidence_threshold=0.8))
+                # Sessions pick the update up at their first search frame, after the cast's search delay.
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline and any(
+                    session.engine.bank is first for session in supervisor.sessions
+                ):
+                    time.sleep(0.05)
+            supervisor.stop()
+            thread.join(5)
+
+        self.assertEqual(reloads, [thread])
+        self.assertEqual([template.path for template in supervisor.bank], paths[1:])
+        self.assertIsNot(supervisor.bank, first)
+        for session in supervisor.sessions:
+            self.assertIs(session.engine.bank, supervisor.bank)
+            self.assertEqual(session.engine.config.confidence_threshold, 0.8)
+            self.assertEqual(session.engine.config.bite_source, "visual")
+
+    def test_missing_backend_is_reported(self):
+        supervisor = Supervisor(session_config())
+        with mock.patch.object(backends, "_backend", None), mock.patch.object(sys, "platform", "plan9"):
+            supervisor.run()
+        self.assertEqual([event.key for event in supervisor.drain()], ["backend_unavailable"])
+        self.assertEqual(supervisor.sessions, [])
+
+    def test_no_windows_is_reported(self):
+        supervisor = Supervisor(session_config(), backend=FakeBackend(handles=()))
+        supervisor.run()
+        self.assertEqual([event.key for event in supervisor.drain()], ["window_failed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
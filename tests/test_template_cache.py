@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from fishing_assistant.template_cache import TemplateCache
+from fishing_assistant.vision import load_templates
+
+from .test_vision import sprite
+
+
+class TemplateCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = Path(self._directory.name)
+        self.paths = []
+        for seed in range(3):
+            path = self.root / f"bobber-{seed}.png"
+            cv2.imencode(".png", sprite(seed=seed))[1].tofile(str(path))
+            self.paths.append(str(path))
+        self.cache_directory = self.root / "cache"
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def load(self, cache, **options):
+        return cache.load_templates(self.paths, scales=(1.0, 1.25), angles=(10,), **options)
+
+    def test_warm_load_maps_the_same_bank(self):
+        cold = self.load(TemplateCache(self.cache_directory))
+        cache = TemplateCache(self.cache_directory)
+        warm = self.load(cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertIsInstance(warm.pixels, np.memmap)
+        self.assertFalse(warm[0].gray.flags.writeable)
+        self.assertEqual(warm.entries, cold.entries)
+        np.testing.assert_array_equal(np.asarray(warm.pixels), cold.pixels)
+        expected = load_templates(self.paths, scales=(1.0, 1.25), angles=(10,))
+        self.assertEqual(warm.entries, expected.entries)
+
+    def test_changed_source_invalidates_entry(self):
+        self.load(TemplateCache(self.cache_directory))
+        cv2.imencode(".png", sprite(size=40, seed=9))[1].tofile(self.paths[0])
+        cache = TemplateCache(self.cache_directory)
+        bank = self.load(cache)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(bank[0].gray.shape, (40, 40))
+
+    def test_unreadable_files_are_reported_on_warm_loads(self):
+        self.paths.append(str(self.root / "missing.png"))
+        for _ in range(2):
+            messages = []
+            self.load(TemplateCache(self.cache_directory), log=messages.append, unreadable_message="bad {name}")
+            self.assertEqual(messages, ["bad missing.png"])
+
+    def test_old_banks_are_pruned(self):
+        cache = TemplateCache(self.cache_directory, max_banks=2)
+        for scale in (1.0, 1.1, 1.2):
+            cache.load_templates(self.paths, scales=(scale,))
+        self.assertEqual(len(list(self.cache_directory.glob("*.npy"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from fishing_assistant.timing import FALLBACK_PROFILE, TimingModel
+
+
+def observe(model, bobber, bite, loot, casts=10):
+    for index in range(casts):
+        model.record_bobber(bobber + 0.02 * index)
+        model.record_bite(bite + 0.2 * index)
+        model.record_loot(loot + 0.02 * index)
+
+
+def cast(model, bite, loot):
+    """One cast against the model's current waits; whether bite and loot were seen."""
+    profile = model.profile
+    bitten = bite <= profile.search_delay + profile.cast_timeout
+    if bitten:
+        model.record_bite(bite)
+    else:
+        model.record_no_bite()
+    looted = loot <= profile.reel_pause
+    if looted:
+        model.record_loot(loot)
+    else:
+        model.record_no_loot()
+    return bitten, looted
+
+
+class TimingModelTests(unittest.TestCase):
+    def test_fallback_until_enough_casts_are_observed(self):
+        model = TimingModel(min_samples=5)
+        observe(model, 1.0, 6.0, 0.8, casts=4)
+        self.assertEqual(model.profile, FALLBACK_PROFILE)
+
+    def test_profile_follows_the_observed_distributions(self):
+        model = TimingModel()
+        observe(model, 1.0, 6.0, 0.8)
+        profile = model.profile
+        self.assertTrue(0.7 <= profile.search_delay <= 0.72)
+        self.assertTrue(7.8 <= profile.search_delay + profile.cast_timeout <= 8.1)
+        self.assertTrue(1.25 <= profile.reel_pause <= 1.3)
+        self.assertEqual(
+            (profile.bait_pause, profile.bait_interval),
+            (FALLBACK_PROFILE.bait_pause, FALLBACK_PROFILE.bait_interval),
+        )
+
+    def test_learned_waits_never_exceed_the_fallback(self):
+        model = TimingModel()
+        observe(model, 4.0, 40.0, 9.0)
+        self.assertEqual(model.profile, FALLBACK_PROFILE)
+
+    def test_late_bites_after_early_ones_restore_the_waits(self):
+        model = TimingModel()
+        for index in range(10):
+            self.assertEqual(cast(model, 4.0 + 0.1 * index, 0.8), (True, True))
+        self.assertLess(model.profile.search_delay + model.profile.cast_timeout, 10.0)
+        self.assertLess(model.profile.reel_pause, 1.5)
+        bitten, looted = zip(*(cast(model, 15.0, 2.5) for _ in range(20)))
+        # Only the casts that ran into the learned waits are lost.
+        self.assertEqual(bitten, (False,) + (True,) * 19)
+        self.assertEqual(looted, (False,) * 2 + (True,) * 18)
+        self.assertEqual(model.profile.cast_timeout, FALLBACK_PROFILE.cast_timeout)
+        self.assertGreaterEqual(model.profile.reel_pause, 2.5)
+
+    def test_fixed_timing_ignores_observations(self):
+        model = TimingModel(adaptive=False)
+        observe(model, 1.0, 6.0, 0.8)
+        self.assertEqual(model.profile, FALLBACK_PROFILE)
+
+    def test_idle_ratio(self):
+        model = TimingModel()
+        model.record_idle(1.5)
+        model.record_idle(3.0)
+        self.assertAlmostEqual(model.idle_ratio(9.0), 0.5)
+        self.assertEqual(model.idle_ratio(0.0), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from fishing_assistant.tracking import BobberTracker
+from fishing_assistant.vision import Match
+
+
+def match(x, y):
+    return Match("bobber.png", x, y, 40, 30, 0.9)
+
+
+class BobberTrackerTests(unittest.TestCase):
+    def test_no_history_means_full_search(self):
+        self.assertIsNone(BobberTracker().roi((0, 0, 1920, 1080)))
+
+    def test_roi_covers_recent_matches_with_margin(self):
+        tracker = BobberTracker(history=2, margin=50)
+        for x, y in ((100, 100), (900, 500), (960, 540)):
+            tracker.record(match(x, y))
+        self.assertEqual(tracker.roi((0, 0, 1920, 1080)), (850, 450, 200, 170))
+
+    def test_roi_is_clipped_to_client_area(self):
+        tracker = BobberTracker(margin=50)
+        tracker.record(match(20, 10))
+        self.assertEqual(tracker.roi((10, 0, 800, 600)), (10, 0, 100, 90))
+
+    def test_roi_as_large_as_window_is_skipped(self):
+        tracker = BobberTracker(margin=500)
+        tracker.record(match(100, 100))
+        self.assertIsNone(tracker.roi((0, 0, 400, 300)))
+
+    def test_saved_time_uses_average_full_search(self):
+        tracker = BobberTracker()
+        tracker.record_full_search(0.4)
+        tracker.record_full_search(0.2)
+        tracker.record_roi_search(True, 0.01)
+        tracker.record_roi_search(False, 0.01)
+        self.assertEqual((tracker.hits, tracker.misses), (1, 1))
+        self.assertAlmostEqual(tracker.saved_seconds(), 0.28)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+import cv2
+import numpy as np
+
+from fishing_assistant.vision import (
+    Template,
+    TemplateBank,
+    calculate_change,
+    deduplicate,
+    find_best_match,
+    load_templates,
+    prepare_gray,
+    template_variants,
+)
+
+
+def scene(width=320, height=240, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (height // 8, width // 8), dtype=np.uint8)
+    return cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+
+
+def sprite(size=32, seed=1):
+    rng = np.random.default_rng(seed)
+    image = np.full((size, size), 60, dtype=np.uint8)
+    cv2.circle(image, (size // 2, size // 2), size // 3, 200, -1)
+    cv2.line(image, (size // 2, 2), (size // 2, size - 3), 20, 2)
+    return image + rng.integers(0, 20, image.shape, dtype=np.uint8)
+
+
+class FindBestMatchTests(unittest.TestCase):
+    def setUp(self):
+        self.bobber = sprite()
+        self.frame = scene()
+        self.frame[150:182, 200:232] = self.bobber
+        self.templates = [Template("bobber.png", self.bobber)]
+
+    def test_full_search_reports_screen_coordinates(self):
+        match = find_best_match(self.frame, self.templates, 0.9, origin=(1000, 500))
+        self.assertEqual((match.x, match.y, match.width, match.height), (1200, 650, 32, 32))
+        self.assertAlmostEqual(match.confidence, 1.0, places=3)
+
+    def test_pyramid_search_matches_full_resolution_result(self):
+        full = find_best_match(self.frame, self.templates, 0.5)
+        for levels in (1, 2, 3):
+            pyramid = find_best_match(self.frame, self.templates, 0.5, pyramid_levels=levels)
+            self.assertEqual((pyramid.x, pyramid.y), (full.x, full.y))
+            self.assertAlmostEqual(pyramid.confidence, full.confidence, places=4)
+
+    def test_bgr_input_is_accepted(self):
+        bgr = cv2.cvtColor(self.frame, cv2.COLOR_GRAY2BGR)
+        self.assertIsNotNone(find_best_match(bgr, self.templates, 0.9))
+
+    def test_oversized_template_is_skipped(self):
+        self.assertIsNone(find_best_match(self.frame[:20, :20], self.templates, 0.1))
+
+
+class ChangeTests(unittest.TestCase):
+    def test_identical_frames_have_no_change(self):
+        frame = scene(64, 48)
+        metrics = calculate_change(prepare_gray(frame), frame, 20)
+        self.assertEqual((metrics.mean_difference, metrics.changed_ratio), (0.0, 0.0))
+
+    def test_inverted_frame_is_fully_changed(self):
+        frame = np.full((16, 16), 10, dtype=np.uint8)
+        metrics = calculate_change(prepare_gray(frame), 255 - frame, 20)
+        self.assertEqual(metrics.changed_ratio, 1.0)
+        self.assertAlmostEqual(metrics.mean_difference, 235.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TemplateBankTests(unittest.TestCase):
+    def test_variants_are_views_into_one_buffer(self):
+        bank = TemplateBank.from_templates(template_variants(Template("a.png", sprite()), (0.5, 1.0, 1.5)))
+        self.assertEqual([t.width for t in bank], [16, 32, 48])
+        for template in bank:
+            self.assertTrue(np.shares_memory(template.gray, bank.pixels))
+
+    def test_small_templates_keep_their_unscaled_image(self):
+        small = Template("small.png", sprite(6))
+        self.assertEqual([(t.width, t.scale) for t in template_variants(small, (0.5, 1.0, 2.0))], [(6, 1.0), (12, 2.0)])
+        self.assertEqual([(t.width, t.scale) for t in template_variants(small, (0.5, 0.8))], [(6, 1.0)])
+
+    def test_near_identical_variants_are_dropped(self):
+        original = Template("a.png", sprite())
+        noisy = Template("b.png", original.gray + 1)
+        other = Template("c.png", sprite(seed=5)[::-1].copy())
+        kept = deduplicate([original, noisy, other])
+        self.assertEqual([t.path for t in kept], ["a.png", "c.png"])
+
+    def test_scaled_bank_finds_resized_bobber(self):
+        frame = scene()
+        bobber = sprite(40)
+        frame[60:100, 100:140] = bobber
+        small = Template("bobber.png", cv2.resize(bobber, (32, 32), interpolation=cv2.INTER_AREA))
+        bank = TemplateBank.from_templates(template_variants(small, (1.0, 1.25)))
+        match = find_best_match(frame, bank, 0.8, pyramid_levels=1)
+        self.assertEqual((match.x, match.y, match.width), (100, 60, 40))
+
+    def test_load_templates_skips_unreadable_files(self):
+        messages = []
+        bank = load_templates(["missing.png"], messages.append, "bad {name}")
+        self.assertEqual(len(bank), 0)
+        self.assertEqual(messages, ["bad missing.png"])
+
+    def test_pyramids_are_built_once_per_depth_across_threads(self):
+        bank = TemplateBank.from_templates(template_variants(Template("a.png", sprite()), (1.0, 1.5, 2.0)))
+        with ThreadPoolExecutor(8) as pool:
+            built = list(pool.map(bank.pyramids, [index % 3 for index in range(48)]))
+        for levels, pyramids in enumerate(built[:3]):
+            self.assertTrue(all(other is pyramids for other in built[levels::3]))
+
+    def test_updated_bank_decodes_only_added_images(self):
+        def decode(paths):
+            decoded.extend(paths)
+            return TemplateBank.from_templates(
+                variant for path in paths for variant in template_variants(Template(path, sprite(seed=len(path))), (1.0, 1.5))
+            )
+
+        decoded = []
+        bank = decode(["a.png", "bb.png"])
+        bank.pyramids(1)
+        bank.features()
+        decoded.clear()
+        updated = bank.updated(["ccc.png", "a.png"], decode)
+        self.assertEqual(decoded, ["ccc.png"])
+        self.assertEqual([(t.path, t.width) for t in updated], [("ccc.png", 32), ("ccc.png", 48), ("a.png", 32), ("a.png", 48)])
+        self.assertIs(updated.pyramids(1)[2][1], bank.pyramids(1)[0][1])
+        self.assertEqual([t.path for t, _ in updated.features()], ["ccc.png", "a.png"])
+        self.assertIs(updated.features()[1][1], bank.features()[0][1])
+        np.testing.assert_array_equal(updated[2].gray, bank[0].gray)
@@ -0,0 +1,73 @@
+import unittest
+
+from fishing_assistant.window import CachedWindow, FixedWindow
+
+
+class FakeDesktop:
+    """Window handles with client areas and a foreground window."""
+
+    def __init__(self):
+        self.windows = {7: (100, 50, 800, 600)}
+        self.titles = {7: "game"}
+        self.foreground = None
+        self.activated = []
+
+    def find_window(self, title):
+        return next((handle for handle, name in self.titles.items() if name == title), None)
+
+    def is_window(self, handle):
+        return handle in self.windows
+
+    def foreground_window(self):
+        return self.foreground
+
+    def client_region(self, handle):
+        return self.windows.get(handle)
+
+    def activate_handle(self, handle):
+        self.activated.append(handle)
+        self.foreground = handle
+        return self.windows.get(handle)
+
+
+class CachedWindowTests(unittest.TestCase):
+    def setUp(self):
+        self.desktop = FakeDesktop()
+        self.window = CachedWindow(self.desktop, "game")
+
+    def test_unchanged_window_is_not_activated_again(self):
+        self.assertEqual(self.window.acquire(), ((100, 50, 800, 600), True))
+        self.assertEqual(self.window.acquire(), ((100, 50, 800, 600), False))
+        self.assertEqual(self.desktop.activated, [7])
+        self.assertEqual((self.window.activations, self.window.reuses), (1, 1))
+
+    def test_move_or_lost_focus_activates_again(self):
+        self.window.acquire()
+        self.desktop.windows[7] = (120, 50, 800, 600)
+        self.assertEqual(self.window.acquire(), ((120, 50, 800, 600), True))
+        self.desktop.foreground = 3
+        self.assertEqual(self.window.acquire(), ((120, 50, 800, 600), True))
+        self.assertEqual(self.desktop.activated, [7, 7, 7])
+
+    def test_closed_window_is_looked_up_again(self):
+        self.window.acquire()
+        del self.desktop.windows[7], self.desktop.titles[7]
+        self.assertEqual(self.window.acquire(), (None, False))
+        self.desktop.windows[9], self.desktop.titles[9] = (0, 0, 640, 480), "game"
+        self.assertEqual(self.window.acquire(), ((0, 0, 640, 480), True))
+        self.assertEqual(self.window.handle, 9)
+
+    def test_bound_window_without_activation_only_tracks_geometry(self):
+        window = CachedWindow(self.desktop, "game", handle=7, activate=False)
+        self.assertEqual(window.acquire(), ((100, 50, 800, 600), False))
+        del self.desktop.windows[7]
+        self.desktop.windows[9], self.desktop.titles[9] = (0, 0, 640, 480), "game"
+        self.assertEqual(window.acquire(), (None, False))
+        self.assertEqual(self.desktop.activated, [])
+
+    def test_fixed_window(self):
+        self.assertEqual(FixedWindow((0, 0, 10, 10)).acquire(), ((0, 0, 10, 10), False))
+
+
+if __name__ == "__main__":
+    unittest.main()
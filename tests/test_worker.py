@@ -0,0 +1,40 @@
+import sys
+import unittest
+from unittest import mock
+
+from fishing_assistant import backends
+from fishing_assistant.capture import ArrayFrameSource
+from fishing_assistant.worker import FishingWorker, SupervisorWorker
+
+from .test_engine import session_config
+from .test_vision import scene
+
+
+class WorkerTests(unittest.TestCase):
+    def test_errors_never_escape_the_thread(self):
+        worker = FishingWorker(session_config(), frame_source=ArrayFrameSource([scene(160, 120)]))
+        with mock.patch.object(worker.engine, "run", side_effect=ImportError("No module named 'win32gui'")):
+            worker.run()
+        with mock.patch.object(worker.engine, "run", side_effect=ValueError("broken")):
+            worker.run()
+        self.assertEqual(
+            [event.message("en_US") for event in worker.drain()],
+            [
+                "❌ The game window cannot be controlled on this system: No module named 'win32gui'",
+                "❌ Runtime error: broken",
+            ],
+        )
+
+    def test_missing_backend_finishes_both_workers(self):
+        workers = [
+            FishingWorker(session_config(), frame_source=ArrayFrameSource([scene(160, 120)])),
+            SupervisorWorker(session_config()),
+        ]
+        with mock.patch.object(backends, "_backend", None), mock.patch.object(sys, "platform", "plan9"):
+            for worker in workers:
+                worker.run()
+                self.assertEqual([event.key for event in worker.drain()], ["backend_unavailable"])
+
+
+if __name__ == "__main__":
+    unittest.main()